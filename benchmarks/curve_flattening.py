@@ -0,0 +1,82 @@
+# benchmarks/curve_flattening.py
+"""
+Vertices produced and time per 1k curves of the curve-flattening stage
+at several chord tolerances.
+
+Usage:
+    python -m benchmarks.curve_flattening [--curves 1000] [--tolerances 10 1 0.1 0.01]
+"""
+
+import argparse
+import time
+
+import ezdxf
+import numpy as np
+
+from src.dwg_parser.curves import CurveBatch
+from src.dwg_parser.parse_dwg import read_entity
+
+
+def make_curves(n, seed=0):
+    """n curves of each kind with radii spread over four decades (mm)."""
+
+    rng = np.random.default_rng(seed)
+    msp = ezdxf.new("R2010").modelspace()
+    kinds = {"ARC": [], "CIRCLE": [], "ELLIPSE": [], "SPLINE": [], "BULGE": []}
+
+    radii = 10 ** rng.uniform(1, 5, n)
+    centers = rng.uniform(0, 1e5, (n, 2))
+
+    for i in range(n):
+        c, r = centers[i], radii[i]
+        a0, a1 = rng.uniform(0, 360, 2)
+
+        kinds["ARC"].append(msp.add_arc(c, r, a0, a1))
+        kinds["CIRCLE"].append(msp.add_circle(c, r))
+        kinds["ELLIPSE"].append(msp.add_ellipse(c, major_axis=(r, 0), ratio=0.5))
+
+        ctrl = c + rng.normal(0, r, (8, 2))
+        kinds["SPLINE"].append(msp.add_open_spline(ctrl.tolist(), degree=3))
+
+        pts = c + rng.normal(0, r, (8, 2))
+        bulges = rng.uniform(-1, 1, (8, 1))
+        kinds["BULGE"].append(msp.add_lwpolyline(np.hstack([pts, bulges]).tolist(), format="xyb"))
+
+    return kinds
+
+
+def flatten(kind, entities, tolerance):
+    if kind == "BULGE":
+        return sum(len(read_entity(e, tolerance)[2]) for e in entities)
+
+    batch = CurveBatch()
+    for e in entities:
+        batch.add(e)
+    coords = batch.flatten(tolerance)[0]
+    return len(coords)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--curves", type=int, default=1000)
+    parser.add_argument("--tolerances", type=float, nargs="+", default=[10.0, 1.0, 0.1, 0.01])
+    args = parser.parse_args()
+
+    kinds = make_curves(args.curves)
+
+    print(f"{'kind':>8} {'tol':>7} {'verts/curve':>12} {'ms/1k curves':>13}")
+
+    for kind, entities in kinds.items():
+        for tol in args.tolerances:
+            start = time.perf_counter()
+            vertices = flatten(kind, entities, tol)
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"{kind:>8} {tol:>7g} {vertices / len(entities):>12.1f} "
+                f"{elapsed * 1e3 * 1000 / len(entities):>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/extraction.py
+"""
+Row-by-row vs. vectorized geometry extraction on synthetic entity
+tables (walls, doors, windows, closed floor polylines, noise layers).
+
+Usage:
+    python -m benchmarks.extraction [--entities 10000 100000 500000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.dwg_parser.entity_table import EntityTable, TYPE_CODES
+from src.preprocessing.extract_geometry import extract_from_rows, extract_from_table, iter_entity_rows
+
+
+# Share of entities per layer; floors are closed rectangles
+MIX = {"a-wall": 0.6, "a-door": 0.1, "a-glaz": 0.1, "a-flor": 0.15, "a-anno": 0.05}
+
+
+def make_table(n, seed=0):
+    rng = np.random.default_rng(seed)
+
+    layers = list(MIX)
+    layer_ids = rng.choice(len(layers), size=n, p=list(MIX.values())).astype(np.int32)
+    is_floor = layer_ids == layers.index("a-flor")
+
+    counts = np.where(is_floor, 4, 2)
+    origin = rng.uniform(0, 1e5, (n, 2))
+    size = rng.uniform(100, 5000, (n, 2))
+
+    # Lines run origin -> origin + size, floors are axis-aligned rectangles
+    dx = size * [1, 0]
+    dy = size * [0, 1]
+    corners = np.where(
+        is_floor[:, None, None],
+        np.stack([origin, origin + dx, origin + size, origin + dy], axis=1),
+        np.stack([origin, origin + size, origin, origin], axis=1)
+    )
+
+    vertex_mask = np.arange(4)[None, :] < counts[:, None]
+    coords = corners[vertex_mask]
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    types = np.where(is_floor, TYPE_CODES["POLYLINE"], TYPE_CODES["LINE"]).astype(np.uint8)
+    return EntityTable(coords, offsets, types, layer_ids, is_floor, layers)
+
+
+def _best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'entities':>9} {'rows s':>8} {'vector s':>9} {'speedup':>8}")
+
+    for n in args.entities:
+        table = make_table(n)
+
+        rows = _best(lambda: extract_from_rows(iter_entity_rows(table)), args.repeat)
+        vector = _best(lambda: extract_from_table(table), args.repeat)
+
+        print(f"{n:>9} {rows:>8.3f} {vector:>9.3f} {rows / vector:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/extrusion.py
+"""
+Wall extrusion: one trimesh.creation.extrude_polygon call per wall plus
+a per-material concatenate (the previous path) against extrude_batch().
+Footprints are the buffered wall centerlines build_mesh extrudes.
+
+Usage:
+    python -m benchmarks.extrusion [DXF ...] [--walls 1000 20000] [--repeat 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+from benchmarks.synthetic import write_floor_plan
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
+from src.preprocessing.wall_graph import build_wall_graph
+from src.preprocessing.wall_pairing import pair_walls
+from src.renderer.extrude import extrude_batch
+from src.renderer.mesh_reconstruction import buffer_centerline, wall_centerlines, WALL_HEIGHT
+
+
+DEFAULT_DXF = Path(__file__).resolve().parent.parent / "data" / "input_dwg" / "sample31.dxf"
+
+# Stand-in for the predicted materials, so both paths split the same way
+MATERIALS = ["concrete", "brick", "drywall"]
+
+
+def footprints(path):
+    geometry = extract_walls_floors_doors_windows(parse_dwg(path, as_table=True))
+    lines, thicknesses = wall_centerlines(build_wall_graph(geometry), pair_walls(geometry))
+    return [buffer_centerline(line, t) for line, t in zip(lines, thicknesses)]
+
+
+def per_wall(polys, materials):
+    groups = {}
+    for poly, material_name in zip(polys, materials):
+        groups.setdefault(material_name, []).append(trimesh.creation.extrude_polygon(poly, WALL_HEIGHT))
+    return {name: trimesh.util.concatenate(meshes) for name, meshes in groups.items()}
+
+
+def batch(polys, materials):
+    return {
+        name: trimesh.Trimesh(vertices, faces, process=False)
+        for name, (vertices, faces) in extrude_batch(polys, WALL_HEIGHT).groups(materials).items()
+    }
+
+
+def _best(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dxf", type=Path, nargs="*", default=[DEFAULT_DXF])
+    parser.add_argument("--walls", type=int, nargs="*", default=[1000, 20000], help="synthetic plan sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'plan':<16} {'walls':>6} {'per-wall s':>11} {'batch s':>8} {'speedup':>8} {'faces':>8} {'volume ok':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = list(args.dxf) + [
+            write_floor_plan(Path(tmp) / f"synthetic_{n}.dxf", n) for n in args.walls
+        ]
+
+        for path in paths:
+            polys = footprints(path)
+            materials = [MATERIALS[i % len(MATERIALS)] for i in range(len(polys))]
+
+            slow, reference = _best(lambda: per_wall(polys, materials), args.repeat)
+            fast, result = _best(lambda: batch(polys, materials), args.repeat)
+
+            faces = sum(len(m.faces) for m in result.values())
+            same = all(np.isclose(result[k].volume, reference[k].volume) for k in reference)
+            print(
+                f"{path.stem:<16} {len(polys):>6} {slow:>11.3f} {fast:>8.3f} "
+                f"{slow / fast:>7.1f}x {faces:>8} {str(same):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
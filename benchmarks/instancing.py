@@ -0,0 +1,82 @@
+# benchmarks/instancing.py
+"""
+GLB size and load cost of repeated doors / windows written as
+EXT_mesh_gpu_instancing, shared-mesh nodes, or baked copies.
+
+"load" is a viewer-side proxy: read the GLB container and decode every
+accessor into arrays (what a browser viewer parses and uploads), plus
+the number of draw calls the file asks for.
+
+Usage:
+    python -m benchmarks.instancing [--walls 2000 20000] [--repeat 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import write_floor_plan
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.metrics import PipelineReport
+from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
+from src.preprocessing.openings import host_openings
+from src.preprocessing.wall_graph import build_wall_graph
+from src.preprocessing.wall_pairing import pair_walls
+from src.renderer.glb import read_accessor, read_glb
+from src.renderer.mesh_reconstruction import build_mesh
+
+
+MODES = ["gpu", "nodes", "none"]
+
+
+def _geometry(path):
+    geometry = extract_walls_floors_doors_windows(parse_dwg(path, as_table=True))
+    geometry["wall_graph"] = build_wall_graph(geometry)
+    geometry["wall_pairs"] = pair_walls(geometry)
+    geometry["openings"] = host_openings(geometry)
+    return geometry
+
+
+def load(path):
+    """Seconds to read the GLB and decode every accessor, and the bytes decoded."""
+
+    start = time.perf_counter()
+    tree, binary = read_glb(Path(path).read_bytes())
+    decoded = sum(read_accessor(tree, binary, i).nbytes for i in range(len(tree.get("accessors", []))))
+    return time.perf_counter() - start, decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--walls", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'walls':>6} {'mode':>6} {'openings':>9} {'meshes':>7} {'draws':>7} "
+        f"{'GLB KB':>8} {'decoded KB':>11} {'load ms':>8} {'export s':>9}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for walls in args.walls:
+            geometry = _geometry(write_floor_plan(tmp / f"synthetic_{walls}.dxf", walls))
+
+            for mode in MODES:
+                out = tmp / f"synthetic_{walls}_{mode}"
+                report = PipelineReport(jsonl_path=None)
+                build_mesh(geometry, out, report=report, instancing=mode)
+
+                glb = out.with_suffix(".glb")
+                seconds, decoded = min(load(glb) for _ in range(args.repeat))
+                c = report.counters
+                print(
+                    f"{walls:>6} {mode:>6} {c['opening_instances']:>9} {c['opening_meshes']:>7} "
+                    f"{c['draw_calls']:>7} {glb.stat().st_size / 1024:>8.0f} {decoded / 1024:>11.0f} "
+                    f"{seconds * 1e3:>8.1f} {report.stage_time('export'):>9.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/parse_memory.py
+"""
+Peak RSS of parse_dwg (whole document) vs. iter_entities (streaming)
+for synthetic DXF files of increasing size.
+
+Usage:
+    python -m benchmarks.parse_memory [--walls 10000 50000 200000]
+
+Every measurement runs in a fresh interpreter so peak RSS is not
+polluted by earlier runs.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import write_floor_plan
+from src.metrics import peak_rss_mb
+
+
+MODES = ["document", "streaming"]
+
+
+def _child(mode, path):
+    from src.dwg_parser.parse_dwg import parse_dwg, iter_entities
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "document":
+        count = len(parse_dwg(path))
+    else:
+        count = sum(1 for _ in iter_entities(path))
+
+    print(json.dumps({
+        "entities": count,
+        "seconds": time.perf_counter() - start,
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": peak_rss_mb()
+    }))
+
+
+def measure(mode, path):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.parse_memory", "--child", mode, str(path)],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    # parse_dwg prints progress; the measurement is the last line
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--walls", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    print(f"{'walls':>8} {'file MB':>8} {'mode':>10} {'entities':>9} {'peak MB':>8} {'sec':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for walls in args.walls:
+            path = write_floor_plan(Path(tmp) / f"plan_{walls}.dxf", walls, openings=False)
+            size_mb = path.stat().st_size / 1e6
+
+            for mode in MODES:
+                r = measure(mode, path)
+                print(
+                    f"{walls:>8} {size_mb:>8.1f} {mode:>10} {r['entities']:>9} "
+                    f"{r['peak_rss_mb']:>8.1f} {r['seconds']:>7.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
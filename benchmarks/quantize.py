@@ -0,0 +1,126 @@
+# benchmarks/quantize.py
+"""
+GLB size and decode time: the float32 export against the quantized one
+(KHR_mesh_quantization, see src/renderer/quantize.py).
+
+"gzip KB" is the transfer size with HTTP compression. "decode ms" reads
+the GLB and turns every primitive's indices, positions and UVs into
+float32 / uint32 arrays (dequantized for the quantized file), i.e. the
+CPU work of a viewer that cannot upload the packed formats directly.
+"fetch jump" is the mean distance between consecutive vertex indices.
+
+Usage:
+    python -m benchmarks.quantize [DXF ...] [--walls 2000 20000] [--repeat 5]
+"""
+
+import argparse
+import gzip
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.instancing import _geometry
+from benchmarks.synthetic import write_floor_plan
+from src.metrics import PipelineReport
+from src.renderer.glb import read_accessor, read_glb
+from src.renderer.mesh_reconstruction import build_mesh
+
+
+DEFAULT_DXF = Path(__file__).resolve().parent.parent / "data" / "input_dwg" / "sample31.dxf"
+
+
+def decode(data):
+    """Float32 positions / UVs and uint32 indices of every primitive."""
+
+    tree, binary = read_glb(data)
+    cubes = {}
+    for node in tree["nodes"]:
+        if "mesh" in node and "matrix" in node:
+            cubes[node["mesh"]] = np.array(node["matrix"], dtype=np.float32).reshape(4, 4).T
+
+    textures = {}
+    for m, material in enumerate(tree.get("materials", [])):
+        info = material.get("pbrMetallicRoughness", {}).get("baseColorTexture", {})
+        transform = info.get("extensions", {}).get("KHR_texture_transform")
+        if transform:
+            textures[m] = np.float32(transform["offset"]), np.float32(transform["scale"])
+
+    arrays = []
+    for m, mesh in enumerate(tree["meshes"]):
+        for primitive in mesh["primitives"]:
+            arrays.append(read_accessor(tree, binary, primitive["indices"]).astype(np.uint32))
+
+            positions = read_accessor(tree, binary, primitive["attributes"]["POSITION"]).astype(np.float32)
+            if tree["accessors"][primitive["attributes"]["POSITION"]].get("normalized"):
+                matrix = cubes[m]
+                positions = positions / 32767 @ matrix[:3, :3].T + matrix[:3, 3]
+            arrays.append(positions)
+
+            uv = read_accessor(tree, binary, primitive["attributes"]["TEXCOORD_0"]).astype(np.float32)
+            if primitive.get("material") in textures:
+                offset, scale = textures[primitive["material"]]
+                uv = uv / 65535 * scale + offset
+            arrays.append(uv)
+
+    return arrays
+
+
+def fetch_jump(data):
+    tree, binary = read_glb(data)
+    jumps = [
+        np.abs(np.diff(read_accessor(tree, binary, p["indices"]).ravel().astype(np.int64)))
+        for mesh in tree["meshes"] for p in mesh["primitives"]
+    ]
+    return np.concatenate(jumps).mean()
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dxf", type=Path, nargs="*", default=[DEFAULT_DXF])
+    parser.add_argument("--walls", type=int, nargs="*", default=[2000, 20000], help="synthetic plan sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'plan':<16} {'mode':>9} {'GLB KB':>8} {'gzip KB':>8} {'geometry KB':>12} "
+        f"{'decode ms':>10} {'fetch jump':>11} {'export s':>9}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = list(args.dxf) + [write_floor_plan(tmp / f"synthetic_{n}.dxf", n) for n in args.walls]
+
+        for path in paths:
+            geometry = _geometry(path)
+
+            for quantize in (False, True):
+                out = tmp / f"{path.stem}_{quantize}"
+                report = PipelineReport(jsonl_path=None)
+                build_mesh(geometry, out, report=report, instancing="none", quantize=quantize)
+
+                data = out.with_suffix(".glb").read_bytes()
+                tree, _ = read_glb(data)
+                images = sum(tree["bufferViews"][image["bufferView"]]["byteLength"] for image in tree.get("images", []))
+
+                print(
+                    f"{path.stem:<16} {'quantized' if quantize else 'float':>9} {len(data) / 1024:>8.0f} "
+                    f"{len(gzip.compress(data)) / 1024:>8.0f} {(len(data) - images) / 1024:>12.0f} "
+                    f"{_best(lambda: decode(data), args.repeat) * 1e3:>10.1f} {fetch_jump(data):>11.1f} "
+                    f"{report.stage_time('export'):>9.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
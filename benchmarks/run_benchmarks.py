@@ -0,0 +1,208 @@
+# benchmarks/run_benchmarks.py
+"""
+End-to-end benchmark of run_pipeline on synthetic floor plans.
+
+For every plan size the pipeline runs --repeat times, each in a fresh
+interpreter (so peak RSS is per run), with the parse cache disabled.
+--workers runs the tiled multi-process build (peak RSS is then the
+parent process only). Per-stage latency percentiles, throughput
+(entities/s, walls/s) and peak memory are written to
+benchmarks/results/<commit>.json.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--walls 100 1000 10000] [--repeat 5]
+                                        [--curves] [--blocks] [--stream]
+                                        [--workers N]
+    python -m benchmarks.run_benchmarks --compare OLD.json NEW.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import write_floor_plan
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+PERCENTILES = [50, 90, 99]
+
+
+# ======================
+# SINGLE RUN (CHILD)
+# ======================
+
+def _child(path, out_dir, streaming, workers=None):
+    from src.main import run_pipeline
+
+    report = run_pipeline(
+        Path(path),
+        streaming=streaming,
+        use_cache=False,
+        metrics_jsonl=None,
+        output_dir=Path(out_dir),
+        tiled=workers is not None,
+        workers=workers
+    )
+    print(json.dumps(report.to_dict()))
+
+
+def run_once(path, out_dir, streaming=False, workers=None):
+    cmd = [sys.executable, "-m", "benchmarks.run_benchmarks", "--child", str(path), str(out_dir)]
+    if streaming:
+        cmd.append("--stream")
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    # The report is the last line of stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+# ======================
+# AGGREGATION
+# ======================
+
+def _percentiles(values):
+    return {f"p{q}": float(np.percentile(values, q)) for q in PERCENTILES}
+
+
+def summarize(walls, runs, file_mb):
+    """Collapse repeated reports of one plan into a results row."""
+
+    totals = [r["wall_s"] for r in runs]
+    median = float(np.median(totals))
+    counters = runs[0]["counters"]
+
+    stages = {}
+    for run in runs:
+        for s in run["stages"]:
+            stages.setdefault(s["stage"], []).append(s["wall_s"])
+
+    return {
+        "walls_requested": walls,
+        "file_mb": file_mb,
+        "repeat": len(runs),
+        "counters": counters,
+        "total_s": _percentiles(totals),
+        "stages_s": {name: _percentiles(v) for name, v in stages.items()},
+        "entities_per_s": counters.get("entities", 0) / median if median else 0.0,
+        "walls_per_s": counters.get("walls", 0) / median if median else 0.0,
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs)
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ======================
+# COMPARISON
+# ======================
+
+def compare(old_path, new_path):
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+
+    print(f"{old['commit']} -> {new['commit']}")
+    print(f"{'walls':>8} {'stage':<18} {'old p50':>9} {'new p50':>9} {'speedup':>8}")
+
+    old_rows = {r["walls_requested"]: r for r in old["results"]}
+    for row in new["results"]:
+        base = old_rows.get(row["walls_requested"])
+        if base is None:
+            continue
+
+        pairs = [("total", base["total_s"], row["total_s"])]
+        pairs += [
+            (name, base["stages_s"][name], p)
+            for name, p in row["stages_s"].items() if name in base["stages_s"]
+        ]
+        for name, a, b in pairs:
+            speedup = a["p50"] / b["p50"] if b["p50"] else float("inf")
+            print(f"{row['walls_requested']:>8} {name:<18} {a['p50']:>9.3f} {b['p50']:>9.3f} {speedup:>7.2f}x")
+
+        print(
+            f"{row['walls_requested']:>8} {'peak MB':<18} "
+            f"{base['peak_rss_mb']:>9.1f} {row['peak_rss_mb']:>9.1f}"
+        )
+
+
+# ======================
+# MAIN
+# ======================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--walls", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--curves", action="store_true", help="add door swing arcs")
+    parser.add_argument("--blocks", action="store_true", help="draw doors as block references")
+    parser.add_argument("--stream", action="store_true", help="benchmark the streaming parser")
+    parser.add_argument("--workers", type=int, default=None, help="benchmark the tiled build on N processes")
+    parser.add_argument("--out", type=Path, default=None, help="results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two results files")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "OUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child, streaming=args.stream, workers=args.workers)
+        return
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    commit = _commit()
+    results = []
+
+    print(f"{'walls':>8} {'entities':>9} {'p50 s':>8} {'p90 s':>8} {'ent/s':>10} {'walls/s':>9} {'peak MB':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for walls in args.walls:
+            path = write_floor_plan(tmp / f"plan_{walls}.dxf", walls, curves=args.curves, blocks=args.blocks)
+            runs = [run_once(path, tmp, args.stream, args.workers) for _ in range(args.repeat)]
+            row = summarize(walls, runs, path.stat().st_size / 1e6)
+            results.append(row)
+
+            print(
+                f"{walls:>8} {row['counters'].get('entities', 0):>9} "
+                f"{row['total_s']['p50']:>8.3f} {row['total_s']['p90']:>8.3f} "
+                f"{row['entities_per_s']:>10.0f} {row['walls_per_s']:>9.0f} {row['peak_rss_mb']:>8.1f}"
+            )
+
+    out = args.out or RESULTS_DIR / f"{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "repeat": args.repeat,
+            "curves": args.curves,
+            "blocks": args.blocks,
+            "streaming": args.stream,
+            "workers": args.workers
+        },
+        "results": results
+    }, indent=2))
+
+    print("Results written to", out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/simplify.py
+"""
+Effect of the pre-extrusion simplification pass: vertices removed,
+final triangle count and build_mesh time, with and without it.
+
+Usage:
+    python -m benchmarks.simplify [DXF ...] [--walls 1000] [--repeat 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import write_floor_plan
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.metrics import PipelineReport
+from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
+from src.preprocessing.simplify import SIMPLIFY_TOLERANCE
+from src.preprocessing.wall_graph import build_wall_graph
+from src.preprocessing.wall_pairing import pair_walls
+from src.renderer.mesh_reconstruction import build_mesh
+
+
+DEFAULT_DXF = Path(__file__).resolve().parent.parent / "data" / "input_dwg" / "sample31.dxf"
+
+
+def _geometry(path):
+    geometry = extract_walls_floors_doors_windows(parse_dwg(path, as_table=True))
+    geometry["wall_graph"] = build_wall_graph(geometry)
+    geometry["wall_pairs"] = pair_walls(geometry)
+    return geometry
+
+
+def _build(geometry, out, tolerance, repeat):
+    best, report = None, None
+    for _ in range(repeat):
+        report = PipelineReport(jsonl_path=None)
+        start = time.perf_counter()
+        build_mesh(geometry, out, report=report, simplify_tolerance=tolerance)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, report.counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dxf", type=Path, nargs="*", default=[DEFAULT_DXF])
+    parser.add_argument("--walls", type=int, default=1000, help="also run a synthetic plan of this size (0: skip)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'plan':<16} {'tol m':>6} {'vertices in':>12} {'out':>7} {'faces':>8} {'build s':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = list(args.dxf)
+        if args.walls:
+            paths.append(write_floor_plan(tmp / f"synthetic_{args.walls}.dxf", args.walls))
+
+        for path in paths:
+            geometry = _geometry(path)
+            for tolerance in (None, SIMPLIFY_TOLERANCE):
+                seconds, counters = _build(geometry, tmp / path.stem, tolerance, args.repeat)
+                print(
+                    f"{path.stem:<16} {tolerance if tolerance is not None else '-':>6} "
+                    f"{counters['vertices_before_simplify']:>12} {counters['vertices_after_simplify']:>7} "
+                    f"{counters['faces']:>8} {seconds:>8.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/synthetic.py
+
+import math
+from pathlib import Path
+
+import ezdxf
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+ROOM_SIZE = 4000.0      # mm
+DOOR_WIDTH = 900.0      # mm
+WINDOW_WIDTH = 1200.0   # mm
+
+WALL_LAYER = "A-WALL"
+DOOR_LAYER = "A-DOOR"
+WINDOW_LAYER = "A-GLAZ"
+FLOOR_LAYER = "A-FLOR"
+
+DOOR_BLOCK = "DOOR"
+
+
+# ======================
+# GENERATOR
+# ======================
+
+def grid_size(wall_count: int):
+    """Rooms per side of the grid closest to `wall_count` walls."""
+    # A grid of n x n rooms has 2 * n * (n + 1) walls
+    return max(1, int(math.sqrt(wall_count / 2)))
+
+
+def _door_block(doc):
+    """Door leaf + swing on layer "0", so copies take the INSERT layer."""
+    block = doc.blocks.new(DOOR_BLOCK)
+    block.add_line((0, 0), (0, DOOR_WIDTH))
+    block.add_arc((0, 0), DOOR_WIDTH, 0, 90)
+    return block
+
+
+def write_floor_plan(path, wall_count: int, openings=True, curves=False, blocks=False):
+    """
+    Write a synthetic DXF floor plan: a square grid of rooms whose
+    walls are drawn as single LINE entities on the wall layer.
+    Produces approximately `wall_count` walls.
+
+    With openings, every room gets a door on its bottom wall, every
+    exterior wall segment a window and the plan a closed floor outline.
+    curves adds door swing ARCs; blocks draws the doors as INSERTs of
+    one shared block instead of loose entities.
+    """
+
+    doc = ezdxf.new("R2010")
+    doc.header["$INSUNITS"] = 4  # millimetres
+    for layer in (WALL_LAYER, DOOR_LAYER, WINDOW_LAYER, FLOOR_LAYER):
+        doc.layers.add(layer)
+    msp = doc.modelspace()
+
+    n = grid_size(wall_count)
+
+    for i in range(n + 1):
+        for j in range(n):
+            x = i * ROOM_SIZE
+            y0, y1 = j * ROOM_SIZE, (j + 1) * ROOM_SIZE
+            msp.add_line((x, y0), (x, y1), dxfattribs={"layer": WALL_LAYER})
+            msp.add_line((y0, x), (y1, x), dxfattribs={"layer": WALL_LAYER})
+
+    if openings:
+        _add_openings(doc, msp, n, curves, blocks)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc.saveas(path)
+    return path
+
+
+def _add_openings(doc, msp, n, curves, blocks):
+    if blocks:
+        _door_block(doc)
+
+    door = {"layer": DOOR_LAYER}
+    window = {"layer": WINDOW_LAYER}
+
+    # -------- DOORS --------
+    for i in range(n):
+        for j in range(n):
+            x = i * ROOM_SIZE + 0.4 * ROOM_SIZE
+            y = j * ROOM_SIZE
+
+            if blocks:
+                msp.add_blockref(DOOR_BLOCK, (x, y), dxfattribs=door)
+                continue
+
+            msp.add_line((x, y), (x, y + DOOR_WIDTH), dxfattribs=door)
+            if curves:
+                msp.add_arc((x, y), DOOR_WIDTH, 0, 90, dxfattribs=door)
+
+    # -------- WINDOWS (exterior walls) --------
+    side = n * ROOM_SIZE
+    for k in range(n):
+        a = k * ROOM_SIZE + (ROOM_SIZE - WINDOW_WIDTH) / 2
+        b = a + WINDOW_WIDTH
+        for start, end in (
+            ((a, 0), (b, 0)), ((a, side), (b, side)),
+            ((0, a), (0, b)), ((side, a), (side, b))
+        ):
+            msp.add_line(start, end, dxfattribs=window)
+
+    # -------- FLOOR OUTLINE --------
+    msp.add_lwpolyline(
+        [(0, 0), (side, 0), (side, side), (0, side)],
+        close=True,
+        dxfattribs={"layer": FLOOR_LAYER}
+    )
@@ -31,20 +31,27 @@
 #         "layer": "floor"
 #     }
 from shapely.geometry import Polygon
+import logging
 import math
 
+logger = logging.getLogger(__name__)
+
 
 def extract_wall_features(
     polygon: Polygon,
     wall_height: float,
     layer: str,
     is_exterior: bool = False,
-    adjacent_room_types=None
+    adjacent_room_types=None,
+    thickness: float = None,
+    length: float = None
 ):
     """
     Extract rich wall features for ML material prediction.
     This version adds architectural intelligence while remaining
     backward-compatible with the existing model.
+    thickness / length, when known (e.g. measured from a double-line
+    wall), replace the bounding-box estimate.
     """
 
     if adjacent_room_types is None:
@@ -59,8 +66,8 @@ def extract_wall_features(
     width = maxx - minx
     height = maxy - miny
 
-    wall_thickness = min(width, height)
-    wall_length = max(width, height)
+    wall_thickness = min(width, height) if thickness is None else thickness
+    wall_length = max(width, height) if length is None else length
 
     # Avoid divide-by-zero
     aspect_ratio = wall_length / max(0.01, wall_thickness)
@@ -109,6 +116,12 @@ def extract_wall_features(
         # Orientation
         "orientation_flag": orientation_flag,
 
+        # Names read by predict_material()
+        "thickness": wall_thickness,
+        "length": wall_length,
+        "height": wall_height,
+        "orientation": orientation,
+
         # Semantics
         "is_exterior": int(is_exterior),
         "adj_bathroom": has_bathroom,
@@ -123,12 +136,11 @@ def extract_wall_features(
     # -------------------------
     # DEBUG LOG (OPTIONAL)
     # -------------------------
-    print(
-        f"🧠 Wall features | len={wall_length:.2f}m | "
-        f"thk={wall_thickness:.2f}m | "
-        f"h={wall_height:.2f}m | "
-        f"{orientation} | "
-        f"{'exterior' if is_exterior else 'interior'}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Wall features | len=%.2fm | thk=%.2fm | h=%.2fm | %s | %s",
+            wall_length, wall_thickness, wall_height, orientation,
+            "exterior" if is_exterior else "interior"
+        )
 
     return features
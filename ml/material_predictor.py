@@ -16,9 +16,12 @@
 
 #     return material
 import joblib
+import logging
 import numpy as np
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # ======================
 # LOAD MODEL & ENCODERS
 # ======================
@@ -29,7 +32,7 @@ model = joblib.load(BASE_DIR / "material_model.pkl")
 orientation_encoder = joblib.load(BASE_DIR / "orientation_encoder.pkl")
 material_encoder = joblib.load(BASE_DIR / "material_encoder.pkl")
 
-print("🧠 Material ML model & encoders loaded")
+logger.info("Material ML model & encoders loaded")
 
 
 # ======================
@@ -99,7 +102,7 @@ def predict_material(features: dict):
     # -------------------------
     rule_material = apply_material_rules(features)
     if rule_material:
-        print(f"🧠 Rule-based material: {rule_material}")
+        logger.debug("Rule-based material: %s", rule_material)
         return rule_material
 
     # -------------------------
@@ -129,9 +132,59 @@ def predict_material(features: dict):
     try:
         pred = model.predict(X)[0]
         material = material_encoder.inverse_transform([pred])[0]
-        print(f"🧠 ML-based material: {material}")
+        logger.debug("ML-based material: %s", material)
         return material
 
     except Exception as e:
-        print(f"❌ ML prediction failed, fallback to concrete: {e}")
+        logger.warning("ML prediction failed, fallback to concrete: %s", e)
         return "concrete"
+
+
+# ======================
+# BATCH PREDICTOR
+# ======================
+
+def predict_materials(feature_list):
+    """
+    predict_material() for many walls: the rule pass runs per wall and
+    everything it leaves open goes through the model in one call.
+    Returns a list of material names in input order.
+    """
+
+    materials = [apply_material_rules(f) for f in feature_list]
+    pending = [i for i, m in enumerate(materials) if not m]
+    if not pending:
+        return materials
+
+    # -------------------------
+    # ENCODE + BUILD MATRIX
+    # -------------------------
+    known = set(orientation_encoder.classes_)
+    orientations = [feature_list[i].get("orientation", "horizontal") for i in pending]
+    encoded = np.zeros(len(pending))
+    valid = [k for k, o in enumerate(orientations) if o in known]
+    if valid:
+        encoded[valid] = orientation_encoder.transform([orientations[k] for k in valid])
+
+    X = np.array([[
+        feature_list[i].get("length", 0.0),
+        feature_list[i].get("thickness", 0.0),
+        feature_list[i].get("height", 0.0),
+        enc,
+        feature_list[i].get("is_exterior", 0)
+    ] for i, enc in zip(pending, encoded)])
+
+    # -------------------------
+    # ML PREDICTION
+    # -------------------------
+    try:
+        predicted = material_encoder.inverse_transform(model.predict(X))
+    except Exception as e:
+        logger.warning("ML prediction failed, fallback to concrete: %s", e)
+        predicted = ["concrete"] * len(pending)
+
+    for i, material in zip(pending, predicted):
+        materials[i] = str(material)
+
+    logger.debug("Materials: %d by rule, %d by model", len(materials) - len(pending), len(pending))
+    return materials
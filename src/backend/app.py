@@ -3,11 +3,12 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse
 from pathlib import Path
+import logging
 import shutil
 
-from src.dwg_parser.parse_dwg import parse_dwg
-from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
-from src.renderer.mesh_reconstruction import build_mesh
+from src.main import run_pipeline
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="DWG to 3D Backend API")
 
@@ -24,7 +25,7 @@ def root():
 
 
 @app.post("/upload-dwg/")
-async def upload_dwg(file: UploadFile = File(...)):
+async def upload_dwg(file: UploadFile = File(...), quantize: bool = False):
     try:
         # =========================
         # 1. Save uploaded file
@@ -33,45 +34,35 @@ async def upload_dwg(file: UploadFile = File(...)):
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
-        print(f"File saved: {file_path}")
-
-        # =========================
-        # 2. Parse DXF
-        # =========================
-        entities = parse_dwg(file_path)
-        print("Parsed entities:", len(entities))
-
-        if not entities:
-            raise HTTPException(status_code=400, detail="No entities found in DXF")
+        logger.info("File saved: %s", file_path)
 
         # =========================
-        # 3. Extract geometry
+        # 2. Run the full pipeline: parse (cached by file content),
+        #    extract, wall graph, wall pairing, openings, mesh (GLB).
+        #    ?quantize=true for the smaller KHR_mesh_quantization download
         # =========================
-        geometry = extract_walls_floors_doors_windows(entities)
-
-        print("Walls:", len(geometry["walls"]))
-        print("Floors:", len(geometry["floors"]))
-        print("Doors:", len(geometry["doors"]))
-        print("Windows:", len(geometry["windows"]))
-
-        if not geometry["walls"] and not geometry["floors"]:
-            raise HTTPException(status_code=400, detail="No walls or floors found")
-
-        # =========================
-        # 4. Build mesh (GLB)
-        # =========================
-        mesh_path = OUTPUT_DIR / file.filename
-        build_mesh(geometry, mesh_path)
+        try:
+            report = run_pipeline(file_path, output_dir=OUTPUT_DIR, quantize=quantize)
+        except ValueError as e:
+            # Empty drawing, no walls, ...
+            raise HTTPException(status_code=400, detail=str(e))
+
+        logger.info(
+            "Walls: %d, doors: %d, windows: %d",
+            report.counters.get("walls", 0), report.counters.get("doors", 0),
+            report.counters.get("windows", 0)
+        )
 
+        mesh_path = OUTPUT_DIR / file_path.stem
         glb_path = mesh_path.with_suffix(".glb")
 
         if not glb_path.exists():
             raise HTTPException(status_code=500, detail="Mesh generation failed")
 
-        print("GLB created:", glb_path)
+        logger.info("GLB created: %s", glb_path)
 
         # =========================
-        # 5. Return GLB file
+        # 3. Return GLB file
         # =========================
         return FileResponse(
             path=glb_path,
@@ -83,5 +74,5 @@ async def upload_dwg(file: UploadFile = File(...)):
         raise
 
     except Exception as e:
-        print("ERROR:", e)
+        logger.exception("Upload failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,201 @@
+# src/building.py
+"""
+Multi-level buildings: one DXF per level, processed concurrently and
+assembled into a single GLB with one node per level.
+
+Levels come from a JSON manifest
+
+    {
+        "name": "tower",
+        "levels": [
+            {"name": "ground", "file": "ground.dxf", "elevation": 0.0},
+            {"name": "first", "file": "first.dxf", "elevation": 3.2}
+        ]
+    }
+
+(file paths relative to the manifest, elevations in metres), or from
+the file names in a directory: "plan_L02.dxf", "level-3.dxf",
+"tower_B1.dxf" (basement) and so on, stacked LEVEL_HEIGHT apart.
+"""
+
+import json
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+from src.main import run_pipeline, OUTPUT_DIR
+from src.metrics import PipelineReport, METRICS_JSONL
+from src.preprocessing.layer_classifier import DEFAULT_CLASSIFIER
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Floor-to-floor height for levels found by file name, metres
+LEVEL_HEIGHT = 3.0
+
+# "L02", "level-3", "floor_1", "B1" (basement) at a word boundary
+LEVEL_PATTERN = re.compile(
+    r"(?:^|[_\-\s.])(?:(?:level|lvl|floor|fl|l)[_\-\s]?|(?P<basement>b))(?P<number>\d+)(?=$|[_\-\s.])",
+    re.IGNORECASE
+)
+
+
+# ======================
+# LEVELS
+# ======================
+
+def load_manifest(path):
+    """Levels [{"name", "path", "elevation"}] and building name from a JSON manifest."""
+
+    path = Path(path)
+    data = json.loads(path.read_text())
+
+    levels = []
+    for i, entry in enumerate(data["levels"]):
+        file = path.parent / entry["file"]
+        levels.append({
+            "name": str(entry.get("name", file.stem)),
+            "path": file,
+            "elevation": float(entry.get("elevation", i * LEVEL_HEIGHT))
+        })
+
+    return data.get("name", path.stem), levels
+
+
+def levels_from_directory(directory, level_height=LEVEL_HEIGHT):
+    """Levels found by naming convention among the DXFs of a directory."""
+
+    directory = Path(directory)
+    levels = []
+
+    for file in sorted(directory.glob("*.dxf")):
+        match = LEVEL_PATTERN.search(file.stem)
+        if match is None:
+            logger.warning("No level number in file name, skipped: %s", file.name)
+            continue
+
+        number = int(match.group("number"))
+        if match.group("basement"):
+            number = -number
+
+        levels.append({"name": file.stem, "path": file, "elevation": number * level_height})
+
+    return directory.name, sorted(levels, key=lambda level: level["elevation"])
+
+
+def load_levels(path):
+    """Manifest file or directory -> (building name, levels)."""
+    path = Path(path)
+    return levels_from_directory(path) if path.is_dir() else load_manifest(path)
+
+
+# ======================
+# PER-LEVEL WORK
+# ======================
+
+def _run_level(level, output_dir, options):
+    """
+    One level through run_pipeline (runs in a worker process). Openings
+    are written as shared-mesh nodes: assemble() re-reads the level
+    GLBs with trimesh, which does not load EXT_mesh_gpu_instancing.
+    """
+
+    report = run_pipeline(level["path"], output_dir=output_dir, center=False, instancing="nodes", **options)
+    glb_path = Path(output_dir) / Path(level["path"]).with_suffix(".glb").name
+    return str(glb_path), report.to_dict()
+
+
+# ======================
+# ASSEMBLY
+# ======================
+
+def assemble(levels, glb_paths):
+    """
+    Scene with one node per level, translated to its elevation. The
+    building is centered in plan once, so levels stay aligned.
+    """
+
+    level_scenes = [trimesh.load(path, force="scene") for path in glb_paths]
+
+    bounds = np.array([s.bounds for s in level_scenes if not s.is_empty])
+    center = (bounds[:, 0, :2].min(axis=0) + bounds[:, 1, :2].max(axis=0)) / 2 if len(bounds) else np.zeros(2)
+
+    building = trimesh.Scene()
+    for level, scene in zip(levels, level_scenes):
+        building.graph.update(
+            frame_from=building.graph.base_frame,
+            frame_to=level["name"],
+            matrix=trimesh.transformations.translation_matrix([-center[0], -center[1], level["elevation"]])
+        )
+        for node in scene.graph.nodes_geometry:
+            transform, geometry_name = scene.graph[node]
+            building.add_geometry(
+                scene.geometry[geometry_name],
+                node_name=f"{level['name']}/{node}",
+                geom_name=f"{level['name']}/{geometry_name}",
+                parent_node_name=level["name"],
+                transform=transform
+            )
+
+    return building
+
+
+def run_building(levels, name, output_dir=OUTPUT_DIR, workers=None, use_cache=True,
+                 classifier=DEFAULT_CLASSIFIER, metrics_jsonl=METRICS_JSONL):
+    """
+    Run every level concurrently (one process each, at most `workers`),
+    then write <output_dir>/<name>.glb. Per-level GLBs stay in
+    <output_dir>/<name>_levels/<level>/. Returns a PipelineReport with
+    one "level:<name>" stage per level (its wall time in the worker) and
+    the slowest level as a counter.
+    """
+
+    report = PipelineReport(name, jsonl_path=metrics_jsonl)
+    workers = min(workers or os.cpu_count() or 1, len(levels))
+    if not levels:
+        raise ValueError("No levels to build")
+
+    options = {"use_cache": use_cache, "classifier": classifier, "metrics_jsonl": metrics_jsonl}
+    level_dirs = [Path(output_dir) / f"{name}_levels" / level["name"] for level in levels]
+    for d in level_dirs:
+        d.mkdir(parents=True, exist_ok=True)
+
+    with report.stage("levels"):
+        if workers == 1:
+            results = [_run_level(level, d, options) for level, d in zip(levels, level_dirs)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_level, level, d, options) for level, d in zip(levels, level_dirs)]
+                results = [f.result() for f in futures]
+
+    for level, (_, level_report) in zip(levels, results):
+        report.record_stage(
+            f"level:{level['name']}",
+            level_report["wall_s"],
+            level_report["cpu_s"],
+            level_report["peak_rss_mb"]
+        )
+        for key in ("rooms", "wall_meshes", "faces"):
+            report.incr(key, level_report["counters"].get(key, 0))
+
+    slowest = max(zip(levels, results), key=lambda r: r[1][1]["wall_s"])
+    report.count("levels", len(levels))
+    report.count("workers", workers)
+    report.count("slowest_level", slowest[0]["name"])
+
+    with report.stage("assemble"):
+        building = assemble(levels, [glb for glb, _ in results])
+        glb_path = Path(output_dir) / f"{name}.glb"
+        building.export(glb_path)
+
+    logger.info("Building GLB exported: %s (%d levels)", glb_path, len(levels))
+    return report.finish()
@@ -0,0 +1,266 @@
+# src/dwg_parser/blocks.py
+
+import math
+
+import numpy as np
+
+from src.dwg_parser.curves import CurveBatch, CHORD_TOLERANCE
+from src.dwg_parser.entity_table import TYPE_CODES
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+MAX_BLOCK_DEPTH = 8
+
+# Entities on layer "0" inside a block take the layer of the INSERT
+BYLAYER_ZERO = "0"
+
+
+# ======================
+# FLATTENED BLOCK
+# ======================
+
+class BlockGeometry:
+    """
+    Geometry of one block definition, flattened once into arrays in
+    block coordinates (nested blocks already expanded).
+    """
+
+    def __init__(self, coords, counts, types, layer_index, closed, layer_names):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.types = np.asarray(types, dtype=np.uint8)
+        self.layer_index = np.asarray(layer_index, dtype=np.int32)
+        self.closed = np.asarray(closed, dtype=bool)
+        self.layer_names = list(layer_names)
+
+    def __len__(self):
+        return len(self.types)
+
+    def instance(self, linear, translation, layers):
+        """
+        Place K copies at once.
+
+        linear: (K, 2, 2) row-vector matrices, translation: (K, 2),
+        layers: the INSERT layer of each copy (replaces layer "0").
+        Returns (coords, counts, types, layer_names_per_entity, closed)
+        with copies laid out one after another.
+        """
+
+        k = len(translation)
+        coords = np.einsum("nj,kjl->knl", self.coords, linear) + translation[:, None, :]
+
+        names = np.array(self.layer_names, dtype=object)
+        per_copy = np.tile(names, (k, 1))
+        zero = names == BYLAYER_ZERO
+        if zero.any():
+            per_copy[:, zero] = np.asarray(layers, dtype=object)[:, None]
+        entity_layers = per_copy[:, self.layer_index].ravel()
+
+        return (
+            coords.reshape(-1, 2),
+            np.tile(self.counts, k),
+            np.tile(self.types, k),
+            entity_layers,
+            np.tile(self.closed, k)
+        )
+
+
+# ======================
+# INSERT TRANSFORMS
+# ======================
+
+def insert_transforms(insert):
+    """
+    2D affine transforms for an INSERT, one per MINSERT grid cell.
+    Mirrors ezdxf's Insert.multi_insert(): the grid offset is rotated
+    but not scaled, and duplicate cells (zero spacing) are dropped.
+    """
+
+    m = insert.matrix44()
+    linear = np.array([[m[0, 0], m[0, 1]], [m[1, 0], m[1, 1]]])
+    origin = np.array([m[3, 0], m[3, 1]])
+
+    dxf = insert.dxf
+    rows = max(1, dxf.get("row_count", 1))
+    cols = max(1, dxf.get("column_count", 1))
+
+    if rows == 1 and cols == 1:
+        return linear[None], origin[None]
+
+    r, c = np.meshgrid(np.arange(rows), np.arange(cols), indexing="ij")
+    offsets = np.stack([
+        c.ravel() * dxf.get("column_spacing", 0.0),
+        r.ravel() * dxf.get("row_spacing", 0.0)
+    ], axis=1)
+    offsets = np.unique(offsets, axis=0)
+
+    angle = math.radians(dxf.get("rotation", 0.0))
+    rot = np.array([[math.cos(angle), math.sin(angle)], [-math.sin(angle), math.cos(angle)]])
+
+    # Grid offsets are in OCS; map them to WCS directions
+    ocs = insert.ocs()
+    ux, uy = ocs.to_wcs((1, 0, 0)), ocs.to_wcs((0, 1, 0))
+    to_wcs = np.array([[ux.x, ux.y], [uy.x, uy.y]])
+
+    translation = origin + offsets @ rot @ to_wcs
+    return np.repeat(linear[None], len(translation), axis=0), translation
+
+
+# ======================
+# BLOCK CACHE
+# ======================
+
+class BlockCache:
+    """
+    Flattens each block definition exactly once and memoizes it by name.
+    Nested INSERTs are expanded while flattening, up to max_depth;
+    blocks truncated by that limit are not memoized.
+    With a layer_filter, entities on rejected layers are dropped from
+    the definition (layer "0" is decided per copy, see expand_inserts).
+    """
+
+    def __init__(self, doc, read_entity, tolerance=CHORD_TOLERANCE,
+                 max_depth=MAX_BLOCK_DEPTH, layer_filter=None):
+        self.doc = doc
+        self.read_entity = read_entity
+        self.tolerance = tolerance
+        self.layer_filter = layer_filter
+        self.max_depth = max_depth
+        self.too_deep = 0
+        self._blocks = {}
+
+    def get(self, name, depth=0):
+        if name in self._blocks:
+            return self._blocks[name]
+
+        if depth > self.max_depth:
+            self.too_deep += 1
+            return None
+
+        # A block cut short by the depth limit is only valid at this
+        # depth: shallower INSERTs must flatten it again in full
+        truncated = self.too_deep
+        block = self._flatten(name, depth)
+        if self.too_deep == truncated:
+            self._blocks[name] = block
+        return block
+
+    def _flatten(self, name, depth):
+        layout = self.doc.blocks.get(name)
+        if layout is None:
+            return None
+
+        coords, counts, types, layers, closed = [], [], [], [], []
+        curves = CurveBatch()
+
+        for e in layout:
+            if e.dxftype() == "INSERT":
+                child = self.get(e.dxf.name, depth + 1)
+                if child is None or len(child) == 0:
+                    continue
+
+                linear, translation = insert_transforms(e)
+                layer = e.dxf.layer.lower()
+                c, n, t, lay, cl = child.instance(linear, translation, [layer] * len(translation))
+
+                coords.append(c)
+                counts.extend(n.tolist())
+                types.extend(t.tolist())
+                layers.extend(lay.tolist())
+                closed.extend(cl.tolist())
+                continue
+
+            layer = e.dxf.layer.lower()
+            if self.layer_filter is not None and layer != BYLAYER_ZERO and not self.layer_filter(layer):
+                continue
+
+            if curves.add(e):
+                continue
+
+            row = self.read_entity(e, self.tolerance)
+            if row is None:
+                continue
+
+            etype, layer, pts, is_closed = row
+            coords.append(np.asarray(pts, dtype=np.float64).reshape(-1, 2))
+            counts.append(len(pts))
+            types.append(TYPE_CODES[etype])
+            layers.append(layer)
+            closed.append(is_closed)
+
+        if len(curves):
+            c, n, t, lay, cl = curves.flatten(self.tolerance)
+            coords.append(c)
+            counts.extend(n.tolist())
+            types.extend(t)
+            layers.extend(lay)
+            closed.extend(cl)
+
+        layer_names = sorted(set(layers))
+        lookup = {n: i for i, n in enumerate(layer_names)}
+
+        return BlockGeometry(
+            np.concatenate(coords) if coords else np.empty((0, 2)),
+            counts,
+            types,
+            [lookup[n] for n in layers],
+            closed,
+            layer_names
+        )
+
+
+def expand_inserts(inserts, cache, builder, layer_filter=None):
+    """
+    Append the geometry of all INSERTs to an EntityTableBuilder.
+    Inserts are grouped by block so every block is transformed with
+    a single batched matrix operation.
+    Returns the number of block copies placed.
+    """
+
+    by_block = {}
+    for insert in inserts:
+        by_block.setdefault(insert.dxf.name, []).append(insert)
+
+    placed = 0
+
+    for name, group in by_block.items():
+        block = cache.get(name)
+        if block is None or len(block) == 0:
+            continue
+
+        linear, translation, layers = [], [], []
+        for insert in group:
+            lin, trans = insert_transforms(insert)
+            linear.append(lin)
+            translation.append(trans)
+            layers.extend([insert.dxf.layer.lower()] * len(trans))
+
+        linear = np.concatenate(linear)
+        translation = np.concatenate(translation)
+
+        coords, counts, types, entity_layers, closed = block.instance(linear, translation, layers)
+
+        # Layer-0 entities only learn their layer here
+        if layer_filter is not None:
+            names, inverse = np.unique(entity_layers.astype(str), return_inverse=True)
+            keep = np.array([layer_filter.accepts(str(name)) for name in names], dtype=bool)
+            mask = keep[inverse]
+
+            if not mask.all():
+                per_layer = np.bincount(inverse[~mask], minlength=len(names))
+                for name, n in zip(names, per_layer):
+                    if n:
+                        layer_filter.skipped[str(name)] += int(n)
+
+                coords = coords[np.repeat(mask, counts)]
+                counts, types, entity_layers, closed = (
+                    counts[mask], types[mask], entity_layers[mask], closed[mask]
+                )
+
+        builder.extend(coords, counts, types, entity_layers, closed)
+        placed += len(translation)
+
+    return placed
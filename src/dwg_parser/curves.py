@@ -0,0 +1,386 @@
+# src/dwg_parser/curves.py
+
+import math
+
+import numpy as np
+
+from src.dwg_parser.entity_table import TYPE_CODES
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Maximum distance between a curve and its polyline, metres. parse_dwg
+# converts it to drawing units; the functions below take drawing units
+CHORD_TOLERANCE = 0.005
+
+# Caps keep tiny tolerances on huge radii from exploding vertex counts
+MAX_ARC_SEGMENTS = 256
+MAX_SPAN_SEGMENTS = 64
+
+# Closed curves at or below the tolerance still need a ring with area
+MIN_CLOSED_SEGMENTS = 3
+
+CURVE_TYPES = ["ARC", "CIRCLE", "ELLIPSE", "SPLINE"]
+
+
+# ======================
+# SEGMENT COUNTS
+# ======================
+
+def arc_segment_counts(radii, sweeps, tolerance, closed=False):
+    """
+    Segments needed so the sagitta of every chord stays below tolerance:
+    a chord spanning angle a on radius r deviates r * (1 - cos(a / 2)).
+    Open arcs get at least 1 segment, closed curves (where `closed` is
+    true, scalar or per curve) at least MIN_CLOSED_SEGMENTS.
+    """
+
+    radii = np.asarray(radii, dtype=np.float64)
+    sweeps = np.abs(np.asarray(sweeps, dtype=np.float64))
+
+    ratio = np.clip(1.0 - tolerance / np.maximum(radii, 1e-12), -1.0, 1.0)
+    max_angle = 2.0 * np.arccos(ratio)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = np.ceil(sweeps / max_angle)
+
+    n = np.where(np.isfinite(n), n, 1)
+    lower = np.where(closed, MIN_CLOSED_SEGMENTS, 1)
+    return np.clip(n, lower, MAX_ARC_SEGMENTS).astype(np.int64)
+
+
+def _ragged_index(counts):
+    """Owner index and local index of each element of concatenated runs."""
+
+    counts = np.asarray(counts, dtype=np.int64)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    local = np.arange(counts.sum()) - starts[owner]
+    return owner, local
+
+
+# ======================
+# ARCS / CIRCLES / ELLIPSES
+# ======================
+
+def flatten_ellipses(centers, major_axes, ratios, start, sweep, closed, tolerance):
+    """
+    Flatten many elliptical arcs at once (circles and arcs are ellipses
+    with ratio 1). Angles are parameters in radians.
+    Closed curves do not repeat their first point.
+    Returns (coords, counts).
+    """
+
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    major = np.asarray(major_axes, dtype=np.float64).reshape(-1, 2)
+    ratios = np.asarray(ratios, dtype=np.float64)
+    start = np.asarray(start, dtype=np.float64)
+    sweep = np.asarray(sweep, dtype=np.float64)
+    closed = np.asarray(closed, dtype=bool)
+
+    # The major radius bounds the curvature radius from above (conservative)
+    radii = np.hypot(major[:, 0], major[:, 1])
+    segments = arc_segment_counts(radii, sweep, tolerance, closed)
+    counts = segments + np.where(closed, 0, 1)
+
+    owner, local = _ragged_index(counts)
+    t = start[owner] + sweep[owner] * local / segments[owner]
+
+    minor = np.stack([-major[:, 1], major[:, 0]], axis=1) * ratios[:, None]
+    coords = (
+        centers[owner]
+        + np.cos(t)[:, None] * major[owner]
+        + np.sin(t)[:, None] * minor[owner]
+    )
+
+    return coords, counts
+
+
+# ======================
+# BULGED POLYLINES
+# ======================
+
+def flatten_bulges(points, bulges, closed, tolerance):
+    """
+    Replace bulged LWPOLYLINE segments by arcs, vectorized over segments.
+    bulge = tan(sweep / 4); positive bulges turn counter-clockwise.
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    bulges = np.asarray(bulges, dtype=np.float64)
+
+    if not bulges.any() or len(points) < 2:
+        return points
+
+    p0 = points if closed else points[:-1]
+    p1 = np.roll(points, -1, axis=0)[:len(p0)]
+    b = bulges[:len(p0)]
+
+    sweep = 4.0 * np.arctan(b)
+    chord = p1 - p0
+    length = np.hypot(chord[:, 0], chord[:, 1])
+
+    curved = (b != 0) & (length > 0)
+    half = np.where(curved, sweep / 2.0, 1.0)
+    radius = np.where(curved, length / (2.0 * np.abs(np.sin(half))), 0.0)
+
+    # Centre lies left of the chord for CCW arcs, right for CW arcs
+    alpha = np.arctan2(chord[:, 1], chord[:, 0]) + np.sign(sweep) * np.pi / 2.0 - sweep / 2.0
+    center = p0 + radius[:, None] * np.stack([np.cos(alpha), np.sin(alpha)], axis=1)
+    phi0 = np.arctan2(p0[:, 1] - center[:, 1], p0[:, 0] - center[:, 0])
+
+    segments = np.where(curved, arc_segment_counts(radius, sweep, tolerance), 1)
+
+    # Each segment emits its start vertex plus segments - 1 arc points
+    owner, local = _ragged_index(segments)
+    t = phi0[owner] + sweep[owner] * local / segments[owner]
+    arc_pts = center[owner] + radius[owner, None] * np.stack([np.cos(t), np.sin(t)], axis=1)
+    out = np.where((local == 0)[:, None], p0[owner], arc_pts)
+
+    if not closed:
+        out = np.vstack([out, points[-1:]])
+
+    return out
+
+
+# ======================
+# SPLINES (BATCHED DE BOOR)
+# ======================
+
+def _clamped_knots(n_ctrl, degree):
+    inner = np.linspace(0.0, 1.0, n_ctrl - degree + 1)
+    return np.concatenate([np.zeros(degree), inner, np.ones(degree)])
+
+
+def spline_span_segments(control_points, tolerance):
+    """
+    Segments per knot span. For a B-spline with knot spacing h the second
+    derivative is bounded by max|P[i+2] - 2P[i+1] + P[i]| / h^2, so s samples
+    per span keep the chord error below max|d2P| / (8 s^2). Clamped end
+    spans are shorter than uniform ones, hence the extra factor of 2.
+    """
+
+    ctrl = np.asarray(control_points, dtype=np.float64)
+    if len(ctrl) < 3:
+        return 1
+
+    d2 = np.hypot(*(ctrl[2:] - 2.0 * ctrl[1:-1] + ctrl[:-2]).T).max()
+    s = math.ceil(math.sqrt(d2 / (4.0 * tolerance))) if d2 > 0 else 1
+    return int(min(max(s, 1), MAX_SPAN_SEGMENTS))
+
+
+def flatten_splines(splines, tolerance):
+    """
+    Evaluate many NURBS curves with one de Boor recursion per degree.
+    splines: list of (control_points, knots, degree, weights).
+    Returns (coords, counts).
+    """
+
+    n = len(splines)
+    counts = np.zeros(n, dtype=np.int64)
+    pieces = [None] * n
+
+    by_degree = {}
+    for idx, spl in enumerate(splines):
+        by_degree.setdefault(spl[2], []).append(idx)
+
+    for degree, members in by_degree.items():
+        ctrl_blocks, knot_blocks = [], []
+        sample_spline, sample_span, sample_t = [], [], []
+        ctrl_off = knot_off = 0
+        ctrl_offsets, knot_offsets = [], []
+
+        for local_id, idx in enumerate(members):
+            ctrl, knots, _, weights = splines[idx]
+            ctrl = np.asarray(ctrl, dtype=np.float64).reshape(-1, 2)
+            n_ctrl = len(ctrl)
+
+            knots = np.asarray(knots, dtype=np.float64)
+            if len(knots) != n_ctrl + degree + 1:
+                knots = _clamped_knots(n_ctrl, degree)
+
+            w = np.asarray(weights, dtype=np.float64)
+            if len(w) != n_ctrl:
+                w = np.ones(n_ctrl)
+
+            # Homogeneous control points (w*x, w*y, w)
+            ctrl_blocks.append(np.column_stack([ctrl * w[:, None], w]))
+            knot_blocks.append(knots)
+            ctrl_offsets.append(ctrl_off)
+            knot_offsets.append(knot_off)
+            ctrl_off += n_ctrl
+            knot_off += len(knots)
+
+            # Non-empty spans of the valid domain [knots[p], knots[n_ctrl]]
+            k = np.arange(degree, n_ctrl)
+            k = k[knots[k + 1] > knots[k]]
+            if len(k) == 0:
+                continue
+
+            s = spline_span_segments(ctrl, tolerance)
+            frac = np.arange(s) / s
+            span = np.repeat(k, s)
+            t = knots[span] + (knots[span + 1] - knots[span]) * np.tile(frac, len(k))
+
+            # Closing sample at the end of the domain
+            span = np.append(span, k[-1])
+            t = np.append(t, knots[k[-1] + 1])
+
+            sample_spline.append(np.full(len(t), local_id))
+            sample_span.append(span)
+            sample_t.append(t)
+            counts[idx] = len(t)
+
+        if not sample_t:
+            continue
+
+        P = np.concatenate(ctrl_blocks)
+        U = np.concatenate(knot_blocks)
+        sid = np.concatenate(sample_spline)
+        k = np.concatenate(sample_span)
+        t = np.concatenate(sample_t)
+
+        cbase = np.asarray(ctrl_offsets)[sid] + k - degree
+        kbase = np.asarray(knot_offsets)[sid] + k - degree
+
+        d = P[cbase[:, None] + np.arange(degree + 1)]
+
+        for r in range(1, degree + 1):
+            for j in range(degree, r - 1, -1):
+                left = U[kbase + j]
+                right = U[kbase + j + 1 + degree - r]
+                denom = right - left
+                alpha = np.divide(t - left, denom, out=np.zeros_like(t), where=denom != 0)
+                d[:, j] = (1.0 - alpha)[:, None] * d[:, j - 1] + alpha[:, None] * d[:, j]
+
+        xy = d[:, degree, :2] / d[:, degree, 2:3]
+
+        bounds = np.concatenate([[0], np.cumsum(counts[members])])
+        for local_id, idx in enumerate(members):
+            pieces[idx] = xy[bounds[local_id]:bounds[local_id + 1]]
+
+    coords = [p for p in pieces if p is not None and len(p)]
+    return (np.concatenate(coords) if coords else np.empty((0, 2))), counts
+
+
+# ======================
+# OCS
+# ======================
+
+def ocs_to_wcs_2d(e):
+    """2x2 row-vector matrix mapping OCS x/y to WCS x/y (None if identity)."""
+
+    extrusion = e.dxf.get("extrusion", (0.0, 0.0, 1.0))
+    if tuple(extrusion) == (0.0, 0.0, 1.0):
+        return None
+
+    ocs = e.ocs()
+    ux, uy = ocs.to_wcs((1, 0, 0)), ocs.to_wcs((0, 1, 0))
+    return np.array([[ux.x, ux.y], [uy.x, uy.y]])
+
+
+# ======================
+# BATCH COLLECTOR
+# ======================
+
+class CurveBatch:
+    """
+    Collects curve entities while iterating a layout, then flattens
+    all of them in a few vectorized passes.
+    """
+
+    def __init__(self):
+        self._ellipses = []     # (center, major, ratio, start, sweep, closed, layer, ocs)
+        self._splines = []      # (ctrl, knots, degree, weights, closed, layer)
+        self._fit_splines = []  # (entity, closed, layer)
+
+    def __len__(self):
+        return len(self._ellipses) + len(self._splines) + len(self._fit_splines)
+
+    def add(self, e):
+        """Record e if it is a curve entity; returns False otherwise."""
+
+        etype = e.dxftype()
+        if etype not in CURVE_TYPES:
+            return False
+
+        dxf = e.dxf
+        layer = dxf.layer.lower() if dxf.hasattr("layer") else "default"
+
+        if etype in ("ARC", "CIRCLE"):
+            r = dxf.radius
+            if etype == "CIRCLE":
+                start, sweep, closed = 0.0, 2.0 * math.pi, True
+            else:
+                start = math.radians(dxf.start_angle)
+                sweep = math.radians(dxf.end_angle - dxf.start_angle) % (2.0 * math.pi)
+                sweep = sweep or 2.0 * math.pi
+                closed = False
+            c = dxf.center
+            self._ellipses.append(((c.x, c.y), (r, 0.0), 1.0, start, sweep, closed, layer, ocs_to_wcs_2d(e)))
+
+        elif etype == "ELLIPSE":
+            start, end = dxf.start_param, dxf.end_param
+            sweep = (end - start) % (2.0 * math.pi) or 2.0 * math.pi
+            closed = math.isclose(sweep, 2.0 * math.pi)
+            c, m = dxf.center, dxf.major_axis
+            ratio = dxf.ratio if dxf.extrusion.z >= 0 else -dxf.ratio
+            self._ellipses.append(((c.x, c.y), (m.x, m.y), ratio, start, sweep, closed, layer, None))
+
+        else:
+            ctrl = [(p[0], p[1]) for p in e.control_points]
+            if len(ctrl) > dxf.degree:
+                self._splines.append((ctrl, list(e.knots), dxf.degree, list(e.weights), e.closed, layer))
+            else:
+                # Fit-point only spline: ezdxf builds the curve in flatten()
+                self._fit_splines.append((e, e.closed, layer))
+
+        return True
+
+    def flatten(self, tolerance=CHORD_TOLERANCE):
+        """
+        Returns (coords, counts, types, layers, closed) ready for
+        EntityTableBuilder.extend().
+        """
+
+        coords, counts, types, layers, closed = [], [], [], [], []
+
+        if self._ellipses:
+            centers, major, ratio, start, sweep, is_closed, lay, ocs = zip(*self._ellipses)
+            c, n = flatten_ellipses(centers, major, ratio, start, sweep, is_closed, tolerance)
+
+            # Mirrored (non +Z extrusion) arcs/circles are defined in OCS
+            if any(m is not None for m in ocs):
+                owner = np.repeat(np.arange(len(n)), n)
+                mats = np.array([np.eye(2) if m is None else m for m in ocs])
+                c = np.einsum("nj,njl->nl", c, mats[owner])
+
+            coords.append(c)
+            counts.append(n)
+            types.extend([TYPE_CODES["POLYLINE"]] * len(n))
+            layers.extend(lay)
+            closed.extend(is_closed)
+
+        if self._splines:
+            ctrl, knots, degree, weights, is_closed, lay = zip(*self._splines)
+            c, n = flatten_splines(list(zip(ctrl, knots, degree, weights)), tolerance)
+            coords.append(c)
+            counts.append(n)
+            types.extend([TYPE_CODES["SPLINE"]] * len(n))
+            layers.extend(lay)
+            closed.extend(is_closed)
+
+        for e, is_closed, lay in self._fit_splines:
+            pts = [(p[0], p[1]) for p in e.flattening(tolerance)]
+            coords.append(np.asarray(pts, dtype=np.float64).reshape(-1, 2))
+            counts.append([len(pts)])
+            types.append(TYPE_CODES["SPLINE"])
+            layers.append(lay)
+            closed.append(is_closed)
+
+        if not coords:
+            return np.empty((0, 2)), np.empty(0, dtype=np.int64), [], [], []
+
+        return np.concatenate(coords), np.concatenate(counts), types, layers, closed
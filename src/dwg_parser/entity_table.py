@@ -0,0 +1,202 @@
+# src/dwg_parser/entity_table.py
+
+from array import array
+
+import numpy as np
+
+
+# ======================
+# ENTITY TYPE CODES
+# ======================
+
+ENTITY_TYPES = ["LINE", "POLYLINE", "SPLINE"]
+TYPE_CODES = {name: code for code, name in enumerate(ENTITY_TYPES)}
+
+
+# ======================
+# COLUMNAR TABLE
+# ======================
+
+class EntityTable:
+    """
+    Array-backed storage for parsed entities.
+
+    All vertices live in one flat (N, 2) coordinate buffer; entity i owns
+    rows offsets[i]:offsets[i + 1]. Type, layer and closed flags are small
+    integer arrays, and layer names are interned once in `layers`.
+    `stats` carries parse bookkeeping (e.g. skipped entities per layer).
+    """
+
+    def __init__(self, coords, offsets, types, layer_ids, closed, layers, stats=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.types = np.asarray(types, dtype=np.uint8)
+        self.layer_ids = np.asarray(layer_ids, dtype=np.int32)
+        self.closed = np.asarray(closed, dtype=bool)
+        self.layers = list(layers)
+        self.stats = stats if stats is not None else {}
+
+    def __len__(self):
+        return len(self.types)
+
+    @property
+    def counts(self):
+        """Number of vertices per entity."""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (
+            self.coords, self.offsets, self.types, self.layer_ids, self.closed
+        ))
+
+    def points(self, i):
+        """(k, 2) view on the vertices of entity i (no copy)."""
+        return self.coords[self.offsets[i]:self.offsets[i + 1]]
+
+    def rows(self):
+        """
+        Iterate (type, layer, points, closed) tuples.
+        Points are views into the coordinate buffer.
+        """
+
+        offsets = self.offsets.tolist()
+        types = self.types.tolist()
+        layer_ids = self.layer_ids.tolist()
+        closed = self.closed.tolist()
+
+        for i in range(len(types)):
+            yield (
+                ENTITY_TYPES[types[i]],
+                self.layers[layer_ids[i]],
+                self.coords[offsets[i]:offsets[i + 1]],
+                closed[i]
+            )
+
+    # -------------------------
+    # COMPATIBILITY ADAPTER
+    # -------------------------
+
+    @classmethod
+    def from_entities(cls, entities):
+        """Build a table from the legacy list-of-dicts form."""
+
+        builder = EntityTableBuilder()
+
+        for item in entities:
+            etype = item["type"]
+
+            if etype == "LINE":
+                pts = [item["start"][:2], item["end"][:2]]
+            else:
+                pts = [p[:2] for p in item.get("points", [])]
+
+            builder.add(etype, item.get("layer", ""), pts, item.get("closed", False))
+
+        return builder.build()
+
+    def to_entities(self):
+        """Convert back to the legacy list-of-dicts form."""
+
+        entities = []
+
+        for etype, layer, pts, closed in self.rows():
+            points = [[x, y, 0] for x, y in pts.tolist()]
+
+            if etype == "LINE":
+                entities.append({
+                    "type": "LINE",
+                    "start": points[0],
+                    "end": points[1],
+                    "layer": layer
+                })
+
+            elif etype == "POLYLINE":
+                entities.append({
+                    "type": "POLYLINE",
+                    "points": points,
+                    "closed": closed,
+                    "layer": layer
+                })
+
+            else:
+                entities.append({
+                    "type": etype,
+                    "points": points,
+                    "layer": layer
+                })
+
+        return entities
+
+
+# ======================
+# INCREMENTAL BUILDER
+# ======================
+
+class EntityTableBuilder:
+    """
+    Append entities into flat typed buffers, then freeze into an EntityTable.
+    Avoids creating per-vertex Python objects while parsing.
+    """
+
+    def __init__(self):
+        self._coords = array("d")
+        self._offsets = array("q", [0])
+        self._types = array("B")
+        self._layer_ids = array("i")
+        self._closed = array("B")
+        self._layer_index = {}
+
+    def __len__(self):
+        return len(self._types)
+
+    def layer_id(self, layer):
+        layer_id = self._layer_index.get(layer)
+        if layer_id is None:
+            layer_id = self._layer_index[layer] = len(self._layer_index)
+        return layer_id
+
+    def add(self, etype, layer, points, closed=False):
+        """Append one entity; points is any iterable of (x, y[, z]) items."""
+
+        coords = self._coords
+        for p in points:
+            coords.append(p[0])
+            coords.append(p[1])
+
+        self._offsets.append(len(coords) // 2)
+        self._types.append(TYPE_CODES[etype])
+        self._layer_ids.append(self.layer_id(layer))
+        self._closed.append(bool(closed))
+
+    def extend(self, coords, counts, types, layers, closed):
+        """
+        Append many entities at once from arrays: coords (N, 2),
+        per-entity vertex counts, type codes, layer names and closed flags.
+        """
+
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        ends = len(self._coords) // 2 + np.cumsum(counts, dtype=np.int64)
+
+        self._coords.frombytes(coords.tobytes())
+        self._offsets.frombytes(ends.tobytes())
+        self._types.frombytes(np.asarray(types, dtype=np.uint8).tobytes())
+        self._layer_ids.frombytes(
+            np.array([self.layer_id(layer) for layer in layers], dtype=np.int32).tobytes()
+        )
+        self._closed.frombytes(np.asarray(closed, dtype=np.uint8).tobytes())
+
+    def build(self, stats=None):
+        layers = [None] * len(self._layer_index)
+        for name, layer_id in self._layer_index.items():
+            layers[layer_id] = name
+
+        return EntityTable(
+            np.frombuffer(self._coords, dtype=np.float64),
+            np.frombuffer(self._offsets, dtype=np.int64),
+            np.frombuffer(self._types, dtype=np.uint8),
+            np.frombuffer(self._layer_ids, dtype=np.int32),
+            np.frombuffer(self._closed, dtype=np.uint8).astype(bool),
+            layers,
+            stats
+        )
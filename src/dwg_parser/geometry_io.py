@@ -0,0 +1,132 @@
+# src/dwg_parser/geometry_io.py
+
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from src.dwg_parser.entity_table import EntityTable
+
+
+# ======================
+# FILE LAYOUT
+# ======================
+#
+#   header   80 bytes, little-endian (see HEADER)
+#   coords   float64 [n_vertices, 2]
+#   offsets  int64   [n_entities + 1]
+#   layer    int32   [n_entities]
+#   types    uint8   [n_entities]
+#   closed   uint8   [n_entities]
+#   meta     UTF-8 JSON {"layers": [...], "stats": {...}}
+#
+# Every section starts on an 8-byte boundary so it can be mapped
+# straight into a NumPy array without copying.
+
+MAGIC = b"DGEO"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sHHQQQQQQQQ")
+HEADER_SIZE = 80
+ALIGN = 8
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# ======================
+# WRITE
+# ======================
+
+def save_geometry(table: EntityTable, path):
+    """Write an EntityTable in the binary .dgeo layout."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    n_entities = len(table)
+    sections = [
+        np.ascontiguousarray(table.coords, dtype="<f8"),
+        np.ascontiguousarray(table.offsets, dtype="<i8"),
+        np.ascontiguousarray(table.layer_ids, dtype="<i4"),
+        np.ascontiguousarray(table.types, dtype="u1"),
+        np.ascontiguousarray(table.closed, dtype="u1"),
+    ]
+    meta = json.dumps({"layers": table.layers, "stats": table.stats}).encode("utf-8")
+
+    starts = []
+    pos = HEADER_SIZE
+    for arr in sections:
+        starts.append(pos)
+        pos = _align(pos + arr.nbytes)
+    meta_start = pos
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        n_entities, len(table.coords),
+        *starts[:4], meta_start, len(meta)
+    )
+
+    # closed follows types at a fixed alignment, so it needs no header slot
+    assert starts[4] == _align(starts[3] + n_entities)
+
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        for start, arr in zip(starts, sections):
+            f.seek(start)
+            f.write(arr.tobytes())
+        f.seek(meta_start)
+        f.write(meta)
+    os.replace(tmp, path)
+
+
+# ======================
+# READ
+# ======================
+
+def load_geometry(path, mmap=True):
+    """
+    Read a .dgeo file into an EntityTable.
+
+    With mmap=True the arrays are read-only views on a memory map of
+    the file: nothing is copied until the data is touched.
+    """
+
+    path = Path(path)
+
+    if mmap:
+        buf = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buf = np.fromfile(path, dtype=np.uint8)
+
+    if len(buf) < HEADER_SIZE:
+        raise ValueError(f"Not a geometry file: {path}")
+
+    (magic, version, _flags, n_entities, n_vertices,
+     coords_at, offsets_at, layer_at, types_at,
+     meta_at, meta_len) = HEADER.unpack(bytes(buf[:HEADER.size]))
+
+    if magic != MAGIC:
+        raise ValueError(f"Not a geometry file: {path}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported geometry format version {version}: {path}")
+
+    def section(start, dtype, count):
+        return buf[start:start + count * np.dtype(dtype).itemsize].view(dtype)
+
+    closed_at = _align(types_at + n_entities)
+    meta = json.loads(bytes(buf[meta_at:meta_at + meta_len]).decode("utf-8"))
+
+    return EntityTable(
+        section(coords_at, "<f8", n_vertices * 2).reshape(-1, 2),
+        section(offsets_at, "<i8", n_entities + 1),
+        section(types_at, "u1", n_entities),
+        section(layer_at, "<i4", n_entities),
+        section(closed_at, "u1", n_entities).view(bool),
+        meta["layers"],
+        meta["stats"]
+    )
@@ -0,0 +1,138 @@
+# src/dwg_parser/parse_cache.py
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from src.dwg_parser.curves import CHORD_TOLERANCE
+from src.dwg_parser.geometry_io import save_geometry, load_geometry
+from src.dwg_parser.parse_dwg import parse_dwg, PARSER_VERSION, IGNORE_ENTITY_TYPES
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# CONFIG
+# ======================
+
+CACHE_DIR = Path(os.environ.get("DWG_PARSE_CACHE_DIR", "data/cache/parse"))
+CACHE_MAX_BYTES = int(os.environ.get("DWG_PARSE_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+# ======================
+# KEYS
+# ======================
+
+def _option_token(value):
+    """
+    Stable, process-independent representation of a parse option.
+    A callable is represented by its cache_token; without one it has
+    none (None), since two lambdas or partials share a name but not
+    their behaviour.
+    """
+
+    if callable(value):
+        return getattr(value, "cache_token", None)
+    return value
+
+
+def cache_key(file_path, **options):
+    """
+    Content hash of the DXF bytes plus everything that changes the
+    parser output (parser version, ignored types, parse options).
+    None when an option cannot be keyed (see _option_token).
+    """
+
+    tokens = {k: _option_token(v) for k, v in options.items()}
+    if any(tokens[k] is None and callable(v) for k, v in options.items()):
+        return None
+
+    h = hashlib.blake2b(digest_size=20)
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+
+    h.update(json.dumps({
+        "parser_version": PARSER_VERSION,
+        "ignore_entity_types": sorted(IGNORE_ENTITY_TYPES),
+        "chord_tolerance": CHORD_TOLERANCE,
+        "options": tokens
+    }, sort_keys=True, default=str).encode())
+
+    return h.hexdigest()
+
+
+# ======================
+# EVICTION
+# ======================
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Drop least-recently-used entries until the cache fits in max_bytes.
+    Hits touch their entry, so mtime order is LRU order.
+    """
+
+    entries = []
+    for p in Path(cache_dir).glob("*.dgeo"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+
+    for _, size, p in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        p.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+
+    return removed
+
+
+# ======================
+# CACHED PARSE
+# ======================
+
+def parse_cached(file_path, cache_dir=None, max_bytes=None, **options):
+    """
+    parse_dwg(file_path, as_table=True, **options) backed by an on-disk
+    cache. A hit never opens the DXF with ezdxf; the cached arrays are
+    memory-mapped, read-only views. Callable options (layer_filter)
+    need a cache_token to be cached; otherwise the cache is bypassed.
+    """
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    max_bytes = max_bytes if max_bytes is not None else CACHE_MAX_BYTES
+
+    key = cache_key(file_path, **options)
+    if key is None:
+        logger.info("Parse options without a cache_token, not caching")
+        return parse_dwg(file_path, as_table=True, **options)
+
+    entry = cache_dir / f"{key}.dgeo"
+
+    if entry.exists():
+        try:
+            table = load_geometry(entry)
+            os.utime(entry)
+            logger.info("Parse cache hit: %s", key[:12])
+            return table
+        except (OSError, ValueError) as e:
+            logger.warning("Corrupt parse cache entry, re-parsing: %s", e)
+            entry.unlink(missing_ok=True)
+
+    table = parse_dwg(file_path, as_table=True, **options)
+
+    save_geometry(table, entry)
+    evict(cache_dir, max_bytes)
+
+    return table
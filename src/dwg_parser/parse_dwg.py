@@ -93,19 +93,276 @@
 # src/dwg_parser/parse_dwg.py
 
 import ezdxf
+from ezdxf.addons import iterdxf
 import json
+import logging
+import math
+from collections import Counter
 from pathlib import Path
 
+import numpy as np
 
-IGNORE_ENTITY_TYPES = ["TEXT", "MTEXT", "DIMENSION", "HATCH", "INSERT"]
+from src.dwg_parser.blocks import BlockCache, expand_inserts
+from src.dwg_parser.curves import CurveBatch, CURVE_TYPES, CHORD_TOLERANCE, flatten_bulges, ocs_to_wcs_2d
+from src.dwg_parser.entity_table import EntityTable, EntityTableBuilder, ENTITY_TYPES
+from src.dwg_parser.units import header_unit, resolve_units, read_header_units
 
+logger = logging.getLogger(__name__)
+
+
+# Bump whenever the parser output changes (invalidates the parse cache)
+PARSER_VERSION = 6
+
+IGNORE_ENTITY_TYPES = ["TEXT", "MTEXT", "DIMENSION", "HATCH"]
+SUPPORTED_ENTITY_TYPES = ["LINE", "LWPOLYLINE", "POLYLINE"] + CURVE_TYPES
+
+
+def read_entity(e, tolerance=CHORD_TOLERANCE):
+    """
+    Read a single DXF entity as (type, layer, points, closed).
+    Points are (x, y) pairs in drawing units; curves and bulged segments
+    are flattened to within `tolerance` drawing units (callers convert
+    CHORD_TOLERANCE from metres, see parse_dwg). Returns None for entity types
+    the pipeline does not use.
+    """
+
+    etype = e.dxftype()
+    layer = e.dxf.layer.lower() if hasattr(e.dxf, "layer") else "default"
+
+    # -------- LINE --------
+    if etype == "LINE":
+        start, end = e.dxf.start, e.dxf.end
+        return "LINE", layer, [(start.x, start.y), (end.x, end.y)], False
+
+    # -------- POLYLINE / LWPOLYLINE --------
+    elif etype == "LWPOLYLINE":
+        closed = bool(e.closed)
+        raw = e.get_points("xyb")
+        pts = [(p[0], p[1]) for p in raw]
+
+        if any(p[2] for p in raw):
+            pts = flatten_bulges(pts, [p[2] for p in raw], closed, tolerance)
+
+        # LWPOLYLINE vertices are OCS coordinates (mirrored geometry)
+        ocs = ocs_to_wcs_2d(e)
+        if ocs is not None:
+            pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2) @ ocs
+
+        return "POLYLINE", layer, pts, closed
+
+    elif etype == "POLYLINE":
+        closed = bool(e.is_closed)
+        pts = [(p[0], p[1]) for p in e.points()]
+        bulges = [v.dxf.bulge for v in e.vertices]
+
+        if any(bulges):
+            pts = flatten_bulges(pts, bulges, closed, tolerance)
+
+        return "POLYLINE", layer, pts, closed
+
+    # -------- ARC / CIRCLE / ELLIPSE / SPLINE --------
+    elif etype in CURVE_TYPES:
+        batch = CurveBatch()
+        batch.add(e)
+        coords, _, types, _, closed = batch.flatten(tolerance)
+        return ENTITY_TYPES[types[0]], layer, coords, bool(closed[0])
+
+    return None
+
+
+def normalize_entity(e, tolerance=CHORD_TOLERANCE):
+    """
+    Convert a single DXF entity into the parser's dict form.
+    Returns None for entity types the pipeline does not use.
+    """
+
+    row = read_entity(e, tolerance)
+    if row is None:
+        return None
+
+    etype, layer, pts, closed = row
+    points = [[float(x), float(y), 0] for x, y in pts]
+
+    if etype == "LINE":
+        return {
+            "type": "LINE",
+            "start": points[0],
+            "end": points[1],
+            "layer": layer
+        }
+
+    elif etype == "POLYLINE":
+        return {
+            "type": "POLYLINE",
+            "points": points,
+            "closed": closed,
+            "layer": layer
+        }
+
+    return {
+        "type": etype,
+        "points": points,
+        "layer": layer
+    }
+
+
+class LayerFilter:
+    """
+    Keep/skip decision per layer, made once per distinct layer name.
+
+    layer_filter is either a predicate on the lowercased layer name or a
+    {layer: category} map, where layers mapped to "ignore" (or missing
+    from the map) are skipped. Skipped entities are counted per layer.
+    """
+
+    def __init__(self, layer_filter, layer_names=()):
+        if isinstance(layer_filter, dict):
+            categories = {k.lower(): v for k, v in layer_filter.items()}
+            self.predicate = lambda name: categories.get(name, "ignore") != "ignore"
+        else:
+            self.predicate = layer_filter
+
+        self.skipped = Counter()
+        self._keep = {}
+
+        # Classify the whole layer table up front
+        for name in layer_names:
+            self.accepts(name.lower())
+
+    def accepts(self, layer):
+        keep = self._keep.get(layer)
+        if keep is None:
+            keep = self._keep[layer] = bool(self.predicate(layer))
+        return keep
+
+    def __call__(self, layer):
+        """accepts(), counting the entity as skipped when rejected."""
+
+        if self.accepts(layer):
+            return True
+        self.skipped[layer] += 1
+        return False
+
+
+def iter_entities(file_path, chord_tolerance=CHORD_TOLERANCE, layer_filter=None, units="auto", stats=None):
+    """
+    Stream normalized modelspace entities with bounded memory.
+
+    Unlike parse_dwg, the document is never loaded as a whole: ezdxf's
+    iterdxf reader walks the ENTITIES section of the file and only
+    builds objects for the supported types, one at a time.
+    Requires an ASCII DXF file.
+
+    Points are in metres (see parse_dwg). The units come from the header
+    only: the coordinates are seen once, so a drawing without $INSUNITS
+    is never guessed and takes the $MEASUREMENT default (millimetres or
+    inches, see resolve_units), scaled like any other. Pass units to
+    override it.
+
+    The BLOCKS section is never read, so INSERTs cannot be expanded:
+    they are counted and skipped with a warning. When a `stats` dict is
+    given it is filled like EntityTable.stats (units, unit_scale,
+    units_source, skipped_by_layer, skipped_inserts) once the stream is
+    exhausted.
+    """
+
+    keep = LayerFilter(layer_filter) if layer_filter is not None else None
+
+    insunits, measurement = read_header_units(file_path)
+    if units == "auto" and header_unit(insunits) is None:
+        logger.warning("Streaming does not guess drawing units; the $MEASUREMENT default applies")
+    name, scale, source = resolve_units(units, insunits, measurement)
+    tolerance = chord_tolerance / scale
+    logger.info("Drawing units: %s (%s), %g m per unit", name, source, scale)
+    skipped_inserts = 0
+
+    for e in iterdxf.modelspace(str(file_path), types=SUPPORTED_ENTITY_TYPES + ["INSERT"]):
+        if e.dxftype() == "INSERT":
+            skipped_inserts += 1
+            continue
+
+        if keep is not None and not keep(e.dxf.layer.lower()):
+            continue
+
+        item = normalize_entity(e, tolerance)
+        if item is None:
+            continue
+
+        if scale != 1.0:
+            for key in ("start", "end", "points"):
+                if key in item:
+                    item[key] = _scaled(item[key], scale)
+        yield item
+
+    if skipped_inserts:
+        logger.warning("Streaming skips block references (INSERT): %d not expanded", skipped_inserts)
+
+    if stats is not None:
+        stats.update(
+            units=name, unit_scale=scale, units_source=source,
+            skipped_by_layer=dict(keep.skipped) if keep is not None else {},
+            skipped_inserts=skipped_inserts
+        )
+
+
+def _scaled(points, scale):
+    if points and isinstance(points[0], list):
+        return [[x * scale, y * scale, 0] for x, y, _ in points]
+    return [points[0] * scale, points[1] * scale, 0]
+
+
+def parse_dwg(file_path, streaming=False, as_table=False, expand_blocks=True,
+              chord_tolerance=CHORD_TOLERANCE, layer_filter=None, units="auto"):
+    """
+    Parse modelspace geometry.
+
+    Returns the legacy list of entity dicts, or an EntityTable
+    (flat coordinate buffer + per-entity index) when as_table=True.
+
+    With expand_blocks, INSERT references are replaced by their block
+    geometry (see blocks.py). Streaming mode never sees the BLOCKS
+    section, so it skips INSERTs.
+
+    ARC / CIRCLE / ELLIPSE / SPLINE and bulged polyline segments are
+    flattened to polylines within chord_tolerance metres, whatever the
+    drawing unit.
+
+    layer_filter (predicate or {layer: category} map, see LayerFilter)
+    drops entities on unwanted layers before any coordinate conversion.
+    Per-layer skip counts are reported in table.stats["skipped_by_layer"].
+
+    Coordinates are returned in metres. The drawing unit comes from
+    $INSUNITS, or is guessed from segment lengths when the header has
+    none (see units.py); units="mm", "inch", ... or a metres-per-unit
+    number overrides it. The unit is resolved before any curve is
+    flattened; a guess uses the straight geometry (bulged segments read
+    as chords). The scale is applied once to the coordinate
+    buffer and recorded in table.stats ("units", "unit_scale",
+    "units_source"). streaming=True never guesses (see iter_entities).
+    """
+
+    if streaming:
+        stats = {}
+        entities = list(iter_entities(file_path, chord_tolerance, layer_filter, units, stats))
+        logger.info("Parsed entities (streaming): %d", len(entities))
+        if not as_table:
+            return entities
+
+        table = EntityTable.from_entities(entities)
+        table.stats.update(stats)
+        return table
 
-def parse_dwg(file_path):
     doc = ezdxf.readfile(file_path)
     msp = doc.modelspace()
 
-    entities = []
-    layers_found = set()
+    keep = None
+    if layer_filter is not None:
+        keep = LayerFilter(layer_filter, (layer.dxf.name for layer in doc.layers))
+
+    builder = EntityTableBuilder()
+    curves = CurveBatch()
+    inserts = []
+    plain = []
     ignored_count = 0
 
     for e in msp:
@@ -116,55 +373,88 @@ def parse_dwg(file_path):
             ignored_count += 1
             continue
 
-        layer = e.dxf.layer.lower() if hasattr(e.dxf, "layer") else "default"
-        layers_found.add(layer)
-
-        # -------- LINE --------
-        if etype == "LINE":
-            entities.append({
-                "type": "LINE",
-                "start": [float(e.dxf.start.x), float(e.dxf.start.y), 0],
-                "end": [float(e.dxf.end.x), float(e.dxf.end.y), 0],
-                "layer": layer
-            })
-
-        # -------- POLYLINE / LWPOLYLINE --------
-        elif etype in ["LWPOLYLINE", "POLYLINE"]:
-            points = []
-            for p in e.get_points():
-                points.append([float(p[0]), float(p[1]), 0])
-
-            entities.append({
-                "type": "POLYLINE",
-                "points": points,
-                "closed": bool(e.closed),
-                "layer": layer
-            })
-
-        # -------- SPLINE --------
-        elif etype == "SPLINE":
-            points = []
-            for p in e.control_points:
-                points.append([float(p[0]), float(p[1]), 0])
-
-            entities.append({
-                "type": "SPLINE",
-                "points": points,
-                "layer": layer
-            })
+        # Block contents are filtered by their own layers on expansion
+        if etype != "INSERT" and keep is not None and not keep(e.dxf.layer.lower()):
+            continue
 
+        if etype == "INSERT":
+            if expand_blocks:
+                inserts.append(e)
+            else:
+                ignored_count += 1
+            continue
+
+        # Curves are flattened together after the loop
+        if curves.add(e):
+            continue
+
+        plain.append(e)
+
+    # -------- UNITS --------
+    # Needed before flattening: the chord tolerance is in metres
+    insunits, measurement = doc.header.get("$INSUNITS"), doc.header.get("$MEASUREMENT")
+    rows = None
+    if units == "auto" and header_unit(insunits) is None:
+        # An infinite tolerance reads bulged segments as their chords
+        rows = [read_entity(e, math.inf) for e in plain]
+        points = [np.asarray(row[2], dtype=np.float64).reshape(-1, 2) for row in rows if row is not None]
+        coords = np.concatenate(points) if points else np.empty((0, 2))
+        offsets = np.concatenate([[0], np.cumsum([len(p) for p in points])])
+        name, scale, source = resolve_units(units, insunits, measurement, coords, offsets)
+    else:
+        name, scale, source = resolve_units(units, insunits, measurement)
+
+    tolerance = chord_tolerance / scale
+    logger.info("Drawing units: %s (%s), %g m per unit", name, source, scale)
+
+    for i, e in enumerate(plain):
+        # Only polylines can carry bulges; probed lines are final
+        if rows is not None and rows[i] is not None and rows[i][0] == "LINE":
+            row = rows[i]
         else:
+            row = read_entity(e, tolerance)
+
+        if row is None:
             ignored_count += 1
             continue
 
-    print("Parsed entities:", len(entities))
-    print("Ignored entities:", ignored_count)
-    print("DXF Layers found:", layers_found)
+        builder.add(*row)
+
+    # -------- CURVES --------
+    if len(curves):
+        builder.extend(*curves.flatten(tolerance))
+
+    # -------- BLOCK REFERENCES --------
+    if inserts:
+        blocks = BlockCache(doc, read_entity, tolerance, layer_filter=keep)
+        placed = expand_inserts(inserts, blocks, builder, layer_filter=keep)
+        logger.info("Block copies expanded: %d", placed)
 
-    return entities
+        if blocks.too_deep:
+            logger.warning("Nested blocks beyond depth limit skipped: %d", blocks.too_deep)
+
+    table = builder.build(stats={
+        "ignored_types": ignored_count,
+        "skipped_by_layer": dict(keep.skipped) if keep is not None else {}
+    })
+
+    if scale != 1.0:
+        table.coords *= scale
+    table.stats.update(units=name, unit_scale=scale, units_source=source)
+
+    logger.info("Parsed entities: %d", len(table))
+    logger.info("Ignored entities: %d", ignored_count)
+    logger.debug("DXF Layers found: %s", set(table.layers))
+
+    return table if as_table else table.to_entities()
 
 
 def save_json(data, path):
+    """
+    Human-readable dump for debugging only; use
+    geometry_io.save_geometry for anything that is read back.
+    """
+
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
@@ -0,0 +1,133 @@
+# src/dwg_parser/units.py
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# UNIT TABLE
+# ======================
+
+# $INSUNITS code -> (name, metres per drawing unit)
+INSUNITS = {
+    1: ("inch", 0.0254),
+    2: ("foot", 0.3048),
+    3: ("mile", 1609.344),
+    4: ("millimetre", 0.001),
+    5: ("centimetre", 0.01),
+    6: ("metre", 1.0),
+    7: ("kilometre", 1000.0),
+    8: ("microinch", 0.0254e-6),
+    9: ("mil", 0.0254e-3),
+    10: ("yard", 0.9144),
+    14: ("decimetre", 0.1),
+    15: ("decametre", 10.0),
+    16: ("hectometre", 100.0),
+}
+
+UNIT_NAMES = {name: scale for name, scale in INSUNITS.values()}
+UNIT_NAMES.update({"in": 0.0254, "ft": 0.3048, "mm": 0.001, "cm": 0.01, "m": 1.0})
+
+# Units a building plan is plausibly drawn in, by $MEASUREMENT
+# (0 = imperial, 1 = metric)
+CANDIDATES = {
+    0: ["inch", "foot"],
+    1: ["millimetre", "centimetre", "metre"],
+    None: ["millimetre", "centimetre", "inch", "foot", "metre"],
+}
+
+# Typical length of a long wall segment (90th percentile), metres
+TYPICAL_WALL_M = 4.0
+
+
+# ======================
+# DETECTION
+# ======================
+
+def guess_unit(coords, offsets, measurement=None):
+    """
+    Unit of a drawing without $INSUNITS, from its segment lengths: the
+    candidate that puts the 90th percentile segment (the long walls)
+    nearest TYPICAL_WALL_M. Returns the unit name.
+    """
+
+    candidates = CANDIDATES.get(measurement, CANDIDATES[None])
+
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(coords) < 2:
+        return candidates[0]
+
+    # Segments between consecutive vertices of the same entity
+    lengths = np.hypot(*np.diff(coords, axis=0).T)
+    same = np.ones(len(lengths), dtype=bool)
+    ends = np.asarray(offsets)[1:-1] - 1
+    same[ends[(ends >= 0) & (ends < len(same))]] = False
+    lengths = lengths[same & (lengths > 0)]
+    if not len(lengths):
+        return candidates[0]
+
+    long_wall = np.percentile(lengths, 90)
+    errors = [abs(np.log(long_wall * UNIT_NAMES[name] / TYPICAL_WALL_M)) for name in candidates]
+    return candidates[int(np.argmin(errors))]
+
+
+def header_unit(insunits):
+    """Unit name from $INSUNITS, or None when the drawing is unitless."""
+    entry = INSUNITS.get(insunits)
+    return entry[0] if entry else None
+
+
+def resolve_units(units, insunits=None, measurement=None, coords=None, offsets=None):
+    """
+    (unit name, metres per unit, source) for a drawing.
+
+    units is "auto" (header, then guess_unit() from the coordinates),
+    a unit name ("mm", "inch", ...) or a number of metres per unit.
+    Without coordinates to guess from, a unitless drawing is taken as
+    millimetres (metric) or inches (imperial).
+    """
+
+    if isinstance(units, (int, float)):
+        return "custom", float(units), "given"
+
+    if units != "auto":
+        if units not in UNIT_NAMES:
+            raise ValueError(f"Unknown drawing unit: {units}")
+        return units, UNIT_NAMES[units], "given"
+
+    name = header_unit(insunits)
+    if name is not None:
+        return name, UNIT_NAMES[name], "header"
+
+    if coords is not None:
+        name = guess_unit(coords, offsets, measurement)
+        logger.warning("Drawing has no $INSUNITS, guessed %s from wall lengths", name)
+        return name, UNIT_NAMES[name], "guessed"
+
+    name = "inch" if measurement == 0 else "millimetre"
+    logger.warning("Drawing has no $INSUNITS, assuming %s", name)
+    return name, UNIT_NAMES[name], "default"
+
+
+def read_header_units(file_path):
+    """
+    ($INSUNITS, $MEASUREMENT) from the HEADER section of an ASCII DXF,
+    without loading the document (for the streaming parser).
+    """
+
+    wanted = {"$INSUNITS": None, "$MEASUREMENT": None}
+
+    with open(file_path, "r", errors="replace") as f:
+        lines = iter(f)
+        for code in lines:
+            value = next(lines, "").strip()
+            if code.strip() == "0" and value == "ENDSEC":
+                break
+            if code.strip() == "9" and value in wanted:
+                next(lines, None)  # group code of the value
+                wanted[value] = int(next(lines, "0").strip())
+
+    return wanted["$INSUNITS"], wanted["$MEASUREMENT"]
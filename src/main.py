@@ -31,12 +31,26 @@
 
 # if __name__ == "__main__":
 #     main()
+import argparse
+import logging
 import sys
 from pathlib import Path
 
-from src.dwg_parser.parse_dwg import parse_dwg
+from src.dwg_parser.curves import CHORD_TOLERANCE
+from src.dwg_parser.parse_dwg import parse_dwg, iter_entities
+from src.dwg_parser.parse_cache import parse_cached
 from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
-from src.renderer.mesh_reconstruction import build_mesh
+from src.preprocessing.layer_classifier import LayerClassifier, DEFAULT_CLASSIFIER
+from src.preprocessing.openings import host_openings
+from src.preprocessing.simplify import SIMPLIFY_TOLERANCE
+from src.preprocessing.wall_graph import build_wall_graph, SNAP_TOLERANCE
+from src.preprocessing.wall_pairing import pair_walls, PAIR_MIN_THICKNESS, PAIR_MAX_THICKNESS
+from src.renderer.mesh_reconstruction import build_mesh, INSTANCING, WALL_HEIGHT, WALL_THICKNESS
+from src.renderer.incremental import IncrementalState, STATE_VERSION, state_name
+from src.renderer.tiled import build_mesh_tiled
+from src.metrics import PipelineReport, METRICS_JSONL
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -56,26 +70,137 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 # MAIN PIPELINE
 # ======================
 
-def run_pipeline(dxf_path: Path):
-    print("📂 Loading DXF:", dxf_path)
+def _counted(entities, report):
+    """Pass a lazy entity stream through, counting it into the report."""
+    n = 0
+    for e in entities:
+        n += 1
+        yield e
+    report.count("entities", n)
+
+
+def _count_parse_stats(report, stats):
+    """Units and skipped entities from the parser's stats (see parse_dwg / iter_entities)."""
+
+    if "unit_scale" in stats:
+        report.count("units", stats["units"])
+        report.count("unit_scale", stats["unit_scale"])
+    if "skipped_by_layer" in stats:
+        report.count("skipped_by_layer", sum(stats["skipped_by_layer"].values()))
+    if stats.get("skipped_inserts"):
+        report.count("skipped_inserts", stats["skipped_inserts"])
+
+
+def run_pipeline(dxf_path: Path, streaming: bool = False, use_cache: bool = True,
+                 metrics_jsonl=METRICS_JSONL, output_dir: Path = OUTPUT_DIR,
+                 classifier: LayerClassifier = DEFAULT_CLASSIFIER, incremental: bool = False,
+                 tiled: bool = False, workers: int = None, tile_size: float = None,
+                 center: bool = True, instancing: str = INSTANCING, lods: bool = False,
+                 quantize: bool = False):
+    """
+    DXF -> GLB. Returns a PipelineReport with per-stage timings,
+    counters and peak memory. classifier maps layer names to
+    categories (see layer_classifier.py).
+
+    incremental reuses rooms and wall meshes from the previous run of the
+    same drawing path and output_dir (see renderer/incremental.py).
+
+    tiled builds floor and wall meshes per spatial tile on `workers` processes
+    (see renderer/tiled.py); it cannot be combined with incremental.
+    center=False keeps drawing coordinates in the GLB (building mode).
+    instancing picks how repeated doors / windows are written: "nodes"
+    (shared-mesh nodes, the default), "gpu" (EXT_mesh_gpu_instancing,
+    opt-in: not every viewer loads it) or "none" (baked copies).
+    lods also writes simplified and massing GLBs plus a manifest (see
+    LODS in renderer/mesh_reconstruction.py); not in tiled mode.
+    quantize writes KHR_mesh_quantization GLBs (see renderer/quantize.py).
+    """
+
+    if tiled and incremental:
+        raise ValueError("Tiled and incremental modes cannot be combined")
+    if tiled and lods:
+        raise ValueError("Tiled mode does not build LODs")
+
+    report = PipelineReport(Path(dxf_path).name, jsonl_path=metrics_jsonl)
+    logger.info("Loading DXF: %s", dxf_path)
+
+    # 1️⃣ Parse DWG/DXF + 2️⃣ Extract geometry
+    if streaming:
+        # Entities are consumed lazily by the extractor (bounded memory),
+        # so parsing and extraction share one stage
+        stats = {}
+        with report.stage("parse_extract"):
+            entities = _counted(iter_entities(dxf_path, layer_filter=classifier, stats=stats), report)
+            geometry = extract_walls_floors_doors_windows(entities, classifier)
+        _count_parse_stats(report, stats)
+    else:
+        with report.stage("parse"):
+            if use_cache:
+                entities = parse_cached(dxf_path, layer_filter=classifier)
+            else:
+                entities = parse_dwg(dxf_path, as_table=True, layer_filter=classifier)
+
+        report.count("entities", len(entities))
+        _count_parse_stats(report, entities.stats)
+
+        if not entities:
+            raise ValueError("No entities parsed from DXF")
+
+        with report.stage("extract"):
+            geometry = extract_walls_floors_doors_windows(entities, classifier)
+
+    for key in ("walls", "doors", "windows"):
+        report.count(key, len(geometry[key]))
 
-    # 1️⃣ Parse DWG/DXF
-    entities = parse_dwg(dxf_path)
+    if not geometry["walls"]:
+        raise ValueError("No wall geometry extracted")
 
-    if not entities:
-        raise ValueError("No entities parsed from DXF")
+    # Snapped, noded wall graph shared by room detection and centerlines
+    with report.stage("wall_graph"):
+        geometry["wall_graph"] = build_wall_graph(geometry)
+    report.count("graph_nodes", len(geometry["wall_graph"].nodes))
+    report.count("graph_edges", len(geometry["wall_graph"]))
 
-    # 2️⃣ Extract geometry
-    geometry = extract_walls_floors_doors_windows(entities)
+    with report.stage("wall_pairing"):
+        geometry["wall_pairs"] = pair_walls(geometry)
+    report.count("walls_paired", len(geometry["wall_pairs"]))
 
-    if not geometry["walls"]:
-        raise ValueError("No wall geometry extracted")
+    # Host doors / windows in their walls
+    with report.stage("openings"):
+        geometry["openings"] = host_openings(geometry)
+    report.count("openings_hosted", len(geometry["openings"]))
 
     # 3️⃣ Build 3D mesh
-    output_path = OUTPUT_DIR / dxf_path.stem
-    build_mesh(geometry, output_path)
-
-    print("🎉 Pipeline completed successfully!")
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    output_path = Path(output_dir) / Path(dxf_path).stem
+
+    state = None
+    if incremental:
+        # Everything that shapes rooms and walls, the drawing unit included
+        params = (
+            STATE_VERSION, WALL_HEIGHT, WALL_THICKNESS, SNAP_TOLERANCE,
+            SIMPLIFY_TOLERANCE, classifier.cache_token, PAIR_MIN_THICKNESS,
+            PAIR_MAX_THICKNESS, CHORD_TOLERANCE, report.counters.get("unit_scale")
+        )
+        state_key = state_name(dxf_path, output_dir)
+        state = IncrementalState.load(state_key, params)
+
+    if tiled:
+        build_mesh_tiled(
+            geometry, output_path, report=report, tile_size=tile_size, workers=workers,
+            center=center, instancing=instancing, quantize=quantize
+        )
+    else:
+        build_mesh(
+            geometry, output_path, report=report, state=state, center=center,
+            instancing=instancing, lods=lods, quantize=quantize
+        )
+
+    if state is not None:
+        state.save(state_key)
+
+    logger.info("Pipeline completed successfully!")
+    return report.finish()
 
 
 # ======================
@@ -84,18 +209,113 @@ def run_pipeline(dxf_path: Path):
 
 if __name__ == "__main__":
 
-    if len(sys.argv) < 2:
-        print("Usage:")
-        print("python main.py <path_to_dxf_file>")
-        sys.exit(1)
-
-    dxf_file = Path(sys.argv[1])
+    parser = argparse.ArgumentParser(description="DWG/DXF to 3D GLB pipeline")
+    parser.add_argument("dxf_file", type=Path, help="path to the DXF file (--building: manifest or directory)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stream modelspace entities instead of loading the whole document"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always re-parse the DXF instead of using the parse cache"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="reuse rooms and wall meshes from the previous run of this drawing"
+    )
+    parser.add_argument(
+        "--building",
+        action="store_true",
+        help="build all levels of a manifest / directory of per-level DXFs into one GLB"
+    )
+    parser.add_argument(
+        "--tiled",
+        action="store_true",
+        help="build floor and wall meshes per spatial tile in a process pool (large site plans)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes for --tiled / --building (default: all cores)"
+    )
+    parser.add_argument(
+        "--instancing",
+        choices=["nodes", "gpu", "none"],
+        default=INSTANCING,
+        help="repeated doors / windows: shared-mesh nodes (default), EXT_mesh_gpu_instancing "
+             "(required by the file, not every viewer loads it), or baked copies"
+    )
+    parser.add_argument(
+        "--lods",
+        action="store_true",
+        help="also write simplified / massing levels of detail and a <name>_lods.json manifest"
+    )
+    parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help="write int16 positions / UVs and uint16 indices (KHR_mesh_quantization)"
+    )
+    parser.add_argument(
+        "--layer-rules",
+        default="default",
+        help="built-in layer rule set (default, cisfb) or a JSON rule file"
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="count",
+        default=0,
+        help="log progress (-v) or per-wall detail (-vv)"
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        type=Path,
+        default=METRICS_JSONL,
+        help="append stage timings and counters to this file as JSON lines"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=[logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)],
+        format="%(levelname)s %(name)s: %(message)s"
+    )
+
+    dxf_file = args.dxf_file
 
     if not dxf_file.exists():
         print("❌ DXF file not found:", dxf_file)
         sys.exit(1)
 
     try:
-        run_pipeline(dxf_file)
+        if args.building:
+            from src.building import load_levels, run_building
+
+            name, levels = load_levels(dxf_file)
+            report = run_building(
+                levels,
+                name,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+                classifier=LayerClassifier.from_name(args.layer_rules),
+                metrics_jsonl=args.metrics_jsonl
+            )
+        else:
+            report = run_pipeline(
+                dxf_file,
+                streaming=args.stream,
+                use_cache=not args.no_cache,
+                metrics_jsonl=args.metrics_jsonl,
+                classifier=LayerClassifier.from_name(args.layer_rules),
+                incremental=args.incremental,
+                tiled=args.tiled,
+                workers=args.workers,
+                instancing=args.instancing,
+                lods=args.lods,
+                quantize=args.quantize
+            )
+        print(report.summary())
     except Exception as e:
         print("❌ Pipeline failed:", e)
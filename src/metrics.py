@@ -0,0 +1,137 @@
+# src/metrics.py
+
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Set to a file path to append every report as JSON lines
+METRICS_JSONL = os.environ.get("DWG_METRICS_JSONL")
+
+
+# ======================
+# MEMORY
+# ======================
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB.
+    Uses VmHWM on Linux (ru_maxrss survives exec and may include the
+    parent's footprint).
+    """
+
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024.0
+
+    # ru_maxrss is reported in KiB on Linux, bytes on macOS
+    scale = 1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+# ======================
+# REPORT
+# ======================
+
+class PipelineReport:
+    """
+    Per-stage wall-clock / CPU timings, counters and peak memory for one
+    pipeline run. Stages are timed with the `stage()` context manager;
+    with a jsonl_path every finished stage and the final summary are
+    appended to that file as JSON lines.
+    """
+
+    def __init__(self, name="", jsonl_path=METRICS_JSONL):
+        self.name = name
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.stages = []
+        self.counters = {}
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    # -------------------------
+    # RECORDING
+    # -------------------------
+
+    @contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield self
+        finally:
+            record = {
+                "stage": name,
+                "wall_s": time.perf_counter() - wall,
+                "cpu_s": time.process_time() - cpu,
+                "peak_rss_mb": peak_rss_mb()
+            }
+            self.stages.append(record)
+            logger.info("%s: %.3fs wall, %.3fs cpu", name, record["wall_s"], record["cpu_s"])
+            self._emit({"event": "stage", **record})
+
+    def record_stage(self, name, wall_s, cpu_s=0.0, peak_mb=None):
+        """Add a stage timed elsewhere (e.g. in a worker process)."""
+        record = {
+            "stage": name,
+            "wall_s": wall_s,
+            "cpu_s": cpu_s,
+            "peak_rss_mb": peak_rss_mb() if peak_mb is None else peak_mb
+        }
+        self.stages.append(record)
+        self._emit({"event": "stage", **record})
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def incr(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def stage_time(self, name):
+        """Total wall-clock seconds spent in stages called `name`."""
+        return sum(s["wall_s"] for s in self.stages if s["stage"] == name)
+
+    # -------------------------
+    # OUTPUT
+    # -------------------------
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "wall_s": time.perf_counter() - self._start,
+            "cpu_s": time.process_time() - self._cpu_start,
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": list(self.stages),
+            "counters": dict(self.counters)
+        }
+
+    def finish(self):
+        """Emit the summary line; returns the report for chaining."""
+        self._emit({"event": "summary", **self.to_dict()})
+        return self
+
+    def summary(self):
+        data = self.to_dict()
+        lines = [f"{'stage':<20} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}"]
+        for s in data["stages"]:
+            lines.append(
+                f"{s['stage']:<20} {s['wall_s']:>9.3f} {s['cpu_s']:>9.3f} {s['peak_rss_mb']:>9.1f}"
+            )
+        lines.append(f"{'total':<20} {data['wall_s']:>9.3f} {data['cpu_s']:>9.3f} {data['peak_rss_mb']:>9.1f}")
+        lines.extend(f"{k}: {v}" for k, v in data["counters"].items())
+        return "\n".join(lines)
+
+    def _emit(self, record):
+        if self.jsonl_path is None:
+            return
+        self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.jsonl_path, "a") as f:
+            f.write(json.dumps({"run": self.name, **record}) + "\n")
@@ -1,15 +1,10 @@
-import sys
 from pathlib import Path
 
-# Add project root to Python path
-ROOT_DIR = Path(__file__).resolve().parents[2]
-sys.path.append(str(ROOT_DIR / "src"))
-
-from dwg_parser.parse_dwg import parse_dwg, save_json
-from preprocessing.extract_geometry import geometry_to_3d
-from renderer.render_obj import save_obj
-from preprocessing.dxf_to_png import dxf_to_png
-
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.dwg_parser.geometry_io import save_geometry
+from src.preprocessing.extract_geometry import geometry_to_3d
+from src.renderer.render_obj import save_obj
+from src.preprocessing.dxf_to_png import dxf_to_png
 
 INPUT_DIR = Path("data/input_dwg")
 DATASET_IMAGES = Path("dataset/images")
@@ -33,12 +28,12 @@ def build_dataset():
 
         png_path = DATASET_IMAGES / f"{idx}.png"
         obj_path = DATASET_MODELS / f"{idx}.obj"
-        json_path = Path("data/processed") / f"{idx}.json"
+        geometry_path = Path("data/processed") / f"{idx}.dgeo"
 
-        entities = parse_dwg(str(dxf_file))
-        save_json(entities, json_path)
+        entities = parse_dwg(str(dxf_file), as_table=True)
+        save_geometry(entities, geometry_path)
 
-        vertices = geometry_to_3d(json_path)
+        vertices = geometry_to_3d(geometry_path)
 
         if vertices is None:
             print(f"⚠️ Skipping {dxf_file.name} (no geometry found)")
@@ -51,5 +46,6 @@ def build_dataset():
     print("✅ Dataset generation completed!")
 
 
+# Run from the repository root: python -m src.preprocessing.build_dataset
 if __name__ == "__main__":
     build_dataset()
@@ -1,14 +1,15 @@
 from pathlib import Path
-from dwg_parser.parse_dwg import parse_dwg, save_json
-from preprocessing.extract_geometry import geometry_to_3d
-from preprocessing.multiview_renderer import render_multiview
-from renderer.dxf_to_png import dxf_to_png
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.dwg_parser.geometry_io import save_geometry
+from src.preprocessing.extract_geometry import geometry_to_3d
+from src.preprocessing.multiview_renderer import render_multiview
+from src.preprocessing.dxf_to_png import dxf_to_png
 import trimesh
 import numpy as np
 
 
 INPUT_DIR = Path("data/input_dwg")
-JSON_DIR = Path("data/processed")
+GEOMETRY_DIR = Path("data/processed")
 OBJ_DIR = Path("dataset/models")
 IMG_DIR = Path("dataset/images_multiview")
 
@@ -25,11 +26,11 @@ def build_dataset():
     for dxf_file in INPUT_DIR.glob("*.dxf"):
         print(f"Processing {dxf_file.name}")
 
-        entities = parse_dwg(dxf_file)
-        json_path = JSON_DIR / f"{idx:03}.json"
-        save_json(entities, json_path)
+        entities = parse_dwg(dxf_file, as_table=True)
+        geometry_path = GEOMETRY_DIR / f"{idx:03}.dgeo"
+        save_geometry(entities, geometry_path)
 
-        vertices = geometry_to_3d(json_path)
+        vertices = geometry_to_3d(geometry_path)
 
         if vertices is None:
             print(f"Skipping {dxf_file.name}")
@@ -46,5 +47,6 @@ def build_dataset():
     print("✅ Multi-view dataset generation completed!")
 
 
+# Run from the repository root: python -m src.preprocessing.build_multiview_dataset
 if __name__ == "__main__":
     build_dataset()
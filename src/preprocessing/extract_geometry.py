@@ -85,35 +85,48 @@
 #         "windows": windows
 #     }
 
+import logging
+
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, MultiPolygon
 
+from src.dwg_parser.entity_table import EntityTable, TYPE_CODES
+from src.preprocessing.layer_classifier import DEFAULT_CLASSIFIER, CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+# Smallest closed floor outline kept, square metres
+FLOOR_MIN_AREA = 0.01
+
 
 def categorize_layer(layer_name: str):
-    layer = layer_name.lower()
+    """Category of a layer under the default rule table."""
+    return DEFAULT_CLASSIFIER.classify(layer_name.lower())
 
-    if any(k in layer for k in ["wall", "a-wall", "partition", "a-part"]):
-        return "walls"
-    elif any(k in layer for k in ["floor", "slab", "a-flor"]):
-        return "floors"
-    elif any(k in layer for k in ["door", "a-door", "opening"]):
-        return "doors"
-    elif any(k in layer for k in ["window", "a-win", "glaz"]):
-        return "windows"
-    else:
-        return "ignore"
 
+def is_architectural_layer(layer_name: str):
+    """Layer predicate for parse_dwg(layer_filter=...)."""
+    return categorize_layer(layer_name) != "ignore"
 
-def extract_walls_floors_doors_windows(entities):
-    walls = []
-    floors_raw = []
-    doors = []
-    windows = []
-    ignored = 0
+
+def iter_entity_rows(entities, classifier=DEFAULT_CLASSIFIER):
+    """
+    Yield (type, layer, category, points, closed) for either an
+    EntityTable or the legacy list of entity dicts.
+    """
+
+    if isinstance(entities, EntityTable):
+        # Classify each interned layer once instead of once per entity
+        categories = classifier.classify_all(entities.layers)
+
+        for etype, layer, pts, closed in entities.rows():
+            yield etype, layer, categories[layer], pts, closed
+        return
 
     for item in entities:
         layer = item.get("layer", "")
         etype = item["type"]
-        category = categorize_layer(layer)
 
         pts = []
 
@@ -125,6 +138,33 @@ def extract_walls_floors_doors_windows(entities):
         elif etype in ["POLYLINE", "LWPOLYLINE", "SPLINE"]:
             pts = [(p[0], p[1]) for p in item.get("points", [])]
 
+        yield etype, layer, classifier.classify(layer.lower()), pts, item.get("closed", False)
+
+
+def extract_walls_floors_doors_windows(entities, classifier=DEFAULT_CLASSIFIER):
+    """
+    Split parsed entities into walls, floor boundary, rooms, doors and
+    windows. EntityTable input takes the vectorized path; any other
+    iterable of entity dicts is processed row by row.
+    """
+
+    if isinstance(entities, EntityTable):
+        return extract_from_table(entities, classifier)
+
+    return extract_from_rows(iter_entity_rows(entities, classifier))
+
+
+def extract_from_rows(rows):
+    """Row-by-row extraction over iter_entity_rows() tuples."""
+
+    walls = []
+    floors_raw = []
+    doors = []
+    windows = []
+    ignored = 0
+
+    for etype, layer, category, pts, closed in rows:
+
         if len(pts) < 2:
             continue
 
@@ -136,12 +176,12 @@ def extract_walls_floors_doors_windows(entities):
             })
 
         # ---------------- FLOORS ----------------
-        elif category == "floors" and etype in ["POLYLINE", "LWPOLYLINE"] and item.get("closed", False):
+        elif category == "floors" and etype in ["POLYLINE", "LWPOLYLINE"] and closed:
             try:
                 poly = Polygon(pts)
-                if poly.is_valid and poly.area > 10:
+                if poly.is_valid and poly.area > FLOOR_MIN_AREA:
                     floors_raw.append(poly)
-            except:
+            except ValueError:
                 continue
 
         # ---------------- DOORS ----------------
@@ -167,15 +207,127 @@ def extract_walls_floors_doors_windows(entities):
             if poly.area < largest_floor.area:
                 rooms.append(list(poly.exterior.coords))
 
-    print("Filtered walls:", len(walls))
-    print("Filtered doors:", len(doors))
-    print("Filtered windows:", len(windows))
-    print("Floor boundary detected:", bool(floor_boundary))
-    print("Rooms detected:", len(rooms))
-    print("Ignored entities:", ignored)
+    logger.info(
+        "Filtered walls: %d, doors: %d, windows: %d, rooms: %d, floor boundary: %s, ignored: %d",
+        len(walls), len(doors), len(windows), len(rooms), bool(floor_boundary), ignored
+    )
+
+    return {
+        "walls": walls,
+        "floors": [floor_boundary] if floor_boundary else [],
+        "rooms": rooms,
+        "doors": doors,
+        "windows": windows
+    }
+
+
+# ======================
+# VECTORIZED PATH
+# ======================
+
+def _gather(table, index):
+    """Coordinates of the given entities, plus the owning position (0..len(index)-1) of each vertex."""
+
+    starts = table.offsets[index]
+    counts = table.offsets[index + 1] - starts
+    owner = np.repeat(np.arange(len(index)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return table.coords[starts[owner] + local], owner
+
+
+def _ring_lists(polygons):
+    """Exterior coordinates of each polygon as a list of (x, y) tuples."""
+
+    coords, owner = shapely.get_coordinates(shapely.get_exterior_ring(polygons), return_index=True)
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(owner)) + 1, [len(owner)]]).tolist()
+    points = list(zip(coords[:, 0].tolist(), coords[:, 1].tolist()))
+    return [points[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def extract_from_table(table: EntityTable, classifier=DEFAULT_CLASSIFIER):
+    """
+    extract_walls_floors_doors_windows for an EntityTable, using array
+    masks instead of a per-entity loop. Floor candidates are built with
+    Shapely's array constructors and validated in bulk.
+
+    Also returns "wall_lines", a Shapely array with one LineString per wall.
+    """
+
+    counts = table.counts
+    offsets = table.offsets.tolist()
+    layers = table.layers
+
+    # -------- CLASSIFY (once per layer) --------
+    codes = {name: i for i, name in enumerate(CATEGORIES)}
+    layer_codes = np.array(
+        [codes.get(classifier.classify(layer), -1) for layer in layers] or [-1],
+        dtype=np.int8
+    )
+    category = layer_codes[table.layer_ids] if len(table) else np.empty(0, dtype=np.int8)
+
+    usable = counts >= 2
+    is_wall = usable & (category == codes["walls"])
+    is_door = usable & (category == codes["doors"])
+    is_window = usable & (category == codes["windows"])
+    is_floor = (
+        usable & (category == codes["floors"])
+        & (table.types == TYPE_CODES["POLYLINE"]) & table.closed
+    )
+    ignored = int((usable & ~(is_wall | is_door | is_window | is_floor)).sum())
+
+    def views(mask):
+        return [table.coords[offsets[i]:offsets[i + 1]] for i in np.flatnonzero(mask).tolist()]
+
+    # -------- WALLS --------
+    wall_index = np.flatnonzero(is_wall)
+    walls = [
+        {"points": table.coords[offsets[i]:offsets[i + 1]], "layer": layers[layer_id]}
+        for i, layer_id in zip(wall_index.tolist(), table.layer_ids[wall_index].tolist())
+    ]
+
+    wall_lines = np.empty(0, dtype=object)
+    if len(wall_index):
+        coords, owner = _gather(table, wall_index)
+        wall_lines = shapely.linestrings(coords, indices=owner)
+
+    # -------- FLOORS --------
+    floor_boundary = []
+    rooms = []
+
+    floor_index = np.flatnonzero(is_floor)
+    if len(floor_index):
+        # Polygon() closes open rings itself; it needs 4 coords after closing
+        first = table.coords[table.offsets[floor_index]]
+        last = table.coords[table.offsets[floor_index + 1] - 1]
+        ring_size = counts[floor_index] + (first != last).any(axis=1)
+        floor_index = floor_index[ring_size >= 4]
+
+    if len(floor_index):
+        coords, owner = _gather(table, floor_index)
+        polygons = shapely.polygons(shapely.linearrings(coords, indices=owner))
+        area = shapely.area(polygons)
+        keep = shapely.is_valid(polygons) & (area > FLOOR_MIN_AREA)
+        polygons, area = polygons[keep], area[keep]
+
+        if len(polygons):
+            largest = int(np.argmax(area))
+            floor_boundary = _ring_lists(polygons[largest:largest + 1])[0]
+
+            smaller = area < area[largest]
+            if smaller.any():
+                rooms = _ring_lists(polygons[smaller])
+
+    doors = views(is_door)
+    windows = views(is_window)
+
+    logger.info(
+        "Filtered walls: %d, doors: %d, windows: %d, rooms: %d, floor boundary: %s, ignored: %d",
+        len(walls), len(doors), len(windows), len(rooms), bool(floor_boundary), ignored
+    )
 
     return {
         "walls": walls,
+        "wall_lines": wall_lines,
         "floors": [floor_boundary] if floor_boundary else [],
         "rooms": rooms,
         "doors": doors,
@@ -0,0 +1,127 @@
+# src/preprocessing/layer_classifier.py
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+
+# ======================
+# RULE TABLES
+# ======================
+#
+# A rule table is an ordered list of rules; the first rule that matches
+# a layer name wins. Each rule maps a category to any mix of
+#   keywords  substrings found anywhere in the name
+#   prefixes  strings the name starts with
+#   regex     regular expressions searched in the name
+# Matching is case-insensitive.
+
+IGNORE = "ignore"
+
+CATEGORIES = ["walls", "floors", "doors", "windows"]
+
+# AIA-style names ("A-WALL", "A-DOOR") plus plain English keywords
+DEFAULT_RULES = [
+    {"category": "walls", "keywords": ["wall", "a-wall", "partition", "a-part"]},
+    {"category": "floors", "keywords": ["floor", "slab", "a-flor"]},
+    {"category": "doors", "keywords": ["door", "a-door", "opening"]},
+    {"category": "windows", "keywords": ["window", "a-win", "glaz"]},
+]
+
+# CI/SfB element codes as used in BS 1192 / ISO 13567 layer names,
+# e.g. "A-21----" (external walls) or "A232" (floors)
+CISFB_RULES = [
+    {"category": "walls", "regex": [r"^[a-z]-?2[12]"]},
+    {"category": "floors", "regex": [r"^[a-z]-?(23|43)"]},
+    {"category": "doors", "regex": [r"^[a-z]-?32"]},
+    {"category": "windows", "regex": [r"^[a-z]-?31"]},
+]
+
+RULE_SETS = {
+    "default": DEFAULT_RULES,
+    "cisfb": CISFB_RULES,
+}
+
+
+# ======================
+# CLASSIFIER
+# ======================
+
+class LayerClassifier:
+    """
+    Layer name -> category ("walls", "floors", "doors", "windows" or
+    "ignore"), compiled from a rule table into a single regex.
+
+    Every distinct name is matched once and memoized. Calling the
+    classifier answers "is this an architectural layer?", so it can be
+    passed straight to parse_dwg(layer_filter=...).
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, default=IGNORE):
+        self.rules = [dict(rule) for rule in rules]
+        self.default = default
+        self._pattern = self._compile(self.rules)
+        self._memo = {}
+
+        # Stable across processes; parse_cache keys on it
+        table = json.dumps([self.rules, default], sort_keys=True)
+        self.cache_token = "LayerClassifier:" + hashlib.blake2b(table.encode(), digest_size=12).hexdigest()
+
+    @staticmethod
+    def _compile(rules):
+        # One branch per rule, tried in order at position 0. Each branch
+        # is a lookahead, so a rule matching later in the name still wins
+        # over a lower-priority rule matching earlier.
+        branches = []
+
+        for i, rule in enumerate(rules):
+            alternatives = [".*?" + re.escape(k.lower()) for k in rule.get("keywords", [])]
+            alternatives += [re.escape(p.lower()) for p in rule.get("prefixes", [])]
+            alternatives += [f".*?(?:{r})" for r in rule.get("regex", [])]
+
+            if not alternatives:
+                raise ValueError(f"Layer rule {i} ({rule.get('category')}) has no keywords, prefixes or regex")
+
+            branches.append(f"(?=(?:{'|'.join(alternatives)}))(?P<r{i}>)")
+
+        return re.compile("|".join(branches), re.IGNORECASE | re.DOTALL)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a rule table from JSON: a list of rules, or {"rules": [...], "default": ...}."""
+
+        data = json.loads(Path(path).read_text())
+        if isinstance(data, dict):
+            return cls(data["rules"], data.get("default", IGNORE))
+        return cls(data)
+
+    @classmethod
+    def from_name(cls, name_or_path):
+        """A built-in rule set by name (see RULE_SETS) or a JSON rule file."""
+
+        if name_or_path in RULE_SETS:
+            return cls(RULE_SETS[name_or_path])
+        return cls.from_file(name_or_path)
+
+    # -------------------------
+    # LOOKUPS
+    # -------------------------
+
+    def classify(self, layer_name: str):
+        category = self._memo.get(layer_name)
+        if category is None:
+            m = self._pattern.match(layer_name)
+            category = self.rules[int(m.lastgroup[1:])]["category"] if m else self.default
+            self._memo[layer_name] = category
+        return category
+
+    def classify_all(self, layer_names):
+        """{name: category} for a layer table."""
+        return {name: self.classify(name) for name in layer_names}
+
+    def __call__(self, layer_name: str):
+        return self.classify(layer_name) != IGNORE
+
+
+DEFAULT_CLASSIFIER = LayerClassifier()
@@ -0,0 +1,105 @@
+# src/preprocessing/openings.py
+
+import logging
+
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+OPENING_KINDS = {"doors": "door", "windows": "window"}
+
+
+# ======================
+# HOSTING
+# ======================
+
+def _lines(parts):
+    """One LineString per point sequence, built in a single call."""
+
+    counts = np.array([len(p) for p in parts], dtype=np.int64)
+    if not len(counts):
+        return np.empty(0, dtype=object)
+
+    coords = np.concatenate([np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in parts])
+    return shapely.linestrings(coords, indices=np.repeat(np.arange(len(parts)), counts))
+
+
+def wall_lines_of(geometry):
+    """geometry["wall_lines"], or LineStrings rebuilt from geometry["walls"]."""
+
+    lines = geometry.get("wall_lines")
+    if lines is not None:
+        return lines
+    return _lines([w["points"] for w in geometry["walls"]])
+
+
+def host_openings(geometry, max_distance=None):
+    """
+    Find the host wall of every door and window and its span along it.
+
+    Wall centerlines go into an STRtree; each opening is matched to its
+    nearest wall with one bulk query_nearest call. Its vertices are then
+    projected onto the host centerline, and their min / max distance along
+    it is the opening span.
+
+    Openings further than max_distance (metres) from every wall are
+    left unhosted. Returns a list of
+    {"kind", "index", "wall", "start", "end", "distance", "depth"}
+    records, where index is the position in geometry["doors"] /
+    geometry["windows"] and depth is how far the symbol reaches off the
+    wall (a door leaf drawn open spans nothing along it).
+    """
+
+    walls = wall_lines_of(geometry)
+    if not len(walls):
+        return []
+
+    tree = shapely.STRtree(walls)
+    openings = []
+
+    for key, kind in OPENING_KINDS.items():
+        parts = geometry.get(key, [])
+        if not parts:
+            continue
+
+        geoms = _lines(parts)
+        (source, wall), distance = tree.query_nearest(
+            geoms,
+            max_distance=max_distance,
+            return_distance=True,
+            all_matches=False
+        )
+        if not len(source):
+            continue
+
+        # Project every vertex of each hosted opening onto its wall
+        counts = shapely.get_num_coordinates(geoms[source])
+        points = shapely.points(shapely.get_coordinates(geoms[source]))
+        hosts = np.repeat(walls[wall], counts)
+        along = shapely.line_locate_point(hosts, points)
+        off = shapely.distance(hosts, points)
+
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        span_start = np.minimum.reduceat(along, starts)
+        span_end = np.maximum.reduceat(along, starts)
+        depth = np.maximum.reduceat(off, starts)
+
+        openings.extend(
+            {"kind": kind, "index": i, "wall": w, "start": s, "end": e, "distance": d, "depth": r}
+            for i, w, s, e, d, r in zip(
+                source.tolist(), wall.tolist(), span_start.tolist(),
+                span_end.tolist(), distance.tolist(), depth.tolist()
+            )
+        )
+
+    logger.info(
+        "Openings hosted: %d of %d",
+        len(openings), sum(len(geometry.get(key, [])) for key in OPENING_KINDS)
+    )
+    return openings
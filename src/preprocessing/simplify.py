@@ -0,0 +1,55 @@
+# src/preprocessing/simplify.py
+
+import logging
+
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Metres. Vertices closer than this to their neighbour, or to the line
+# through their neighbours, are dropped before extrusion.
+SIMPLIFY_TOLERANCE = 0.01
+
+
+# ======================
+# SIMPLIFICATION
+# ======================
+
+def simplify(geoms, tolerance=SIMPLIFY_TOLERANCE, preserve_topology=False):
+    """
+    Simplify an array of lines or polygons in metres in vectorized
+    passes: near-duplicate vertices are merged, then Douglas-Peucker
+    removes collinear and near-collinear ones (a zero tolerance still
+    merges exactly collinear runs). Use preserve_topology for polygons:
+    it never collapses a ring, and drops near-duplicates along the way.
+
+    Returns (geometries, vertices before, vertices after).
+    """
+
+    geoms = np.asarray(geoms, dtype=object)
+    before = int(shapely.get_num_coordinates(geoms).sum()) if len(geoms) else 0
+    if tolerance is None or not len(geoms):
+        return geoms, before, before
+
+    if not preserve_topology:
+        geoms = shapely.remove_repeated_points(geoms, tolerance)
+    geoms = shapely.simplify(geoms, tolerance, preserve_topology=preserve_topology)
+
+    after = int(shapely.get_num_coordinates(geoms).sum())
+    logger.debug("Simplified %d -> %d vertices", before, after)
+    return geoms, before, after
+
+
+def simplify_counted(geoms, report, tolerance=SIMPLIFY_TOLERANCE, preserve_topology=False):
+    """simplify() that adds its vertex counts to a PipelineReport."""
+
+    geoms, before, after = simplify(geoms, tolerance, preserve_topology)
+    report.incr("vertices_before_simplify", before)
+    report.incr("vertices_after_simplify", after)
+    return geoms
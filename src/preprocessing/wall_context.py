@@ -0,0 +1,92 @@
+# src/preprocessing/wall_context.py
+
+import logging
+
+import numpy as np
+import shapely
+from shapely.ops import unary_union
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Metres added to half the wall thickness when looking for the rooms
+# and footprint edge a wall runs along
+CONTEXT_SLACK = 0.02
+
+# A wall is exterior when at least this share of it runs along the
+# footprint boundary
+EXTERIOR_MIN_SHARE = 0.5
+
+# A room is adjacent when its boundary runs along the wall for at least
+# this long (metres) or half the wall, whichever is shorter; rooms that
+# only touch a wall end are not
+ADJACENT_MIN_LENGTH = 0.3
+
+
+# ======================
+# CLASSIFICATION
+# ======================
+
+def classify_walls(lines, thicknesses, rooms, room_types=None):
+    """
+    Exterior flag and adjacent rooms of every wall, in bulk.
+
+    Each centerline is buffered by half its thickness (plus slack) in
+    one call. The building footprint is the union of the rooms; a wall
+    whose buffer holds enough of its boundary is exterior. Rooms come
+    from one STRtree query; a candidate is adjacent when a long enough
+    part of its boundary lies inside the wall buffer.
+
+    Coordinates in metres. room_types, when known, gives a type name per
+    room ("bathroom", "kitchen", ...); without them adjacency is not
+    looked up (the material rules only use the types). Returns
+    (is_exterior bool array, list of adjacent room index arrays, list
+    of adjacent type lists).
+    """
+
+    lines = np.asarray(lines, dtype=object)
+    n = len(lines)
+    exterior = np.zeros(n, dtype=bool)
+    adjacent = [np.empty(0, dtype=np.int64)] * n
+    if not n or not len(rooms):
+        return exterior, adjacent, [[] for _ in range(n)]
+
+    rooms = np.asarray(rooms, dtype=object)
+    bands = shapely.buffer(lines, np.asarray(thicknesses) / 2 + CONTEXT_SLACK, cap_style="flat")
+    length = shapely.length(lines)
+
+    # -------- EXTERIOR --------
+    # Footprint outline as two-point segments, so each wall only meets
+    # the few pieces near it
+    coords, part = shapely.get_coordinates(shapely.get_parts(unary_union(list(rooms)).boundary), return_index=True)
+    same = part[:-1] == part[1:]
+    outline = shapely.linestrings(np.stack([coords[:-1][same], coords[1:][same]], axis=1))
+
+    wall_i, seg_i = shapely.STRtree(outline).query(bands, predicate="intersects")
+    along = shapely.length(shapely.intersection(outline[seg_i], bands[wall_i]))
+    along = np.bincount(wall_i, along, minlength=n)
+    exterior = along >= EXTERIOR_MIN_SHARE * length
+
+    if room_types is None:
+        logger.info("Walls classified: %d exterior of %d", int(exterior.sum()), n)
+        return exterior, adjacent, [[] for _ in range(n)]
+
+    # -------- ADJACENT ROOMS --------
+    wall_i, room_i = shapely.STRtree(rooms).query(bands, predicate="intersects")
+    order = np.lexsort((room_i, wall_i))
+    wall_i, room_i = wall_i[order], room_i[order]
+    shared = shapely.length(shapely.intersection(shapely.boundary(rooms[room_i]), bands[wall_i]))
+    keep = shared >= np.minimum(ADJACENT_MIN_LENGTH, 0.5 * length[wall_i])
+    wall_i, room_i = wall_i[keep], room_i[keep]
+
+    splits = np.searchsorted(wall_i, np.arange(1, n))
+    adjacent = np.split(room_i, splits)
+
+    types = [sorted({room_types[r] for r in rs.tolist() if room_types[r]}) for rs in adjacent]
+
+    logger.info("Walls classified: %d exterior of %d", int(exterior.sum()), n)
+    return exterior, adjacent, types
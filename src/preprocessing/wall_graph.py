@@ -0,0 +1,337 @@
+# src/preprocessing/wall_graph.py
+
+import logging
+
+import numpy as np
+import shapely
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from src.preprocessing.openings import wall_lines_of
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Endpoints closer than this are merged; dangling ends this close to a
+# wall are extended onto it, and overshoots up to this long are trimmed.
+# Metres; must stay well below the wall thickness, or both faces of a
+# double-line wall collapse into one.
+SNAP_TOLERANCE = 0.01
+
+# Relative tolerance for "parallel" and "at the segment end" tests
+EPS = 1e-9
+
+
+# ======================
+# GRAPH
+# ======================
+
+class WallGraph:
+    """
+    Planar graph of wall centerlines: nodes (N, 2) float coordinates and
+    edges (E, 2) node indices. Edges meet only at nodes (no crossings,
+    no duplicates), so rooms can be polygonized and continuous walls
+    traced without another unary_union.
+    edge_wall holds the index of the source wall of every edge and
+    edge_segment the index of its source segment in wall_segments()
+    (-1 when unknown).
+    """
+
+    def __init__(self, nodes, edges, edge_wall, edge_segment=None):
+        self.nodes = np.asarray(nodes, dtype=np.float64).reshape(-1, 2)
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.edge_wall = np.asarray(edge_wall, dtype=np.int64)
+        if edge_segment is None:
+            edge_segment = np.full(len(self.edges), -1)
+        self.edge_segment = np.asarray(edge_segment, dtype=np.int64)
+
+    def subgraph(self, mask):
+        """The same nodes with only the selected edges."""
+        return WallGraph(self.nodes, self.edges[mask], self.edge_wall[mask], self.edge_segment[mask])
+
+    def __len__(self):
+        return len(self.edges)
+
+    def degree(self):
+        return np.bincount(self.edges.ravel(), minlength=len(self.nodes))
+
+    def lines(self):
+        """One two-point LineString per edge."""
+        if not len(self.edges):
+            return np.empty(0, dtype=object)
+        return shapely.linestrings(self.nodes[self.edges])
+
+    def polygons(self):
+        """All faces of the graph (rooms before any area filter)."""
+        if not len(self.edges):
+            return np.empty(0, dtype=object)
+        return shapely.get_parts(shapely.polygonize(self.lines()))
+
+    def chains(self):
+        """
+        Node paths of maximal runs of edges joined at degree-2 nodes:
+        the continuous wall centerlines. Closed loops start and end on
+        the same node.
+        """
+
+        n_edges = len(self.edges)
+        if not n_edges:
+            return []
+
+        degree = self.degree()
+
+        # CSR adjacency: incident edges of every node
+        ends = self.edges.ravel()
+        order = np.argsort(ends, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(degree)]).tolist()
+        incident = (order // 2).tolist()
+        edges = self.edges.tolist()
+        degree = degree.tolist()
+
+        used = [False] * n_edges
+        chains = []
+
+        def walk(node, edge):
+            path = [node]
+            while True:
+                used[edge] = True
+                a, b = edges[edge]
+                node = b if a == node else a
+                path.append(node)
+                if degree[node] != 2:
+                    return path
+                first, second = incident[starts[node]], incident[starts[node] + 1]
+                edge = second if first == edge else first
+                if used[edge]:
+                    return path
+
+        for node in range(len(degree)):
+            if degree[node] == 2:
+                continue
+            for k in range(starts[node], starts[node + 1]):
+                if not used[incident[k]]:
+                    chains.append(walk(node, incident[k]))
+
+        # What is left are closed loops of degree-2 nodes
+        for edge in range(n_edges):
+            if not used[edge]:
+                chains.append(walk(edges[edge][0], edge))
+
+        return chains
+
+    def chain_lines(self):
+        """Continuous wall centerlines as LineStrings."""
+        chains = self.chains()
+        if not chains:
+            return np.empty(0, dtype=object)
+        counts = [len(c) for c in chains]
+        index = np.concatenate(chains)
+        return shapely.linestrings(self.nodes[index], indices=np.repeat(np.arange(len(chains)), counts))
+
+
+# ======================
+# CONSTRUCTION
+# ======================
+
+def _snap(points, tolerance):
+    """Cluster points closer than tolerance; returns (labels, cluster centroids)."""
+
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    pairs = cKDTree(unique).query_pairs(tolerance, output_type="ndarray")
+    n = len(unique)
+    adjacency = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    n_clusters, labels = connected_components(adjacency, directed=False)
+
+    weight = np.bincount(labels, minlength=n_clusters)
+    centers = np.stack([
+        np.bincount(labels, unique[:, 0], n_clusters),
+        np.bincount(labels, unique[:, 1], n_clusters)
+    ], axis=1) / weight[:, None]
+
+    return labels[inverse], centers
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _segments(lines):
+    coords, owner = shapely.get_coordinates(lines, return_index=True)
+    same = owner[:-1] == owner[1:]
+    return coords[:-1][same], coords[1:][same], owner[:-1][same]
+
+
+def wall_segments(geometry):
+    """Two-point segments (a, b, owning wall) of every wall line, in order."""
+    return _segments(wall_lines_of(geometry))
+
+
+def _t_junctions(nodes, sa, sb, tolerance):
+    """
+    Dangling endpoints within tolerance of another segment's interior.
+    Returns (segment, t, node) splits; the dangling node is moved onto
+    the segment.
+    """
+
+    degree = np.bincount(np.concatenate([sa, sb]), minlength=len(nodes))
+    dangling = np.flatnonzero(degree == 1)
+    if not len(dangling):
+        return np.empty((0, 3))
+
+    tree = shapely.STRtree(shapely.linestrings(np.stack([nodes[sa], nodes[sb]], axis=1)))
+    point_i, seg = tree.query(shapely.points(nodes[dangling]), predicate="dwithin", distance=tolerance)
+    node = dangling[point_i]
+
+    # Not onto the node's own segment(s)
+    keep = (sa[seg] != node) & (sb[seg] != node)
+    node, seg = node[keep], seg[keep]
+
+    a, b = nodes[sa[seg]], nodes[sb[seg]]
+    d = b - a
+    t = np.einsum("ij,ij->i", nodes[node] - a, d) / np.einsum("ij,ij->i", d, d)
+    interior = (t > EPS) & (t < 1 - EPS)
+    node, seg, t = node[interior], seg[interior], t[interior]
+
+    # Nearest segment per dangling node
+    foot = nodes[sa[seg]] + t[:, None] * (nodes[sb[seg]] - nodes[sa[seg]])
+    dist = np.hypot(*(foot - nodes[node]).T)
+    order = np.lexsort((dist, node))
+    first = np.unique(node[order], return_index=True)[1]
+    pick = order[first]
+
+    nodes[node[pick]] = foot[pick]
+    return np.stack([seg[pick], t[pick], node[pick]], axis=1)
+
+
+def _crossings(nodes, sa, sb):
+    """
+    Split points where segments cross, touch or overlap.
+    Returns (splits as (segment, t, node) rows, new node coordinates).
+    """
+
+    lines = shapely.linestrings(np.stack([nodes[sa], nodes[sb]], axis=1))
+    i, j = shapely.STRtree(lines).query(lines, predicate="intersects")
+    i, j = i[i < j], j[i < j]
+    shared = (sa[i] == sa[j]) | (sa[i] == sb[j]) | (sb[i] == sa[j]) | (sb[i] == sb[j])
+
+    p, r = nodes[sa[i]], nodes[sb[i]] - nodes[sa[i]]
+    q, s = nodes[sa[j]], nodes[sb[j]] - nodes[sa[j]]
+    denom = _cross(r, s)
+    scale = np.hypot(*r.T) * np.hypot(*s.T)
+    parallel = np.abs(denom) <= EPS * scale
+
+    splits = []
+    new_nodes = []
+    base = len(nodes)
+
+    # -------- PROPER / TOUCHING INTERSECTIONS --------
+    # Non-parallel segments sharing a node only meet at that node
+    k = ~parallel & ~shared
+    qp = q[k] - p[k]
+    t = _cross(qp, s[k]) / denom[k]
+    u = _cross(qp, r[k]) / denom[k]
+    ik, jk = i[k], j[k]
+
+    t_end = (t <= EPS) | (t >= 1 - EPS)
+    u_end = (u <= EPS) | (u >= 1 - EPS)
+
+    # Endpoint of i on the interior of j (and vice versa): reuse that node
+    m = t_end & ~u_end
+    splits.append(np.stack([jk[m], u[m], np.where(t[m] <= EPS, sa[ik[m]], sb[ik[m]])], axis=1))
+    m = u_end & ~t_end
+    splits.append(np.stack([ik[m], t[m], np.where(u[m] <= EPS, sa[jk[m]], sb[jk[m]])], axis=1))
+
+    # True crossing: a new node shared by both segments
+    m = ~t_end & ~u_end
+    ids = base + np.arange(m.sum())
+    new_nodes.append(p[k][m] + t[m][:, None] * r[k][m])
+    splits.append(np.stack([ik[m], t[m], ids], axis=1))
+    splits.append(np.stack([jk[m], u[m], ids], axis=1))
+
+    # -------- COLLINEAR OVERLAPS --------
+    # Endpoints of one segment that fall inside the other split it there
+    k = parallel
+    for seg, other in ((i[k], j[k]), (j[k], i[k])):
+        a, d = nodes[sa[seg]], nodes[sb[seg]] - nodes[sa[seg]]
+        dd = np.einsum("ij,ij->i", d, d)
+        for end in (sa[other], sb[other]):
+            w = nodes[end] - a
+            t = np.einsum("ij,ij->i", w, d) / dd
+            on_line = np.abs(_cross(d, w)) <= EPS * dd + EPS
+            m = on_line & (t > EPS) & (t < 1 - EPS)
+            splits.append(np.stack([seg[m], t[m], end[m]], axis=1))
+
+    coords = np.concatenate(new_nodes) if new_nodes else np.empty((0, 2))
+    return np.concatenate(splits), coords
+
+
+def build_wall_graph(geometry, tolerance=SNAP_TOLERANCE):
+    """
+    Clean planar graph from the wall centerlines of `geometry`:
+    snap endpoints with a KD-tree, extend dangling ends onto nearby
+    walls (T-junctions), split at crossings and overlaps, drop
+    duplicate edges and trim overshoots shorter than tolerance.
+    """
+
+    a, b, seg_wall = wall_segments(geometry)
+    if not len(a):
+        return WallGraph(np.empty((0, 2)), np.empty((0, 2)), [], [])
+
+    # -------- ENDPOINT SNAPPING --------
+    labels, nodes = _snap(np.concatenate([a, b]), tolerance)
+    sa, sb = labels[:len(a)], labels[len(a):]
+
+    keep = sa != sb
+    sa, sb, seg_wall = sa[keep], sb[keep], seg_wall[keep]
+    seg_source = np.flatnonzero(keep)
+
+    # -------- T-JUNCTIONS, CROSSINGS, OVERLAPS --------
+    t_splits = _t_junctions(nodes, sa, sb, tolerance)
+    x_splits, new_nodes = _crossings(nodes, sa, sb)
+    nodes = np.concatenate([nodes, new_nodes])
+
+    n_seg = len(sa)
+    splits = np.concatenate([
+        np.stack([np.arange(n_seg), np.zeros(n_seg), sa], axis=1),
+        np.stack([np.arange(n_seg), np.ones(n_seg), sb], axis=1),
+        t_splits,
+        x_splits
+    ])
+    order = np.lexsort((splits[:, 1], splits[:, 0]))
+    seg, node = splits[order, 0].astype(np.int64), splits[order, 2].astype(np.int64)
+
+    same = seg[:-1] == seg[1:]
+    edges = np.stack([node[:-1][same], node[1:][same]], axis=1)
+    edge_wall = seg_wall[seg[:-1][same]]
+    edge_segment = seg_source[seg[:-1][same]]
+
+    # New crossing nodes may land within tolerance of existing ones
+    labels, nodes = _snap(nodes, tolerance)
+    edges = labels[edges]
+
+    # -------- DEDUPE --------
+    edges.sort(axis=1)
+    keep = edges[:, 0] != edges[:, 1]
+    edges, edge_wall, edge_segment = edges[keep], edge_wall[keep], edge_segment[keep]
+    edges, first = np.unique(edges, axis=0, return_index=True)
+    edge_wall, edge_segment = edge_wall[first], edge_segment[first]
+
+    # -------- OVERSHOOTS --------
+    degree = np.bincount(edges.ravel(), minlength=len(nodes))
+    length = np.hypot(*(nodes[edges[:, 1]] - nodes[edges[:, 0]]).T)
+    stub = ((degree[edges[:, 0]] == 1) ^ (degree[edges[:, 1]] == 1)) & (length <= tolerance)
+    edges, edge_wall, edge_segment = edges[~stub], edge_wall[~stub], edge_segment[~stub]
+
+    # -------- COMPACT --------
+    used, edges = np.unique(edges, return_inverse=True)
+    graph = WallGraph(nodes[used], edges.reshape(-1, 2), edge_wall, edge_segment)
+
+    logger.info("Wall graph: %d nodes, %d edges", len(graph.nodes), len(graph))
+    return graph
@@ -0,0 +1,244 @@
+# src/preprocessing/wall_pairing.py
+
+import logging
+import math
+
+import numpy as np
+import shapely
+
+from src.preprocessing.wall_graph import wall_segments
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Face-to-face distance of a double-line wall, metres
+PAIR_MIN_THICKNESS = 0.05
+PAIR_MAX_THICKNESS = 0.6
+
+PAIR_ANGLE_TOLERANCE = math.radians(2.0)
+
+# Shared length along the wall, as a fraction of the shorter line
+PAIR_MIN_OVERLAP = 0.5
+
+# Shared length below which two spans of one line only touch, metres
+SPAN_SLACK = 1e-6
+
+
+# ======================
+# RESULT
+# ======================
+
+class WallPairs:
+    """
+    Double-line walls collapsed to centerlines.
+
+    centerlines (K, 2, 2) and thickness (K,) per detected wall;
+    paired (S,) marks the wall_segments() consumed by a pair;
+    leftovers (L, 2, 2) are the parts of paired lines that no pair
+    covers (past a shorter partner, across a door gap in the opposite
+    face) and stay single-line walls.
+    """
+
+    def __init__(self, centerlines, thickness, paired, leftovers):
+        self.centerlines = np.asarray(centerlines, dtype=np.float64).reshape(-1, 2, 2)
+        self.thickness = np.asarray(thickness, dtype=np.float64)
+        self.paired = np.asarray(paired, dtype=bool)
+        self.leftovers = np.asarray(leftovers, dtype=np.float64).reshape(-1, 2, 2)
+
+    def __len__(self):
+        return len(self.thickness)
+
+
+# ======================
+# CANDIDATES
+# ======================
+
+def _candidate_pairs(lines, theta, tolerance, max_distance):
+    """
+    (i, j) index pairs of near-parallel segments within max_distance.
+    Segments are bucketed by angle and every bucket gets its own STRtree,
+    queried with its own and the next bucket, so spatial queries only
+    ever see lines of a similar direction.
+    """
+
+    n_buckets = max(1, int(math.ceil(math.pi / tolerance)))
+    bucket = np.minimum((theta / tolerance).astype(np.int64), n_buckets - 1)
+
+    members = {b: np.flatnonzero(bucket == b) for b in np.unique(bucket).tolist()}
+    pairs_i, pairs_j = [], []
+
+    for b, own in members.items():
+        neighbour = (b + 1) % n_buckets
+        targets = own if neighbour not in members or neighbour == b else np.concatenate([own, members[neighbour]])
+
+        tree = shapely.STRtree(lines[targets])
+        q, t = tree.query(lines[own], predicate="dwithin", distance=max_distance)
+        i, j = own[q], targets[t]
+
+        # Same bucket: keep each pair once; neighbour bucket: all
+        same = bucket[j] == b
+        keep = ~same | (i < j)
+        pairs_i.append(i[keep])
+        pairs_j.append(j[keep])
+
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+# ======================
+# PAIRING
+# ======================
+
+def pair_walls(geometry, min_thickness=PAIR_MIN_THICKNESS, max_thickness=PAIR_MAX_THICKNESS,
+               angle_tolerance=PAIR_ANGLE_TOLERANCE, min_overlap=PAIR_MIN_OVERLAP):
+    """
+    Find double-line walls: pairs of near-parallel segments that overlap
+    along the wall and are each other's nearest match, kept when their
+    distance lies in [min_thickness, max_thickness]. A segment can join
+    several pairs along disjoint spans of its length (a face opposite
+    a door gap pairs with the runs on both sides), nearest partner
+    first, longest overlap on ties. Returns WallPairs with one
+    centerline and the measured thickness per pair.
+    """
+
+    a, b, _ = wall_segments(geometry)
+    n = len(a)
+    empty = WallPairs(np.empty((0, 2, 2)), [], np.zeros(n, dtype=bool), np.empty((0, 2, 2)))
+
+    d = b - a
+    length = np.hypot(d[:, 0], d[:, 1])
+    usable = np.flatnonzero(length > 0)
+    if len(usable) < 2:
+        return empty
+
+    theta = np.mod(np.arctan2(d[usable, 1], d[usable, 0]), math.pi)
+    lines = shapely.linestrings(np.stack([a[usable], b[usable]], axis=1))
+    i, j = _candidate_pairs(lines, theta, angle_tolerance, max_thickness)
+    i, j = usable[i], usable[j]
+
+    # -------- GEOMETRY IN THE FRAME OF i --------
+    u = d[i] / length[i, None]
+    normal = np.stack([-u[:, 1], u[:, 0]], axis=1)
+
+    rel_a, rel_b = a[j] - a[i], b[j] - a[i]
+    offset = (np.einsum("ij,ij->i", rel_a, normal) + np.einsum("ij,ij->i", rel_b, normal)) / 2
+    t0 = np.einsum("ij,ij->i", rel_a, u)
+    t1 = np.einsum("ij,ij->i", rel_b, u)
+    lo, hi = np.minimum(t0, t1), np.maximum(t0, t1)
+
+    angle = np.abs(np.mod(np.arctan2(d[j, 1], d[j, 0]) - np.arctan2(d[i, 1], d[i, 0]), math.pi))
+    angle = np.minimum(angle, math.pi - angle)
+
+    distance = np.abs(offset)
+    overlap = np.minimum(length[i], hi) - np.maximum(0.0, lo)
+
+    # Lines closer than min_thickness still compete in the matching, so a
+    # face whose nearest parallel neighbour is too close (hatching, a
+    # wall thinner than the range) is not paired across a whole room
+    ok = (
+        (angle <= angle_tolerance)
+        & (distance <= max_thickness)
+        & (overlap >= min_overlap * np.minimum(length[i], length[j]))
+    )
+    if not ok.any():
+        return empty
+
+    i, j, u, normal, offset, lo, hi, t0, t1, distance, overlap = (
+        i[ok], j[ok], u[ok], normal[ok], offset[ok], lo[ok], hi[ok], t0[ok], t1[ok], distance[ok], overlap[ok]
+    )
+
+    # -------- GREEDY MATCHING, NEAREST FIRST --------
+    # Each pair claims its shared span on both lines; a line is free to
+    # pair again along a span no nearer pair has claimed. Ties (a face
+    # split by an opening) go to the longest shared run.
+    span_i = np.stack([np.maximum(0.0, lo), np.minimum(length[i], hi)], axis=1)
+    span_j = np.sort(_to_frame_of_j(span_i, lo, hi, t0 < t1, length[j]), axis=1)
+
+    claimed = {}
+    chosen = []
+    for k in np.lexsort((-overlap, distance)).tolist():
+        if _is_free(claimed, i[k], span_i[k]) and _is_free(claimed, j[k], span_j[k]):
+            claimed.setdefault(i[k], []).append(span_i[k])
+            claimed.setdefault(j[k], []).append(span_j[k])
+            chosen.append(k)
+    chosen = np.array(chosen, dtype=np.int64)
+
+    # Too-thin pairs only blocked their spans in the matching
+    chosen = chosen[distance[chosen] >= min_thickness]
+
+    i, j, u, normal, offset, lo, hi, t0, t1, distance = (
+        i[chosen], j[chosen], u[chosen], normal[chosen], offset[chosen],
+        lo[chosen], hi[chosen], t0[chosen], t1[chosen], distance[chosen]
+    )
+
+    # -------- CENTERLINES --------
+    # Ends less than a thickness apart are a corner offset: meet halfway.
+    # Further apart, the centerline stops with the shorter line and the
+    # rest of the longer one stays a single-line wall.
+    # (relative slack so round-off in metre coordinates does not flip it)
+    reach = distance * (1 + 1e-9)
+    start_i, end_i = np.zeros(len(i)), length[i]
+    start = np.where(np.abs(start_i - lo) <= reach, (start_i + lo) / 2, np.maximum(start_i, lo))
+    end = np.where(np.abs(end_i - hi) <= reach, (end_i + hi) / 2, np.minimum(end_i, hi))
+
+    def at(s, side):
+        return a[i] + s[:, None] * u + side[:, None] * normal
+
+    centerlines = np.stack([at(start, offset / 2), at(end, offset / 2)], axis=1)
+
+    # -------- LEFTOVERS --------
+    # What each paired line keeps outside the spans its centerlines cover
+    covered = np.stack([start, end], axis=1)
+    spans = {}
+    for seg, span, thickness in zip(
+        np.concatenate([i, j]).tolist(),
+        np.concatenate([covered, np.sort(_to_frame_of_j(covered, lo, hi, t0 < t1, length[j]), axis=1)]),
+        np.concatenate([reach, reach]).tolist(),
+    ):
+        spans.setdefault(seg, []).append((span, thickness))
+
+    paired = np.zeros(n, dtype=bool)
+    paired[list(spans)] = True
+
+    leftovers = []
+    for seg, covers in spans.items():
+        direction = d[seg] / length[seg]
+        for s_from, s_to in _gaps([span for span, _ in covers], length[seg], max(t for _, t in covers)):
+            leftovers.append([a[seg] + s_from * direction, a[seg] + s_to * direction])
+
+    pairs = WallPairs(centerlines, distance, paired, leftovers)
+    logger.info("Double-line walls paired: %d (%d segments)", len(pairs), int(paired.sum()))
+    return pairs
+
+
+def _to_frame_of_j(span, lo, hi, forward, length_j):
+    """(m, 2) positions along line i mapped to positions along its partner j."""
+
+    f = (span - lo[:, None]) / (hi - lo)[:, None]
+    f = np.where(forward[:, None], f, 1 - f)
+    return np.clip(f, 0.0, 1.0) * length_j[:, None]
+
+
+def _is_free(claimed, seg, span):
+    """True if no claimed span of seg shares more than a point with span."""
+
+    return all(
+        min(span[1], other[1]) - max(span[0], other[0]) <= SPAN_SLACK
+        for other in claimed.get(seg, ())
+    )
+
+
+def _gaps(spans, length, min_length):
+    """Parts of [0, length] outside all spans, longer than min_length."""
+
+    gaps, reached = [], 0.0
+    for s_from, s_to in sorted((float(s0), float(s1)) for s0, s1 in spans):
+        if s_from - reached > min_length:
+            gaps.append((reached, s_from))
+        reached = max(reached, s_to)
+    if length - reached > min_length:
+        gaps.append((reached, float(length)))
+    return gaps
@@ -0,0 +1,200 @@
+# src/renderer/extrude.py
+
+import logging
+
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# RESULT
+# ======================
+
+class Extrusion:
+    """
+    Prisms of many polygons in shared buffers.
+
+    vertices (V, 3) and faces (F, 3) hold every solid; polygon i owns
+    vertices vertex_offsets[i]:vertex_offsets[i + 1] and faces
+    face_offsets[i]:face_offsets[i + 1] (face indices are global).
+    Empty polygons own nothing.
+    """
+
+    def __init__(self, vertices, faces, vertex_offsets, face_offsets):
+        self.vertices = vertices
+        self.faces = faces
+        self.vertex_offsets = vertex_offsets
+        self.face_offsets = face_offsets
+
+    def __len__(self):
+        return len(self.vertex_offsets) - 1
+
+    def part(self, i):
+        """(vertices, faces) of polygon i, faces indexing its own vertices."""
+        v0, v1 = self.vertex_offsets[i], self.vertex_offsets[i + 1]
+        f0, f1 = self.face_offsets[i], self.face_offsets[i + 1]
+        return self.vertices[v0:v1], self.faces[f0:f1] - v0
+
+    def select(self, mask):
+        """(vertices, faces) of the polygons where mask is True, as one solid."""
+
+        mask = np.asarray(mask, dtype=bool)
+        keep_v = np.repeat(mask, np.diff(self.vertex_offsets))
+        keep_f = np.repeat(mask, np.diff(self.face_offsets))
+
+        remap = np.cumsum(keep_v) - 1
+        return self.vertices[keep_v], remap[self.faces[keep_f]]
+
+    def groups(self, labels):
+        """{label: (vertices, faces)} with one solid per label; None labels are left out."""
+
+        labels = np.asarray(labels, dtype=object)
+        return {
+            label: self.select(labels == label)
+            for label in dict.fromkeys(labels.tolist()) if label is not None
+        }
+
+
+def merge(parts):
+    """One (vertices, faces) from many, faces re-indexed."""
+
+    parts = list(parts)
+    if not parts:
+        return np.empty((0, 3)), np.empty((0, 3), dtype=np.int64)
+
+    counts = [len(v) for v, _ in parts]
+    shift = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    vertices = np.concatenate([v for v, _ in parts])
+    faces = np.concatenate([f + s for (_, f), s in zip(parts, shift)])
+    return vertices, faces
+
+
+# ======================
+# BATCH EXTRUSION
+# ======================
+
+def extrude_batch(polygons, height):
+    """
+    Extrude many polygons (with holes) to prisms of the given height.
+
+    Rings are oriented once (exteriors CCW, holes CW) and their vertices
+    become the bottom and top caps. Side walls are two triangles per
+    ring edge, built with index arithmetic over all rings at once, so
+    the right-hand side of every edge faces out. Caps of convex
+    polygons without holes (straight walls) are fans; the rest come
+    from one constrained Delaunay call and are mapped back onto the
+    ring vertices. Returns an Extrusion.
+    """
+
+    polygons = shapely.orient_polygons(np.asarray(polygons, dtype=object))
+    n = len(polygons)
+
+    # -------- RING VERTICES --------
+    # Closing vertex dropped; vertex k of a ring joins k + 1 (wrapping)
+    rings, ring_poly = shapely.get_rings(polygons, return_index=True)
+    coords, ring_of = shapely.get_coordinates(rings, return_index=True)
+    ring_len = np.bincount(ring_of, minlength=len(rings))
+    last = np.cumsum(ring_len) - 1
+    open_ = np.ones(len(coords), dtype=bool)
+    open_[last] = False
+    coords, ring_of = coords[open_], ring_of[open_]
+    ring_len -= 1
+
+    ring_start = np.concatenate([[0], np.cumsum(ring_len)[:-1]])
+    poly_of = ring_poly[ring_of]
+    poly_len = np.bincount(poly_of, minlength=n)
+    poly_start = np.concatenate([[0], np.cumsum(poly_len)[:-1]])
+    m = len(coords)
+
+    # Bottom cap vertex j is row j, top is row m + j; rows are grouped
+    # per polygon afterwards
+    index = np.arange(m)
+    following = index + 1
+    wrap = following == ring_start[ring_of] + ring_len[ring_of]
+    following[wrap] = ring_start[ring_of[wrap]]
+
+    # -------- SIDES --------
+    sides = np.stack([
+        np.stack([index, following, m + following], axis=1),
+        np.stack([index, m + following, m + index], axis=1),
+    ], axis=1).reshape(-1, 3)
+    side_poly = np.repeat(poly_of, 2)
+
+    # -------- CAPS --------
+    caps, cap_poly = _cap_triangles(polygons, coords, poly_of, poly_start, poly_len)
+    cap_faces = np.concatenate([caps[:, ::-1], caps + m])
+    cap_poly = np.concatenate([cap_poly, cap_poly])
+
+    # -------- GROUP PER POLYGON --------
+    # Bottom and top rows of a polygon become one contiguous block
+    vertex_poly = np.concatenate([poly_of, poly_of])
+    order = np.argsort(vertex_poly, kind="stable")
+    rank = np.empty(2 * m, dtype=np.int64)
+    rank[order] = np.arange(2 * m)
+
+    vertices = np.column_stack([np.concatenate([coords, coords]), np.repeat([0.0, height], m)])[order]
+
+    faces = np.concatenate([sides, cap_faces])
+    face_poly = np.concatenate([side_poly, cap_poly])
+    face_order = np.argsort(face_poly, kind="stable")
+    faces = rank[faces[face_order]]
+
+    vertex_offsets = np.concatenate([[0], np.cumsum(2 * poly_len)])
+    face_offsets = np.concatenate([[0], np.cumsum(np.bincount(face_poly, minlength=n))])
+
+    return Extrusion(vertices, faces, vertex_offsets, face_offsets)
+
+
+def _cap_triangles(polygons, coords, poly_of, poly_start, poly_len):
+    """
+    (T, 3) counter-clockwise triangles over the ring vertex rows, and
+    the polygon of each.
+    """
+
+    n = len(polygons)
+    holes = shapely.get_num_interior_rings(polygons)
+    area = shapely.area(polygons)
+    convex = (holes == 0) & np.isclose(area, shapely.area(shapely.convex_hull(polygons)))
+
+    # -------- FANS --------
+    fan = convex & (poly_len >= 3)
+    count = np.where(fan, poly_len - 2, 0)
+    tri_poly = np.repeat(np.arange(n), count)
+    k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + 1
+    base = poly_start[tri_poly]
+    fans = np.stack([base, base + k, base + k + 1], axis=1)
+
+    # -------- CONSTRAINED DELAUNAY --------
+    rest = np.flatnonzero(~convex & (area > 0))
+    if not len(rest):
+        return fans, tri_poly
+
+    parts, part_of = shapely.get_parts(shapely.constrained_delaunay_triangles(polygons[rest]), return_index=True)
+    tri_coords = shapely.get_coordinates(parts).reshape(-1, 4, 2)[:, :3]
+    tri_of = np.repeat(rest[part_of], 3)
+
+    # Triangle corners are ring vertices: match them on (polygon, x, y)
+    rows = np.flatnonzero(np.isin(poly_of, rest))
+    keys = np.concatenate([
+        np.column_stack([poly_of[rows], coords[rows]]),
+        np.column_stack([tri_of, tri_coords.reshape(-1, 2)]),
+    ])
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    lookup = np.full(inverse.max() + 1, -1)
+    lookup[inverse[:len(rows)]] = rows
+    triangles = lookup[inverse[len(rows):]].reshape(-1, 3)
+
+    valid = (triangles >= 0).all(axis=1)
+    if not valid.all():
+        logger.warning("Cap triangles off the outline dropped: %d", int((~valid).sum()))
+    triangles, tri_of = triangles[valid], tri_of[::3][valid]
+
+    # Constrained Delaunay output is not consistently wound
+    a, b, c = (coords[triangles[:, j]] for j in range(3))
+    cw = (b - a)[:, 0] * (c - a)[:, 1] - (b - a)[:, 1] * (c - a)[:, 0] < 0
+    triangles[cw] = triangles[cw][:, ::-1]
+
+    return np.concatenate([fans, triangles]), np.concatenate([tri_poly, tri_of])
@@ -0,0 +1,138 @@
+# src/renderer/glb.py
+
+import json
+import struct
+
+import numpy as np
+
+
+# ======================
+# CONSTANTS
+# ======================
+
+GLB_MAGIC = 0x46546C67     # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+COMPONENT_DTYPES = {code: dtype for dtype, code in COMPONENT_TYPES.items()}
+
+ELEMENT_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT4": 16}
+
+
+# ======================
+# CONTAINER
+# ======================
+
+def read_glb(data):
+    """(tree, binary) of a GLB file's bytes; binary is a bytearray."""
+
+    magic, _, length = struct.unpack_from("<III", data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError("Not a GLB file")
+
+    tree, binary, offset = None, bytearray(), 12
+    while offset < length:
+        size, kind = struct.unpack_from("<II", data, offset)
+        chunk = data[offset + 8:offset + 8 + size]
+        if kind == CHUNK_JSON:
+            tree = json.loads(bytes(chunk))
+        elif kind == CHUNK_BIN:
+            binary = bytearray(chunk)
+        offset += 8 + size
+
+    return tree, binary
+
+
+def write_glb(tree, binary):
+    """GLB bytes of a glTF tree and its single binary buffer."""
+
+    tree["buffers"] = [{"byteLength": len(binary)}] if binary else []
+    text = json.dumps(tree, separators=(",", ":")).encode("utf-8")
+    text += b" " * (-len(text) % 4)
+    binary = bytes(binary) + b"\0" * (-len(binary) % 4)
+
+    chunks = struct.pack("<II", len(text), CHUNK_JSON) + text
+    if binary:
+        chunks += struct.pack("<II", len(binary), CHUNK_BIN) + binary
+    return struct.pack("<III", GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+# ======================
+# ACCESSORS
+# ======================
+
+def append_view(tree, binary, data, stride=None):
+    """Append bytes to the binary buffer as a new bufferView (4-byte aligned). Returns its index."""
+
+    binary.extend(b"\0" * (-len(binary) % 4))
+    view = {"buffer": 0, "byteOffset": len(binary), "byteLength": len(data)}
+    if stride:
+        view["byteStride"] = stride
+    binary.extend(data)
+
+    views = tree.setdefault("bufferViews", [])
+    views.append(view)
+    return len(views) - 1
+
+
+def append_accessor(tree, binary, array, element, normalized=False, bounds=False):
+    """
+    Append array to the binary buffer as a new bufferView + accessor
+    (element "SCALAR", "VEC3", ...). Rows wider than the element are
+    padding (vertex attributes are 4-byte aligned) and become the
+    view's byteStride. Returns the accessor index.
+    """
+
+    array = np.ascontiguousarray(array)
+    rows = array.reshape(len(array), -1)
+    size = ELEMENT_SIZES[element]
+    stride = array.itemsize * rows.shape[1] if rows.shape[1] != size else None
+
+    accessor = {
+        "bufferView": append_view(tree, binary, array.tobytes(), stride),
+        "componentType": COMPONENT_TYPES[array.dtype],
+        "count": len(array),
+        "type": element,
+    }
+    if normalized:
+        accessor["normalized"] = True
+    if bounds:
+        accessor["min"] = rows[:, :size].min(axis=0).tolist()
+        accessor["max"] = rows[:, :size].max(axis=0).tolist()
+
+    accessors = tree.setdefault("accessors", [])
+    accessors.append(accessor)
+    return len(accessors) - 1
+
+
+def read_accessor(tree, binary, index):
+    """An accessor's data as an (count, size) array (normalization not applied)."""
+
+    accessor = tree["accessors"][index]
+    view = tree["bufferViews"][accessor["bufferView"]]
+    dtype = COMPONENT_DTYPES[accessor["componentType"]]
+    size = ELEMENT_SIZES[accessor["type"]]
+    count = accessor["count"]
+
+    start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    stride = view.get("byteStride", 0) or dtype.itemsize * size
+    raw = np.frombuffer(binary, dtype=np.uint8, count=stride * (count - 1) + dtype.itemsize * size, offset=start)
+    rows = np.lib.stride_tricks.as_strided(raw, shape=(count, dtype.itemsize * size), strides=(stride, 1))
+    return np.ascontiguousarray(rows).view(dtype).reshape(count, size)
+
+
+def use_extension(tree, name, required=False):
+    """List an extension in extensionsUsed (and extensionsRequired)."""
+
+    for key in ("extensionsUsed",) + (("extensionsRequired",) if required else ()):
+        names = tree.setdefault(key, [])
+        if name not in names:
+            names.append(name)
@@ -0,0 +1,204 @@
+# src/renderer/incremental.py
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# CONFIG
+# ======================
+
+STATE_DIR = Path(os.environ.get("DWG_INCREMENTAL_DIR", "data/cache/incremental"))
+
+# Bump when anything that shapes rooms or wall meshes changes
+STATE_VERSION = 4
+
+# Coordinates are compared after rounding to this many decimals
+KEY_DECIMALS = 6
+
+# Slack for "on the edge of a room" tests, in metres
+PAD = 1e-6
+
+
+# ======================
+# GEOMETRY KEYS
+# ======================
+
+def edge_keys(graph):
+    """Orientation-independent byte key per wall graph edge."""
+
+    ends = np.round(graph.nodes[graph.edges], KEY_DECIMALS)  # (E, 2, 2)
+    swap = (ends[:, 0, 0] > ends[:, 1, 0]) | (
+        (ends[:, 0, 0] == ends[:, 1, 0]) & (ends[:, 0, 1] > ends[:, 1, 1])
+    )
+    ends[swap] = ends[swap, ::-1]
+    rows = np.ascontiguousarray(ends.reshape(-1, 4))
+    return [row.tobytes() for row in rows]
+
+
+def chain_key(line, thickness=None, context=None):
+    """
+    Key of one wall centerline, the same in either direction. thickness
+    and context (anything with a stable repr, e.g. exterior flag and
+    adjacent room types) are part of the key when given.
+    """
+
+    coords = np.round(shapely.get_coordinates(line), KEY_DECIMALS)
+    data = min(coords.tobytes(), coords[::-1].tobytes())
+    if thickness is not None:
+        data += np.round(np.float64(thickness), KEY_DECIMALS).tobytes()
+    if context is not None:
+        data += repr(context).encode()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def state_name(dxf_path, output_dir):
+    """
+    File name of a drawing's state: its stem plus a hash of the resolved
+    drawing path and output directory, so same-named drawings elsewhere
+    keep separate states.
+    """
+
+    where = f"{Path(dxf_path).resolve()}|{Path(output_dir).resolve()}"
+    return f"{Path(dxf_path).stem}-{hashlib.blake2b(where.encode(), digest_size=8).hexdigest()}"
+
+
+# ======================
+# STATE
+# ======================
+
+class IncrementalState:
+    """
+    What a previous run of the same drawing produced: wall graph edge
+    keys, the rooms polygonized from them and one mesh per wall
+    centerline. build_mesh() reuses whatever the new revision did not
+    touch and records reuse counters in the report.
+    """
+
+    def __init__(self, params=None):
+        self.params = params
+        self.edges = set()
+        self.rooms = []
+        self.walls = {}
+
+    # -------------------------
+    # PERSISTENCE
+    # -------------------------
+
+    @classmethod
+    def load(cls, name, params, state_dir=None):
+        path = Path(state_dir or STATE_DIR) / f"{name}.joblib"
+        if path.exists():
+            try:
+                state = joblib.load(path)
+                if isinstance(state, cls) and state.params == params:
+                    return state
+                logger.info("Incremental state is stale, starting over: %s", path)
+            except Exception as e:
+                logger.warning("Unreadable incremental state, starting over: %s", e)
+        return cls(params)
+
+    def save(self, name, state_dir=None):
+        path = Path(state_dir or STATE_DIR) / f"{name}.joblib"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        joblib.dump(self, tmp)
+        os.replace(tmp, path)
+
+    # -------------------------
+    # ROOMS
+    # -------------------------
+
+    def update_rooms(self, graph, detect, report):
+        """
+        Rooms of `graph`, re-polygonizing only around changed edges.
+
+        Previous rooms touched by an added or removed edge are dirty;
+        the rest are kept. Edges meeting the dirty rooms are polygonized
+        again and only faces inside them are taken. New walls outside the
+        previous rooms can close faces over what used to be exterior,
+        which this cannot see, so that case falls back to a full
+        polygonize.
+        """
+
+        keys = edge_keys(graph)
+        current = set(keys)
+        added = [i for i, k in enumerate(keys) if k not in self.edges]
+        removed = self.edges - current
+
+        report.count("edges_added", len(added))
+        report.count("edges_removed", len(removed))
+
+        patch = self._patch_rooms(graph, detect, added, removed)
+        if patch is None:
+            fresh, kept = detect(graph), []
+        else:
+            fresh, kept = patch
+
+        report.count("rooms_reused", len(kept))
+        report.count("rooms_recomputed", len(fresh))
+        rooms = kept + fresh
+
+        self.edges = current
+        self.rooms = rooms
+        return rooms
+
+    def _patch_rooms(self, graph, detect, added, removed):
+        if not self.rooms:
+            return None
+        if not added and not removed:
+            return [], list(self.rooms)
+
+        lines = graph.lines()
+        changed = list(lines[added]) + [
+            shapely.linestrings(np.frombuffer(k).reshape(2, 2)) for k in removed
+        ]
+
+        old = np.array(self.rooms, dtype=object)
+        tree = shapely.STRtree(old)
+
+        # Every added edge must lie in (or on) some previous room
+        if added:
+            i, j = tree.query(lines[added])
+            inside = shapely.covered_by(lines[added][i], shapely.buffer(old[j], PAD))
+            if len(np.unique(i[inside])) < len(added):
+                return None
+
+        # -------- DIRTY REGION --------
+        # Only rooms holding a changed edge (inside or on the boundary) can
+        # change; every new face is a split or merge of those rooms. Edges
+        # of a noded graph never cross a room, so testing the midpoint
+        # ignores rooms that merely share an end node.
+        mids = shapely.line_interpolate_point(np.array(changed, dtype=object), 0.5, normalized=True)
+        _, hit = tree.query(mids, predicate="dwithin", distance=PAD)
+        dirty = np.zeros(len(old), dtype=bool)
+        dirty[hit] = True
+        region = shapely.union_all(old[dirty])
+
+        # -------- LOCAL POLYGONIZE --------
+        local = shapely.STRtree(lines).query(region, predicate="intersects")
+        subgraph = graph.subgraph(local)
+        fresh = np.array(detect(subgraph), dtype=object)
+        if len(fresh):
+            fresh = fresh[shapely.within(fresh, shapely.buffer(region, PAD))]
+
+        return list(fresh), list(old[~dirty])
+
+    # -------------------------
+    # WALL MESHES
+    # -------------------------
+
+    def wall(self, key):
+        return self.walls.get(key)
+
+    def keep_walls(self, walls):
+        """Replace the stored wall meshes with this run's {key: (vertices, faces, material)}."""
+        self.walls = walls
@@ -77,28 +77,60 @@
 # src/renderer/mesh_reconstruction.py
 import trimesh
 from trimesh.visual.material import PBRMaterial
-from shapely.geometry import LineString, Polygon, MultiPolygon
-from shapely.ops import unary_union, polygonize
+from shapely.geometry import Polygon, MultiPolygon
+from shapely.ops import unary_union
 from pathlib import Path
 from PIL import Image
 import numpy as np
+import shapely
+import json
+import logging
 
-from ml.material_predictor import predict_material
+from ml.material_predictor import apply_material_rules, predict_materials
 from ml.feature_extractor import extract_wall_features
+from src.metrics import PipelineReport
+from src.preprocessing.openings import host_openings, wall_lines_of
+from src.preprocessing.simplify import simplify_counted, SIMPLIFY_TOLERANCE
+from src.preprocessing.wall_context import classify_walls
+from src.preprocessing.wall_graph import build_wall_graph
+from src.renderer.extrude import extrude_batch, merge
+from src.renderer.glb import append_accessor, read_glb, use_extension, write_glb
+from src.renderer.incremental import chain_key
+from src.renderer.quantize import quantize_glb
+
+logger = logging.getLogger(__name__)
 
 # ======================
 # PARAMETERS
 # ======================
 
-UNIT_SCALE = 0.001
+# Geometry arrives in metres (parse_dwg normalizes the drawing units)
 FLOOR_HEIGHT = 0.3
 WALL_HEIGHT = 3.0
 WALL_THICKNESS = 0.25
 
+# Smallest graph face kept as a room, square metres
+MIN_ROOM_AREA = 0.1
+
 DOOR_HEIGHT = 2.1
 WINDOW_HEIGHT = 1.2
 WINDOW_BASE = 1.0
 
+# Openings stand this far proud of both wall faces, metres
+OPENING_PROUD = 0.01
+# Narrower door / window symbols are noise, metres
+OPENING_MIN_WIDTH = 0.3
+# kind -> (material, base, height)
+OPENING_STYLES = {
+    "door": ("door", 0.0, DOOR_HEIGHT),
+    "window": ("glass", WINDOW_BASE, WINDOW_HEIGHT),
+}
+
+# How repeated openings are written: "nodes" (one glTF node per copy
+# sharing the mesh), "gpu" (EXT_mesh_gpu_instancing, listed as required,
+# so viewers without it refuse the file) or "none" (baked in)
+INSTANCING = "nodes"
+
 TEXTURE_DIR = Path("assets/textures")
 
 # ======================
@@ -109,8 +141,13 @@ _MATERIAL_CACHE = {}
 
 
 def load_texture(name):
-    img = Image.open(TEXTURE_DIR / name).convert("RGBA")
-    return np.array(img)
+    """
+    Texture as a PIL image. The source format is kept so the GLB
+    exporter embeds JPEGs as JPEG instead of re-encoding to PNG.
+    """
+    img = Image.open(TEXTURE_DIR / name)
+    img.load()
+    return img
 
 
 def get_pbr_material(material_name):
@@ -123,6 +160,7 @@ def get_pbr_material(material_name):
 
     if material_name == "concrete":
         material = PBRMaterial(
+            name=material_name,
             baseColorTexture=load_texture("concrete.jpg"),
             metallicFactor=0.0,
             roughnessFactor=0.9
@@ -130,6 +168,7 @@ def get_pbr_material(material_name):
 
     elif material_name == "gypsum":
         material = PBRMaterial(
+            name=material_name,
             baseColorTexture=load_texture("gypsum.jpg"),
             metallicFactor=0.0,
             roughnessFactor=0.8
@@ -137,6 +176,7 @@ def get_pbr_material(material_name):
 
     elif material_name == "tile":
         material = PBRMaterial(
+            name=material_name,
             baseColorTexture=load_texture("tile.jpg"),
             metallicFactor=0.0,
             roughnessFactor=0.6
@@ -144,6 +184,7 @@ def get_pbr_material(material_name):
 
     elif material_name == "glass":
         material = PBRMaterial(
+            name=material_name,
             baseColorTexture=load_texture("glass.png"),
             metallicFactor=0.0,
             roughnessFactor=0.1,
@@ -152,13 +193,14 @@ def get_pbr_material(material_name):
 
     else:
         material = PBRMaterial(
+            name=material_name,
             baseColorFactor=[0.8, 0.8, 0.8, 1.0],
             metallicFactor=0.0,
             roughnessFactor=0.8
         )
 
     _MATERIAL_CACHE[material_name] = material
-    print(f"🎨 PBR material created: {material_name}")
+    logger.debug("PBR material created: %s", material_name)
     return material
 
 
@@ -166,119 +208,621 @@ def get_pbr_material(material_name):
 # UTILS
 # ======================
 
-def scale_coords(coords):
-    return [(x * UNIT_SCALE, y * UNIT_SCALE) for x, y in coords]
-
-
-def center_mesh(mesh):
-    mesh.apply_translation(-mesh.centroid)
-    return mesh
-
-
 def extrude(poly, height):
     return trimesh.creation.extrude_polygon(poly, height)
 
 
-def buffer_centerline(line):
+def buffer_centerline(line, thickness=WALL_THICKNESS):
     return line.buffer(
-        WALL_THICKNESS / 2,
+        thickness / 2,
         cap_style=3,
         join_style=2
     )
 
 
+def wall_solids(lines, thicknesses, exterior=None, adjacent_types=None, report=None):
+    """
+    Wall solids of many centerlines (metres) with their material names.
+    Features are extracted for every wall and materials predicted in
+    one batch (rules first, the model for the rest); all outlines are
+    extruded together (see extrude.py). Returns (Extrusion, materials),
+    where materials[i] is None and wall i owns no faces when its
+    outline is degenerate.
+    """
+
+    n = len(lines)
+    exterior = np.zeros(n, dtype=bool) if exterior is None else exterior
+    adjacent_types = [[]] * n if adjacent_types is None else adjacent_types
+
+    polys = [buffer_centerline(line, t) for line, t in zip(lines, thicknesses)]
+    valid = [i for i, poly in enumerate(polys) if poly.is_valid and isinstance(poly, Polygon) and not poly.is_empty]
+
+    # -------- AI FEATURE EXTRACTION --------
+    features = [
+        extract_wall_features(
+            polys[i],
+            WALL_HEIGHT,
+            layer="a-wall",
+            is_exterior=bool(exterior[i]),
+            adjacent_room_types=adjacent_types[i],
+            thickness=thicknesses[i],
+            length=lines[i].length
+        )
+        for i in valid
+    ]
+    materials = predict_materials(features)
+
+    if report is not None:
+        by_model = sum(apply_material_rules(f) is None for f in features)
+        report.incr("materials_by_rule", len(features) - by_model)
+        report.incr("materials_by_model", by_model)
+
+    names = [None] * n
+    for i, material_name in zip(valid, materials):
+        names[i] = material_name
+
+    outlines = [polys[i] if names[i] is not None else Polygon() for i in range(n)]
+    return extrude_batch(outlines, WALL_HEIGHT), names
+
+
 # ======================
 # ROOM DETECTION
 # ======================
 
-def detect_rooms_from_walls(walls):
-    lines = [LineString(w["points"]) for w in walls if len(w["points"]) >= 2]
-    merged = unary_union(lines)
+def detect_rooms_from_walls(graph):
+    """Faces of the wall graph (see wall_graph.py) that are valid rooms."""
+    polys = graph.polygons()
+    rooms = list(polys[shapely.is_valid(polys) & (shapely.area(polys) > MIN_ROOM_AREA)])
 
-    rooms = []
-    for poly in polygonize(merged):
-        if poly.is_valid and poly.area > 5:
-            rooms.append(poly)
-
-    print(f"🏠 Rooms polygonized: {len(rooms)}")
+    logger.info("Rooms polygonized: %d", len(rooms))
     return rooms
 
 
+# ======================
+# WALL CENTERLINES
+# ======================
+
+def wall_centerlines(graph, pairs=None):
+    """
+    (centerlines, thicknesses) of every wall to extrude, in metres.
+
+    Double-line walls found by pair_walls() come as one centerline with
+    their measured thickness; graph edges not consumed by a pair are
+    traced into continuous chains (degree-2 runs) at WALL_THICKNESS.
+    """
+
+    if pairs is None or not len(pairs):
+        lines = graph.chain_lines()
+        return list(lines), [WALL_THICKNESS] * len(lines)
+
+    seg = graph.edge_segment
+    paired = np.zeros(len(seg), dtype=bool)
+    known = seg >= 0
+    paired[known] = pairs.paired[seg[known]]
+
+    single = np.concatenate([
+        graph.subgraph(~paired).chain_lines(),
+        shapely.linestrings(pairs.leftovers) if len(pairs.leftovers) else np.empty(0, dtype=object)
+    ])
+    lines = np.concatenate([shapely.linestrings(pairs.centerlines), single])
+    thicknesses = np.concatenate([pairs.thickness, np.full(len(single), WALL_THICKNESS)])
+
+    return list(lines), thicknesses.tolist()
+
+
+# ======================
+# OPENINGS
+# ======================
+
+def place_openings(geometry, lines, thicknesses):
+    """
+    Door and window instances on the wall centerlines (metres).
+
+    Hosted openings (see host_openings) are moved onto their nearest
+    centerline and turned along it; symbols of one door (leaf + swing)
+    land on the same spot and count once. Every distinct (kind, width,
+    wall thickness) is one box, shared by all its copies.
+    Returns a list of {"name", "material", "vertices", "faces",
+    "translation" (K, 3), "rotation" (K, 4) xyzw quaternions}.
+    """
+
+    openings = geometry.get("openings")
+    if openings is None:
+        openings = host_openings(geometry)
+    if not openings or not len(lines):
+        return []
+
+    walls = wall_lines_of(geometry)
+    kinds = sorted(OPENING_STYLES)
+    kind = np.array([kinds.index(o["kind"]) for o in openings])
+    start, end, depth = (np.array([o[k] for o in openings]) for k in ("start", "end", "depth"))
+
+    # A leaf drawn open only marks one jamb; its length is the width
+    width = np.maximum(end - start, depth)
+    centre = np.where(end - start >= depth, (start + end) / 2, start + width / 2)
+    points = shapely.line_interpolate_point(walls[[o["wall"] for o in openings]], centre)
+
+    lines = np.asarray(lines, dtype=object)
+    host = shapely.STRtree(lines).query_nearest(points, all_matches=False)[1]
+    at = shapely.line_locate_point(lines[host], points)
+    length = shapely.length(lines[host])
+
+    position = shapely.get_coordinates(shapely.line_interpolate_point(lines[host], at))
+    ahead = shapely.get_coordinates(shapely.line_interpolate_point(lines[host], np.minimum(at + 0.01, length)))
+    behind = shapely.get_coordinates(shapely.line_interpolate_point(lines[host], np.maximum(at - 0.01, 0)))
+    angle = np.arctan2(*(ahead - behind)[:, ::-1].T)
+    thickness = np.asarray(thicknesses, dtype=np.float64)[host]
+
+    keep = width >= OPENING_MIN_WIDTH
+    _, first = np.unique(np.column_stack([kind, np.round(position, 2)])[keep], axis=0, return_index=True)
+    pick = np.flatnonzero(keep)[np.sort(first)]
+
+    shapes = np.column_stack([kind, np.round(width, 2), np.round(thickness, 2)])[pick]
+    prototypes, group = np.unique(shapes, axis=0, return_inverse=True)
+
+    instances = []
+    for g, (k, w, t) in enumerate(prototypes):
+        name = kinds[int(k)]
+        material_name, base, height = OPENING_STYLES[name]
+        box = trimesh.creation.box((w, t + 2 * OPENING_PROUD, height))
+        box.apply_translation([0, 0, base + height / 2])
+
+        members = pick[group.ravel() == g]
+        half = angle[members] / 2
+        instances.append({
+            "name": f"{name}_{w * 100:.0f}x{t * 100:.0f}",
+            "material": material_name,
+            "vertices": box.vertices,
+            "faces": box.faces,
+            "translation": np.column_stack([position[members], np.zeros(len(members))]),
+            "rotation": np.column_stack([np.zeros((len(members), 2)), np.sin(half), np.cos(half)]),
+        })
+
+    logger.info("Openings placed: %d copies of %d meshes", len(pick), len(instances))
+    return instances
+
+
+def instance_matrices(instance):
+    """(K, 4, 4) transforms of an instance group."""
+
+    x, y, z, w = instance["rotation"].T
+    matrices = np.zeros((len(w), 4, 4))
+    matrices[:, 0, 0] = matrices[:, 1, 1] = 1 - 2 * z * z
+    matrices[:, 0, 1] = -2 * z * w
+    matrices[:, 1, 0] = 2 * z * w
+    matrices[:, 2, 2] = matrices[:, 3, 3] = 1
+    matrices[:, :3, 3] = instance["translation"]
+    return matrices
+
+
 # ======================
 # MAIN BUILDER
 # ======================
 
-def build_mesh(geometry, output_path):
-    print("🏗️ Starting mesh reconstruction (PBR-enabled)...")
+def build_mesh(geometry, output_path, report=None, state=None, center=True,
+               simplify_tolerance=SIMPLIFY_TOLERANCE, instancing=INSTANCING, lods=False,
+               quantize=False):
+    """
+    Build and export the GLB. Stage timings and counters (rooms, walls,
+    faces, vertices) go into `report` when one is given.
+    With an IncrementalState (see incremental.py), rooms and wall meshes
+    the previous revision already built are reused and the state is
+    updated in place. center=False keeps drawing coordinates (in metres),
+    so several exports line up. Room outlines and wall
+    centerlines are simplified to simplify_tolerance metres before
+    extrusion (None turns that off). Doors and windows are instanced
+    boxes written as set by instancing (see INSTANCING).
+    lods=True also writes the coarser LODS levels, built from the same
+    floor outline and centerlines, and a manifest (see write_lods).
+    quantize=True writes quantized GLBs (see export_glb).
+    Returns the exported scene (one primitive per material).
+    """
 
-    meshes = []
+    report = report if report is not None else PipelineReport("build_mesh", jsonl_path=None)
+    logger.info("Starting mesh reconstruction (PBR-enabled)...")
+
+    # {material_name: [(vertices, faces), ...]}
+    parts = {}
 
     # -------------------------
     # FLOOR SLAB
     # -------------------------
-    raw_rooms = detect_rooms_from_walls(geometry["walls"])
-    rooms = [Polygon(scale_coords(r.exterior.coords)) for r in raw_rooms]
-
-    unioned = unary_union(rooms)
-    if isinstance(unioned, MultiPolygon):
-        unioned = max(unioned.geoms, key=lambda p: p.area)
+    with report.stage("rooms"):
+        graph = geometry.get("wall_graph")
+        if graph is None:
+            graph = build_wall_graph(geometry)
+
+        if state is not None:
+            raw_rooms = state.update_rooms(graph, detect_rooms_from_walls, report)
+        else:
+            raw_rooms = detect_rooms_from_walls(graph)
+        rooms = [Polygon(r.exterior.coords) for r in raw_rooms]
+        rooms = list(simplify_counted(rooms, report, simplify_tolerance, preserve_topology=True))
+
+        unioned = unary_union(rooms)
+        if isinstance(unioned, MultiPolygon):
+            unioned = max(unioned.geoms, key=lambda p: p.area)
+        # Merged room edges leave collinear vertices along the outline
+        unioned = simplify_counted([unioned], report, simplify_tolerance, preserve_topology=True)[0]
+
+        floor_mesh = extrude(unioned, FLOOR_HEIGHT)
+        parts["tile"] = [(floor_mesh.vertices, floor_mesh.faces)]
+
+    report.count("rooms", len(rooms))
+    logger.info("Floor slab created")
 
-    floor_mesh = extrude(unioned, FLOOR_HEIGHT)
-    floor_mesh.visual.material = get_pbr_material("tile")
-    meshes.append(floor_mesh)
+    # -------------------------
+    # WALL CENTERLINES
+    # -------------------------
+    with report.stage("wall_centerlines"):
+        merged_lines, thicknesses = wall_centerlines(graph, geometry.get("wall_pairs"))
+        merged_lines = list(simplify_counted(merged_lines, report, simplify_tolerance))
+
+    report.count("wall_centerlines", len(merged_lines))
+    logger.info("Continuous wall centerlines: %d", len(merged_lines))
+
+    # Exterior flags let the material rules resolve most walls without
+    # the model (rooms are untyped, so adjacency is not looked up)
+    with report.stage("wall_context"):
+        exterior, _, adjacent_types = classify_walls(merged_lines, thicknesses, rooms)
+    report.count("walls_exterior", int(exterior.sum()))
+
+    with report.stage("walls"):
+        built = {}
+        reused = 0
+        count = 0
+
+        keys = [None] * len(merged_lines)
+        cached = [None] * len(merged_lines)
+        if state is not None:
+            for i, line in enumerate(merged_lines):
+                keys[i] = chain_key(line, thicknesses[i], (bool(exterior[i]), tuple(adjacent_types[i])))
+                cached[i] = state.wall(keys[i])
+
+        todo = [i for i, c in enumerate(cached) if c is None]
+        solids, materials = wall_solids(
+            [merged_lines[i] for i in todo],
+            [thicknesses[i] for i in todo],
+            exterior[todo],
+            [adjacent_types[i] for i in todo],
+            report
+        )
 
-    print("🧱 Floor slab created")
+        # One vertex / face array per material: fresh walls in bulk,
+        # reused ones appended
+        for material_name, solid in solids.groups(materials).items():
+            parts.setdefault(material_name, []).append(solid)
+        count += sum(m is not None for m in materials)
+
+        line_materials = [None] * len(merged_lines)
+        for i, material_name in zip(todo, materials):
+            line_materials[i] = material_name
+
+        for i, entry in enumerate(cached):
+            if entry is not None:
+                vertices, faces, material_name = entry
+                parts.setdefault(material_name, []).append((vertices, faces))
+                line_materials[i] = material_name
+                built[keys[i]] = entry
+                reused += 1
+                count += 1
+
+        if state is not None:
+            for k, (i, material_name) in enumerate(zip(todo, materials)):
+                if material_name is not None:
+                    vertices, faces = solids.part(k)
+                    built[keys[i]] = (vertices.copy(), faces.copy(), material_name)
+            state.keep_walls(built)
+            report.count("walls_reused", reused)
+            report.count("walls_rebuilt", count - reused)
+
+    report.count("wall_meshes", count)
+    logger.info("Wall materials applied")
 
     # -------------------------
-    # WALL CENTERLINES
+    # DOORS / WINDOWS
     # -------------------------
-    wall_lines = []
-    for wall in geometry["walls"]:
-        pts = scale_coords(wall["points"])
-        if len(pts) >= 2:
-            wall_lines.append(LineString(pts))
-
-    merged_lines = unary_union(wall_lines)
-    if isinstance(merged_lines, LineString):
-        merged_lines = [merged_lines]
-    else:
-        merged_lines = list(merged_lines.geoms)
+    with report.stage("opening_instances"):
+        instances = place_openings(geometry, merged_lines, thicknesses)
+    report.count("opening_instances", sum(len(i["translation"]) for i in instances))
+    report.count("opening_meshes", len(instances))
 
-    print(f"🧱 Continuous wall centerlines: {len(merged_lines)}")
+    if not lods:
+        return export_glb(parts, output_path, report, center, instances, instancing, quantize=quantize)
 
-    wall_meshes = []
+    # Every level shares the full mesh's origin so they line up
+    offset = _centroid([c for chunks in parts.values() for c in chunks]) if center else np.zeros(3)
+    scene = export_glb(parts, output_path, report, center, instances, instancing, offset=offset, quantize=quantize)
 
-    for line in merged_lines:
-        poly = buffer_centerline(line)
-        if not poly.is_valid:
-            continue
+    with report.stage("lods"):
+        levels = {
+            "simplified": simplified_parts(unioned, merged_lines, thicknesses, line_materials),
+            "massing": massing_parts(merged_lines, thicknesses)
+        }
+        write_lods(levels, output_path, report, offset, quantize)
 
-        # -------- AI FEATURE EXTRACTION --------
-        features = extract_wall_features(
-            poly,
-            WALL_HEIGHT,
-            layer="a-wall"
-        )
+    return scene
 
-        material_name = predict_material(features)
-        material = get_pbr_material(material_name)
 
-        wall_mesh = extrude(poly, WALL_HEIGHT)
-        wall_mesh.visual.material = material
-        wall_meshes.append(wall_mesh)
+# ======================
+# LEVELS OF DETAIL
+# ======================
 
-    print("🎨 Wall materials applied")
+# Levels written with lods=True, finest first; "full" is the regular GLB
+LODS = ("full", "simplified", "massing")
 
-    walls_combined = trimesh.util.concatenate(wall_meshes)
-    meshes.append(walls_combined)
+# Simplified level: outline / centerline tolerance and shortest wall kept, metres
+LOD_TOLERANCE = 0.25
+LOD_MIN_WALL = 1.0
 
-    # -------------------------
-    # FINAL EXPORT
-    # -------------------------
-    final_mesh = trimesh.util.concatenate(meshes)
-    final_mesh = center_mesh(final_mesh)
+# Massing level: gap closing / outline tolerance (metres), smallest block (square metres)
+MASSING_TOLERANCE = 1.0
+MASSING_MIN_AREA = 4.0
+MASSING_MATERIAL = "concrete"
+
+# Smallest on-screen height (fraction of the viewport) each level is
+# meant for, as in MSFT_lod's MSFT_screencoverage hint
+LOD_COVERAGE = {"full": 0.25, "simplified": 0.05, "massing": 0.0}
+
+
+def simplified_parts(outline, lines, thicknesses, materials):
+    """
+    Parts of the "simplified" level: the floor outline and the wall
+    centerlines simplified to LOD_TOLERANCE and extruded again, walls
+    shorter than LOD_MIN_WALL (or without a material) left out.
+    """
+
+    parts = {}
+    floor = outline.simplify(LOD_TOLERANCE, preserve_topology=True)
+    if isinstance(floor, Polygon) and floor.area > 0:
+        parts["tile"] = [extrude_batch([floor], FLOOR_HEIGHT).part(0)]
+
+    keep = [i for i, line in enumerate(lines) if materials[i] is not None and line.length >= LOD_MIN_WALL]
+    coarse = shapely.simplify(np.array([lines[i] for i in keep], dtype=object), LOD_TOLERANCE)
+
+    polys, names = [], []
+    for line, i in zip(coarse, keep):
+        poly = buffer_centerline(line, thicknesses[i])
+        valid = isinstance(poly, Polygon) and poly.is_valid and not poly.is_empty
+        polys.append(poly if valid else Polygon())
+        names.append(materials[i] if valid else None)
+
+    for material_name, solid in extrude_batch(polys, WALL_HEIGHT).groups(names).items():
+        parts.setdefault(material_name, []).append(solid)
+    return parts
+
+
+def massing_parts(lines, thicknesses):
+    """
+    Parts of the "massing" level: the wall centerlines grown by
+    MASSING_TOLERANCE and shrunk back to the outer wall faces, which
+    closes gaps and courtyards narrower than twice that; each resulting
+    block's outline is simplified to MASSING_TOLERANCE and extruded up
+    to WALL_HEIGHT. Blocks under MASSING_MIN_AREA are dropped.
+    """
+
+    if not len(lines):
+        return {}
+    grown = shapely.union_all(
+        shapely.buffer(np.array(lines, dtype=object), MASSING_TOLERANCE, cap_style=3, join_style=2)
+    )
+    shrunk = grown.buffer(-(MASSING_TOLERANCE - max(thicknesses) / 2), join_style=2)
+
+    blocks = []
+    for part in shapely.get_parts(shrunk):
+        block = Polygon(part.exterior).simplify(MASSING_TOLERANCE)
+        if isinstance(block, Polygon) and block.is_valid and block.area >= MASSING_MIN_AREA:
+            blocks.append(block)
+
+    solids = extrude_batch(blocks, WALL_HEIGHT)
+    return {MASSING_MATERIAL: [(solids.vertices, solids.faces)]}
+
+
+def write_lods(levels, output_path, report, offset, quantize=False):
+    """
+    Export the coarser levels ({name: parts}, see LODS) next to the full
+    GLB as <stem>_lod1.glb, <stem>_lod2.glb, ... and write <stem>_lods.json
+    listing every level with its file, triangle / vertex / draw call
+    counts and screen coverage. The full GLB must already be exported
+    with `report`; its counters are read from there. Triangles per
+    level are also counted as lod_<name>_faces. Returns the manifest.
+    """
+
+    output_path = Path(output_path)
+    entries = [_lod_entry("full", output_path.with_suffix(".glb"), report.counters)]
+
+    for i, name in enumerate(LODS[1:], start=1):
+        path = output_path.with_name(f"{output_path.name}_lod{i}")
+        level_report = PipelineReport(name, jsonl_path=None)
+        export_glb(levels[name], path, level_report, offset=offset, quantize=quantize)
+        entries.append(_lod_entry(name, path.with_suffix(".glb"), level_report.counters))
+
+    for entry in entries:
+        report.count(f"lod_{entry['name']}_faces", entry["triangles"])
+
+    manifest = {"name": output_path.name, "units": "m", "levels": entries}
+    manifest_path = output_path.with_name(f"{output_path.name}_lods.json")
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    logger.info("LOD manifest written: %s", manifest_path)
+
+    return manifest
+
+
+def _lod_entry(name, glb_path, counters):
+    return {
+        "name": name,
+        "file": glb_path.name,
+        "screen_coverage": LOD_COVERAGE[name],
+        "triangles": counters["faces"],
+        "vertices": counters["vertices"],
+        "draw_calls": counters["draw_calls"],
+        "bytes": glb_path.stat().st_size
+    }
+
+
+# ======================
+# EXPORT
+# ======================
+
+# Metres per texture repeat
+UV_SCALE = 1.0
+
+
+def planar_uv(vertices, faces):
+    """
+    Box-projected texture coordinates, UV_SCALE metres per repeat:
+    horizontal faces map (x, y), vertical faces (distance along the
+    face, z). Vertices are split where faces with different projections
+    meet, which also gives hard edges at wall corners.
+    Returns (vertices, faces, uv).
+    """
+
+    tri = vertices[faces]
+    normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    flat = np.abs(normal[:, 2]) > 0.5 * np.linalg.norm(normal, axis=1)
+
+    # Horizontal direction along each vertical face
+    tangent = np.stack([-normal[:, 1], normal[:, 0]], axis=1)
+    tangent /= np.maximum(np.linalg.norm(tangent, axis=1, keepdims=True), 1e-12)
+
+    # Coincident vertices (touching walls) get one id
+    by_position = np.lexsort(vertices.T[::-1])
+    moved = np.ones(len(vertices), dtype=bool)
+    moved[1:] = (np.diff(vertices[by_position], axis=0) != 0).any(axis=1)
+    position = np.empty(len(vertices), dtype=np.int64)
+    position[by_position] = np.cumsum(moved) - 1
+
+    corner = position[faces.ravel()]
+    points = tri.reshape(-1, 3)
+    flat = np.repeat(flat, 3)
+    along = np.round(np.einsum("ij,ij->i", points[:, :2], np.repeat(tangent, 3, axis=0)), 6)
+    uv = np.where(
+        flat[:, None], points[:, :2], np.stack([along, points[:, 2]], axis=1)
+    ) / UV_SCALE
+
+    # Corners at the same position with the same projection are one
+    # vertex again (v and, on flat faces, u follow from the position)
+    key = np.where(flat, np.inf, along)
+    order = np.lexsort((key, corner))
+    new = np.ones(len(order), dtype=bool)
+    new[1:] = (corner[order][1:] != corner[order][:-1]) | (key[order][1:] != key[order][:-1])
+
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    first = order[new]
+    return points[first], inverse.reshape(-1, 3), uv[first]
+
+
+def _centroid(parts):
+    """Area-weighted surface centroid of many (vertices, faces) parts, as Trimesh.centroid."""
+
+    weighted, total = np.zeros(3), 0.0
+    for vertices, faces in parts:
+        tri = vertices[faces]
+        area = np.linalg.norm(np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]), axis=1) / 2
+        weighted += (tri.mean(axis=1) * area[:, None]).sum(axis=0)
+        total += area.sum()
+    return weighted / total if total else weighted
+
+
+def export_glb(parts, output_path, report, center=True, instances=(), instancing=INSTANCING, offset=None,
+               quantize=False):
+    """
+    Write the GLB next to output_path with one primitive per material.
+
+    parts maps a material name to a list of (vertices, faces) chunks;
+    each list is merged into one textured mesh (see planar_uv) carrying
+    its PBR material, so the file holds one buffer and one draw call per
+    material. instances (see place_openings) are written once per mesh
+    and placed according to `instancing` (see INSTANCING); "gpu" lists
+    EXT_mesh_gpu_instancing as required. offset, when given, is moved
+    to the origin instead of the centroid. quantize=True packs the
+    vertex data and lists KHR_mesh_quantization as required (see
+    quantize.py); trimesh cannot read such files back. Returns the scene.
+    """
+
+    if instancing not in ("gpu", "nodes", "none"):
+        raise ValueError(f"Unknown instancing mode: {instancing}")
+
+    with report.stage("export"):
+        parts = {name: list(chunks) for name, chunks in parts.items() if chunks}
+        if offset is None:
+            offset = _centroid([c for chunks in parts.values() for c in chunks]) if center else np.zeros(3)
+
+        if instancing == "none":
+            for instance in instances:
+                copies = np.einsum("kij,vj->kvi", instance_matrices(instance)[:, :3, :3], instance["vertices"])
+                copies += instance["translation"][:, None, :]
+                faces = instance["faces"] + len(instance["vertices"]) * np.arange(len(copies))[:, None, None]
+                parts.setdefault(instance["material"], []).append((copies.reshape(-1, 3), faces.reshape(-1, 3)))
+            instances = ()
+
+        scene = trimesh.Scene()
+        for material_name, chunks in parts.items():
+            vertices, faces = merge(chunks)
+            scene.add_geometry(_textured(vertices - offset, faces, material_name), geom_name=material_name, node_name=material_name)
+
+        draw_calls = len(scene.geometry)
+        for instance in instances:
+            name = instance["name"]
+            mesh = _textured(instance["vertices"], instance["faces"], instance["material"])
+            matrices = instance_matrices(instance)
+            matrices[:, :3, 3] -= offset
+
+            if instancing == "gpu":
+                scene.add_geometry(mesh, geom_name=name, node_name=name)
+                draw_calls += 1
+                continue
+
+            scene.add_geometry(mesh, geom_name=name, node_name=f"{name}/0", transform=matrices[0])
+            for k in range(1, len(matrices)):
+                scene.graph.update(frame_from=scene.graph.base_frame, frame_to=f"{name}/{k}", geometry=name, matrix=matrices[k])
+            draw_calls += len(matrices)
+
+        glb_path = output_path.with_suffix(".glb")
+        data = scene.export(file_type="glb")
+        if instancing == "gpu" and instances:
+            data = _gpu_instanced(data, instances, offset)
+        if quantize:
+            data = quantize_glb(data)
+        glb_path.write_bytes(data)
+
+    copies = {name: 1 for name in parts}
+    for instance in instances:
+        copies[instance["name"]] = len(instance["translation"])
+
+    report.count("primitives", len(scene.geometry))
+    report.count("draw_calls", draw_calls)
+    report.count("glb_bytes", len(data))
+    report.count("faces", sum(len(m.faces) * copies[name] for name, m in scene.geometry.items()))
+    report.count("vertices", sum(len(m.vertices) * copies[name] for name, m in scene.geometry.items()))
+    logger.info("GLB exported with PBR materials: %s", glb_path)
+
+    return scene
+
+
+def _textured(vertices, faces, material_name):
+    vertices, faces, uv = planar_uv(vertices, faces)
+    mesh = trimesh.Trimesh(vertices, faces, process=False)
+    mesh.visual = trimesh.visual.TextureVisuals(uv=uv, material=get_pbr_material(material_name))
+    return mesh
+
+
+def _gpu_instanced(data, instances, offset):
+    """
+    Patch the exported GLB: every instance group's node gets its copies
+    as EXT_mesh_gpu_instancing TRANSLATION / ROTATION attributes.
+    """
+
+    tree, binary = read_glb(data)
+    nodes = {node.get("name"): node for node in tree["nodes"]}
 
-    glb_path = output_path.with_suffix(".glb")
-    final_mesh.export(glb_path)
+    for instance in instances:
+        attributes = {
+            "TRANSLATION": append_accessor(tree, binary, (instance["translation"] - offset).astype(np.float32), "VEC3"),
+            "ROTATION": append_accessor(tree, binary, instance["rotation"].astype(np.float32), "VEC4"),
+        }
+        nodes[instance["name"]].setdefault("extensions", {})["EXT_mesh_gpu_instancing"] = {"attributes": attributes}
 
-    print("🎉 GLB exported with PBR materials:", glb_path)
+    use_extension(tree, "EXT_mesh_gpu_instancing", required=True)
+    return write_glb(tree, binary)
@@ -0,0 +1,234 @@
+# src/renderer/quantize.py
+"""
+Quantized GLB output (KHR_mesh_quantization), applied to exported bytes:
+
+- POSITION as normalized int16 inside each mesh's bounding cube; the
+  dequantizing scale / offset goes into the node matrix
+- NORMAL as normalized int8
+- TEXCOORD_0 as normalized uint16 inside each material's UV box; the
+  inverse goes into KHR_texture_transform on its textures
+- indices as uint16 where a primitive has fewer than 65535 vertices
+
+Vertices are also renumbered in the order the index buffer first uses
+them (meshopt's optimizeVertexFetch), so the GPU reads the vertex
+stream front to back.
+"""
+
+import logging
+
+import numpy as np
+
+from src.renderer.glb import append_accessor, append_view, read_accessor, read_glb, use_extension, write_glb
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# CONSTANTS
+# ======================
+
+SHORT_MAX = 32767
+USHORT_MAX = 65535
+BYTE_MAX = 127
+
+TEXTURE_SLOTS = ("normalTexture", "occlusionTexture", "emissiveTexture")
+PBR_TEXTURE_SLOTS = ("baseColorTexture", "metallicRoughnessTexture")
+
+
+# ======================
+# VERTEX ORDER
+# ======================
+
+def fetch_order(indices):
+    """
+    (indices, order): vertices renumbered by first use in the index
+    buffer, and the old index of each new vertex. Unused vertices are
+    dropped.
+    """
+
+    if not len(indices):
+        return indices, np.zeros(0, dtype=np.int64)
+
+    used, first = np.unique(indices, return_index=True)
+    order = used[np.argsort(first)]
+
+    remap = np.empty(int(used[-1]) + 1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return remap[indices], order
+
+
+# ======================
+# QUANTIZATION
+# ======================
+
+def bounding_cube(positions):
+    """(center, half side) of the cube around positions."""
+
+    lo, hi = positions.min(axis=0), positions.max(axis=0)
+    return (lo + hi) / 2, max(float((hi - lo).max()) / 2, 1e-9)
+
+
+def quantize_positions(positions, center, scale):
+    """Normalized int16 rows (padded to 4) with positions ~ center + scale * q."""
+
+    q = np.zeros((len(positions), 4), dtype=np.int16)
+    q[:, :3] = np.round((positions - center) / scale * SHORT_MAX)
+    return q
+
+
+def quantize_normals(normals):
+    """Normalized int8 rows (padded to 4)."""
+
+    q = np.zeros((len(normals), 4), dtype=np.int8)
+    q[:, :3] = np.round(np.clip(normals, -1, 1) * BYTE_MAX)
+    return q
+
+
+def quantize_uv(uv, lo, span):
+    """Normalized uint16 with uv ~ lo + span * q."""
+
+    return np.round((uv - lo) / span * USHORT_MAX).astype(np.uint16)
+
+
+# ======================
+# GLB
+# ======================
+
+def quantize_glb(data):
+    """
+    GLB bytes with every mesh quantized and reordered (see module doc).
+    Meshes drawn through EXT_mesh_gpu_instancing keep float positions:
+    their dequantizing transform would have to apply before each
+    instance's, which a node matrix cannot do.
+    """
+
+    tree, binary = read_glb(data)
+    source = {"bufferViews": tree.pop("bufferViews", []), "accessors": tree.pop("accessors", [])}
+    out = bytearray()
+
+    meshes = tree.get("meshes", [])
+    instanced = {
+        node["mesh"] for node in tree.get("nodes", [])
+        if "mesh" in node and "EXT_mesh_gpu_instancing" in node.get("extensions", {})
+    }
+
+    # One cube per mesh (its nodes carry the transform), one UV box per
+    # material (its textures carry the transform)
+    cubes, boxes = {}, {}
+    for m, mesh in enumerate(meshes):
+        positions = [
+            read_accessor(source, binary, p["attributes"]["POSITION"])
+            for p in mesh["primitives"] if "POSITION" in p["attributes"]
+        ]
+        if positions and m not in instanced:
+            cubes[m] = bounding_cube(np.concatenate(positions).astype(np.float64))
+
+        for primitive in mesh["primitives"]:
+            if "TEXCOORD_0" in primitive["attributes"] and "material" in primitive:
+                uv = read_accessor(source, binary, primitive["attributes"]["TEXCOORD_0"]).astype(np.float64)
+                lo, hi = boxes.get(primitive["material"], (uv.min(axis=0), uv.max(axis=0)))
+                boxes[primitive["material"]] = (np.minimum(lo, uv.min(axis=0)), np.maximum(hi, uv.max(axis=0)))
+    boxes = {k: (lo, np.where(hi > lo, hi - lo, 1.0)) for k, (lo, hi) in boxes.items()}
+
+    for m, mesh in enumerate(meshes):
+        for primitive in mesh["primitives"]:
+            order = None
+            if "indices" in primitive:
+                indices, order = fetch_order(read_accessor(source, binary, primitive["indices"]).ravel())
+                dtype = np.uint16 if len(order) < USHORT_MAX else np.uint32
+                primitive["indices"] = append_accessor(tree, out, indices.astype(dtype), "SCALAR")
+
+            attributes = primitive["attributes"]
+            for name, index in attributes.items():
+                values = read_accessor(source, binary, index)
+                values = values[order] if order is not None else values
+
+                if name == "POSITION" and m in cubes:
+                    q = quantize_positions(values.astype(np.float64), *cubes[m])
+                    attributes[name] = append_accessor(tree, out, q, "VEC3", normalized=True, bounds=True)
+                elif name == "NORMAL":
+                    attributes[name] = append_accessor(tree, out, quantize_normals(values), "VEC3", normalized=True)
+                elif name == "TEXCOORD_0" and primitive.get("material") in boxes:
+                    q = quantize_uv(values.astype(np.float64), *boxes[primitive["material"]])
+                    attributes[name] = append_accessor(tree, out, q, "VEC2", normalized=True)
+                else:
+                    attributes[name] = _copy_accessor(source, tree, out, values, index)
+
+    # Instance transforms and images move over unchanged
+    for node in tree.get("nodes", []):
+        instancing = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+        if instancing:
+            for name, index in instancing["attributes"].items():
+                instancing["attributes"][name] = _copy_accessor(
+                    source, tree, out, read_accessor(source, binary, index), index
+                )
+
+    for image in tree.get("images", []):
+        if "bufferView" in image:
+            view = source["bufferViews"][image["bufferView"]]
+            start = view.get("byteOffset", 0)
+            image["bufferView"] = append_view(tree, out, bytes(binary[start:start + view["byteLength"]]))
+
+    _dequantize_nodes(tree, cubes)
+    for material, (lo, span) in boxes.items():
+        for info in _texture_infos(tree["materials"][material]):
+            info.setdefault("extensions", {})["KHR_texture_transform"] = {"offset": lo.tolist(), "scale": span.tolist()}
+
+    use_extension(tree, "KHR_mesh_quantization", required=True)
+    if boxes:
+        use_extension(tree, "KHR_texture_transform", required=True)
+
+    logger.debug("Quantized GLB: %d -> %d binary bytes", len(binary), len(out))
+    return write_glb(tree, out)
+
+
+def _copy_accessor(source, tree, out, values, index):
+    accessor = source["accessors"][index]
+    return append_accessor(
+        tree, out, values, accessor["type"], accessor.get("normalized", False), "min" in accessor
+    )
+
+
+def _dequantize_nodes(tree, cubes):
+    """Every node drawing a quantized mesh maps the unit cube back to the mesh's cube."""
+
+    nodes = tree.get("nodes", [])
+    for node in list(nodes):
+        if node.get("mesh") not in cubes:
+            continue
+
+        center, scale = cubes[node["mesh"]]
+        dequantize = np.diag([scale, scale, scale, 1.0])
+        dequantize[:3, 3] = center
+
+        # Children must not inherit the scale: the mesh moves to its own child
+        if node.get("children"):
+            nodes.append({"mesh": node.pop("mesh"), "matrix": dequantize.T.ravel().tolist()})
+            node["children"].append(len(nodes) - 1)
+            continue
+
+        matrix = _node_matrix(node) @ dequantize
+        for key in ("translation", "rotation", "scale"):
+            node.pop(key, None)
+        node["matrix"] = matrix.T.ravel().tolist()
+
+
+def _node_matrix(node):
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+
+    x, y, z, w = node.get("rotation", [0.0, 0.0, 0.0, 1.0])
+    matrix = np.eye(4)
+    matrix[:3, :3] = [
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ]
+    matrix[:3, :3] *= node.get("scale", [1.0, 1.0, 1.0])
+    matrix[:3, 3] = node.get("translation", [0.0, 0.0, 0.0])
+    return matrix
+
+
+def _texture_infos(material):
+    pbr = material.get("pbrMetallicRoughness", {})
+    return [pbr[k] for k in PBR_TEXTURE_SLOTS if k in pbr] + [material[k] for k in TEXTURE_SLOTS if k in material]
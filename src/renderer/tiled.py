@@ -0,0 +1,224 @@
+# src/renderer/tiled.py
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Polygon
+from shapely.ops import unary_union
+
+from src.metrics import PipelineReport
+from src.preprocessing.openings import wall_lines_of
+from src.preprocessing.simplify import simplify, SIMPLIFY_TOLERANCE
+from src.preprocessing.wall_context import classify_walls, CONTEXT_SLACK
+from src.preprocessing.wall_graph import build_wall_graph
+from src.renderer.mesh_reconstruction import (
+    detect_rooms_from_walls, export_glb, extrude, place_openings, wall_centerlines, wall_solids,
+    INSTANCING, FLOOR_HEIGHT
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ======================
+# PARAMETERS
+# ======================
+
+# Tiles per worker when no tile size is given (load balancing)
+TILES_PER_WORKER = 4
+
+
+# ======================
+# TILING
+# ======================
+
+class TileGrid:
+    """
+    Regular grid over the plan extent. Every point belongs to exactly one
+    tile (half-open cells, the last row / column closed), which is what
+    decides who keeps a room or wall.
+    """
+
+    def __init__(self, bounds, tile_size):
+        self.x0, self.y0, x1, y1 = bounds
+        self.size = float(tile_size)
+        self.nx = max(1, int(math.ceil((x1 - self.x0) / self.size)))
+        self.ny = max(1, int(math.ceil((y1 - self.y0) / self.size)))
+
+    def __len__(self):
+        return self.nx * self.ny
+
+    def owner(self, points):
+        """Tile index of every (N, 2) point."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        ix = np.clip(np.floor((points[:, 0] - self.x0) / self.size), 0, self.nx - 1).astype(np.int64)
+        iy = np.clip(np.floor((points[:, 1] - self.y0) / self.size), 0, self.ny - 1).astype(np.int64)
+        return iy * self.nx + ix
+
+
+def _midpoints(lines):
+    return shapely.get_coordinates(shapely.line_interpolate_point(lines, 0.5, normalized=True))
+
+
+def plan_tiles(geometry, tile_size):
+    """
+    Split the plan into work items, one per non-empty tile.
+
+    Rooms and wall centerlines are traced once on the full wall graph
+    (geometry["wall_graph"] when built), as in build_mesh(), so they
+    do not depend on the tiling. Each room goes to the tile owning its
+    representative point and each centerline to the tile owning its
+    midpoint, however large; a tile also gets the rooms along its walls
+    as context for them. Only rooms in the largest piece of the floor
+    make the slab, as in build_mesh().
+    """
+
+    graph = geometry.get("wall_graph")
+    if graph is None:
+        graph = build_wall_graph(geometry)
+
+    lines, thicknesses = wall_centerlines(graph, geometry.get("wall_pairs"))
+    lines, thicknesses = np.array(lines, dtype=object), np.asarray(thicknesses, dtype=np.float64)
+
+    grid = TileGrid(shapely.total_bounds(wall_lines_of(geometry)), tile_size)
+    line_owner = grid.owner(_midpoints(lines)) if len(lines) else np.empty(0, dtype=np.int64)
+
+    # -------- ROOMS --------
+    raw_rooms = np.array(detect_rooms_from_walls(graph), dtype=object)
+    rooms = np.empty(0, dtype=object)
+    room_owner = np.empty(0, dtype=np.int64)
+    in_slab = np.empty(0, dtype=bool)
+    if len(raw_rooms):
+        rooms, _, _ = simplify([Polygon(r.exterior.coords) for r in raw_rooms], preserve_topology=True)
+        room_owner = grid.owner(shapely.get_coordinates(shapely.point_on_surface(raw_rooms)))
+
+        floor = unary_union(list(rooms))
+        if isinstance(floor, MultiPolygon):
+            floor = max(floor.geoms, key=lambda p: p.area)
+        in_slab = shapely.intersects(floor, shapely.point_on_surface(rooms))
+
+    # Rooms within reach of a wall's context band (see classify_walls),
+    # before and after the tile simplifies its centerlines
+    reach = thicknesses / 2 + CONTEXT_SLACK + SIMPLIFY_TOLERANCE
+    room_tree = shapely.STRtree(rooms)
+
+    tiles = []
+    for tile in np.union1d(line_owner, room_owner).tolist():
+        mine = line_owner == tile
+        near = room_tree.query(lines[mine], predicate="dwithin", distance=reach[mine])[1]
+        context = np.union1d(near, np.flatnonzero(room_owner == tile))
+
+        tiles.append({
+            "tile": tile,
+            "lines": lines[mine],
+            "thicknesses": thicknesses[mine],
+            "rooms": rooms[context],
+            "own_rooms": room_owner[context] == tile,
+            "in_slab": in_slab[context]
+        })
+
+    logger.info("Plan split into %d tiles (%d x %d, %.0f units)", len(tiles), grid.nx, grid.ny, grid.size)
+    return tiles
+
+
+# ======================
+# PER-TILE WORK
+# ======================
+
+def build_tile(item):
+    """
+    Floor and wall meshes of one tile (runs in a worker process).
+    Returns plain arrays: {"rooms", "floor": [(vertices, faces)],
+    "walls": {material_name: (vertices, faces)}, "wall_count",
+    "centerlines": (lines, thicknesses)} (centerlines host the openings).
+    """
+
+    # -------- FLOOR --------
+    outlines, mine = item["rooms"], item["own_rooms"]
+    slab_rooms = mine & item["in_slab"]
+
+    floor = []
+    if slab_rooms.any():
+        slab = simplify([unary_union(list(outlines[slab_rooms]))], preserve_topology=True)[0][0]
+        for part in getattr(slab, "geoms", [slab]):
+            mesh = extrude(part, FLOOR_HEIGHT)
+            floor.append((mesh.vertices, mesh.faces))
+
+    # -------- WALLS --------
+    lines, before, after = simplify(item["lines"])
+
+    thicknesses = item["thicknesses"].tolist()
+    exterior, _, adjacent_types = classify_walls(lines, thicknesses, outlines)
+
+    solids, materials = wall_solids(lines, thicknesses, exterior, adjacent_types)
+
+    return {
+        "rooms": int(mine.sum()),
+        "floor": floor,
+        "walls": solids.groups(materials),
+        "wall_count": sum(m is not None for m in materials),
+        "centerlines": (lines, thicknesses),
+        "vertices": (before, after)
+    }
+
+
+# ======================
+# TILED BUILDER
+# ======================
+
+def build_mesh_tiled(geometry, output_path, report=None, tile_size=None,
+                     workers=None, center=True, instancing=INSTANCING, quantize=False):
+    """
+    build_mesh() for very large plans: floor and wall meshes are built
+    per spatial tile in a process pool and stitched by ownership, so
+    each room and wall comes from exactly one tile. tile_size (metres)
+    defaults to TILES_PER_WORKER tiles per worker. Doors and windows
+    are placed on the stitched centerlines (see place_openings).
+    Returns the exported scene.
+    """
+
+    report = report if report is not None else PipelineReport("build_mesh_tiled", jsonl_path=None)
+    workers = workers or os.cpu_count() or 1
+
+    with report.stage("tiles"):
+        if tile_size is None:
+            x0, y0, x1, y1 = shapely.total_bounds(wall_lines_of(geometry))
+            area = max((x1 - x0) * (y1 - y0), 1.0)
+            tile_size = math.sqrt(area / (workers * TILES_PER_WORKER))
+        tiles = plan_tiles(geometry, tile_size)
+
+    report.count("tiles", len(tiles))
+    report.count("workers", workers)
+
+    with report.stage("tile_build"):
+        if workers == 1:
+            results = [build_tile(item) for item in tiles]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(build_tile, tiles))
+
+    # Tiles are stitched per material: export_glb merges each list
+    # into one primitive
+    with report.stage("stitch"):
+        parts = {"tile": []}
+        for result in results:
+            parts["tile"].extend(result["floor"])
+            for material_name, solid in result["walls"].items():
+                parts.setdefault(material_name, []).append(solid)
+
+    report.count("rooms", sum(r["rooms"] for r in results))
+    report.count("wall_meshes", sum(r["wall_count"] for r in results))
+    report.count("vertices_before_simplify", sum(r["vertices"][0] for r in results))
+    report.count("vertices_after_simplify", sum(r["vertices"][1] for r in results))
+
+    with report.stage("opening_instances"):
+        lines = np.concatenate([np.asarray(r["centerlines"][0], dtype=object) for r in results])
+        thicknesses = [t for r in results for t in r["centerlines"][1]]
+        instances = place_openings(geometry, lines, thicknesses)
+    report.count("opening_instances", sum(len(i["translation"]) for i in instances))
+    report.count("opening_meshes", len(instances))
+
+    return export_glb(parts, output_path, report, center, instances, instancing, quantize=quantize)
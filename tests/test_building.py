@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+import trimesh
+
+from benchmarks.synthetic import write_floor_plan
+from src.building import load_levels, run_building, LEVEL_HEIGHT
+
+
+def test_levels_from_file_names(tmp_path):
+    for name in ("tower_L02.dxf", "tower_B1.dxf", "level-0.dxf", "notes.dxf"):
+        (tmp_path / name).write_text("")
+
+    _, levels = load_levels(tmp_path)
+
+    assert [level["name"] for level in levels] == ["tower_B1", "level-0", "tower_L02"]
+    assert [level["elevation"] for level in levels] == [-LEVEL_HEIGHT, 0.0, 2 * LEVEL_HEIGHT]
+
+
+def test_manifest_levels_are_stacked_in_one_glb(tmp_path):
+    write_floor_plan(tmp_path / "ground.dxf", 40)
+    write_floor_plan(tmp_path / "upper.dxf", 60)
+    manifest = tmp_path / "tower.json"
+    manifest.write_text(json.dumps({
+        "name": "tower",
+        "levels": [
+            {"name": "ground", "file": "ground.dxf", "elevation": 0.0},
+            {"name": "upper", "file": "upper.dxf", "elevation": 3.5}
+        ]
+    }))
+
+    name, levels = load_levels(manifest)
+    report = run_building(levels, name, output_dir=tmp_path / "out", workers=1, use_cache=False, metrics_jsonl=None)
+
+    assert [s["stage"] for s in report.stages if s["stage"].startswith("level:")] == ["level:ground", "level:upper"]
+    assert report.counters["slowest_level"] in ("ground", "upper")
+
+    scene = trimesh.load(tmp_path / "out" / "tower.glb", force="scene")
+    assert {"ground", "upper"} <= set(scene.graph.nodes)
+    assert np.isclose(scene.graph.get("upper")[0][2, 3], 3.5)
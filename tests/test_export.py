@@ -0,0 +1,143 @@
+import json
+
+import numpy as np
+import trimesh
+
+from src.metrics import PipelineReport
+from src.renderer.glb import read_accessor, read_glb
+from src.renderer.mesh_reconstruction import build_mesh, export_glb, planar_uv
+
+
+def test_one_textured_primitive_per_material(tmp_path):
+    box = trimesh.creation.box((4, 0.2, 3))
+    shifted = box.vertices + [0, 5, 0]
+    parts = {
+        "concrete": [(box.vertices, box.faces), (shifted, box.faces)],
+        "gypsum": [(box.vertices + [0, 10, 0], box.faces)],
+    }
+    report = PipelineReport(jsonl_path=None)
+    export_glb(parts, tmp_path / "plan", report)
+
+    scene = trimesh.load(tmp_path / "plan.glb", force="scene")
+    assert sorted(scene.geometry) == ["concrete", "gypsum"]
+    assert report.counters["primitives"] == 2
+    assert report.counters["faces"] == 3 * len(box.faces)
+
+    concrete = scene.geometry["concrete"]
+    assert concrete.visual.material.name == "concrete"
+    assert concrete.visual.uv.shape == (len(concrete.vertices), 2)
+
+
+def test_planar_uv_splits_corners_between_projections():
+    box = trimesh.creation.box((4, 0.2, 3))
+    vertices, faces, uv = planar_uv(box.vertices, box.faces)
+
+    # Every corner of a box joins a top / bottom face and two sides
+    assert len(vertices) == 3 * len(box.vertices)
+    assert np.allclose(vertices[faces], box.vertices[box.faces])
+
+    # Side faces run along the wall, u spans its length
+    long_side = np.abs(trimesh.Trimesh(vertices, faces, process=False).face_normals[:, 1]) > 0.9
+    corners = faces[long_side].ravel()
+    assert np.isclose(np.ptp(uv[corners, 0]), 4.0)
+    assert np.isclose(np.ptp(uv[corners, 1]), 3.0)
+
+
+def test_gpu_instancing_writes_each_opening_mesh_once(tmp_path):
+    box = trimesh.creation.box((0.9, 0.2, 2.1))
+    instance = {
+        "name": "door_90x20",
+        "material": "door",
+        "vertices": box.vertices,
+        "faces": box.faces,
+        "translation": np.array([[1.0, 0, 0], [2.0, 0, 0], [3.0, 0, 0]]),
+        "rotation": np.tile([0.0, 0, 0, 1], (3, 1)),
+    }
+    parts = {"tile": [(box.vertices * 10, box.faces)]}
+
+    sizes = {}
+    for mode in ("gpu", "nodes", "none"):
+        report = PipelineReport(jsonl_path=None)
+        export_glb(parts, tmp_path / mode, report, center=False, instances=[instance], instancing=mode)
+        sizes[mode] = report.counters["faces"]
+
+        tree, binary = read_glb((tmp_path / f"{mode}.glb").read_bytes())
+        assert len(tree["meshes"]) == 2         # the floor and one door mesh
+
+    # Same scene however it is written
+    assert sizes["gpu"] == sizes["nodes"] == sizes["none"] == 4 * len(box.faces)
+
+    tree, binary = read_glb((tmp_path / "gpu.glb").read_bytes())
+    node = next(n for n in tree["nodes"] if "extensions" in n)
+    attributes = node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"]
+    assert np.allclose(read_accessor(tree, binary, attributes["TRANSLATION"])[:, 0], [1, 2, 3])
+    assert tree["extensionsRequired"] == ["EXT_mesh_gpu_instancing"]
+
+    # The default loads in any viewer: GPU instancing is opt-in
+    export_glb(parts, tmp_path / "default", PipelineReport(jsonl_path=None), center=False, instances=[instance])
+    tree, _ = read_glb((tmp_path / "default.glb").read_bytes())
+    assert "extensionsRequired" not in tree
+    assert sum("mesh" in n for n in tree["nodes"]) == 4
+
+
+def test_lods_share_one_pass_and_get_coarser(tmp_path):
+    # Two rooms with a short wall stub and a jog in the outline
+    walls = [
+        [(0, 0), (4, 0)], [(4, 0), (4, 0.1)], [(4, 0.1), (8, 0.1)], [(8, 0.1), (8, 6)],
+        [(8, 6), (0, 6)], [(0, 6), (0, 0)], [(4, 0.1), (4, 6)], [(2, 3), (2, 3.5)],
+    ]
+    report = PipelineReport(jsonl_path=None)
+    build_mesh({"walls": [{"points": w} for w in walls]}, tmp_path / "plan", report=report, lods=True)
+
+    manifest = json.loads((tmp_path / "plan_lods.json").read_text())
+    levels = manifest["levels"]
+    assert [level["name"] for level in levels] == ["full", "simplified", "massing"]
+    assert [level["file"] for level in levels] == ["plan.glb", "plan_lod1.glb", "plan_lod2.glb"]
+    assert all((tmp_path / level["file"]).exists() for level in levels)
+
+    triangles = [level["triangles"] for level in levels]
+    assert triangles[0] > triangles[1] > triangles[2] == 12     # massing: one box
+    assert report.counters["lod_massing_faces"] == 12
+
+    # Levels share the full mesh's origin
+    full, massing = (trimesh.load(tmp_path / level["file"], force="scene") for level in levels[::2])
+    assert np.allclose(full.bounds[:, :2], massing.bounds[:, :2], atol=0.2)
+
+
+def test_quantized_export_decodes_to_the_same_mesh(tmp_path):
+    box = trimesh.creation.box((40, 0.2, 3))
+    parts = {"concrete": [(box.vertices + [100, 50, 0], box.faces)]}
+
+    exported = {}
+    for quantize in (False, True):
+        report = PipelineReport(jsonl_path=None)
+        export_glb(parts, tmp_path / str(quantize), report, center=False, quantize=quantize)
+        exported[quantize] = read_glb((tmp_path / f"{quantize}.glb").read_bytes()), report.counters["glb_bytes"]
+
+    (tree, binary), size = exported[True]
+    assert size < exported[False][1]
+    assert tree["extensionsRequired"] == ["KHR_mesh_quantization", "KHR_texture_transform"]
+
+    primitive = tree["meshes"][0]["primitives"][0]
+    indices = read_accessor(tree, binary, primitive["indices"]).ravel()
+    assert indices.dtype == np.uint16
+    # Vertices are stored in first-use order
+    assert np.all(np.diff(np.unique(indices, return_index=True)[1]) > 0)
+
+    # Node matrix undoes the int16 normalization
+    node = next(n for n in tree["nodes"] if n.get("mesh") == 0)
+    matrix = np.array(node["matrix"]).reshape(4, 4).T
+    q = read_accessor(tree, binary, primitive["attributes"]["POSITION"]) / 32767
+    positions = q @ matrix[:3, :3].T + matrix[:3, 3]
+
+    (float_tree, float_binary), _ = exported[False]
+    reference = float_tree["meshes"][0]["primitives"][0]
+    float_positions = read_accessor(float_tree, float_binary, reference["attributes"]["POSITION"])
+    float_indices = read_accessor(float_tree, float_binary, reference["indices"]).ravel()
+    assert np.allclose(positions[indices], float_positions[float_indices], atol=1e-3)
+
+    # Texture transform undoes the uint16 normalization
+    transform = tree["materials"][0]["pbrMetallicRoughness"]["baseColorTexture"]["extensions"]["KHR_texture_transform"]
+    uv = read_accessor(tree, binary, primitive["attributes"]["TEXCOORD_0"]) / 65535 * transform["scale"] + transform["offset"]
+    float_uv = read_accessor(float_tree, float_binary, reference["attributes"]["TEXCOORD_0"])
+    assert np.allclose(uv[indices], float_uv[float_indices], atol=max(transform["scale"]) / 65535)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.dwg_parser.entity_table import EntityTableBuilder
+from src.preprocessing.extract_geometry import extract_from_rows, extract_from_table, iter_entity_rows
+
+
+def _table():
+    b = EntityTableBuilder()
+    b.add("LINE", "a-wall", [(0, 0), (100, 0)])
+    b.add("POLYLINE", "a-wall", [(0, 0), (0, 50), (20, 50)])
+    b.add("LINE", "a-door", [(10, 0), (10, 9)])
+    b.add("LINE", "a-glaz", [(40, 0), (60, 0)])
+    b.add("LINE", "a-anno", [(0, 0), (1, 1)])
+    b.add("LINE", "a-wall", [(5, 5)])                                         # too short
+    b.add("POLYLINE", "a-flor", [(0, 0), (100, 0), (100, 100), (0, 100)], True)  # boundary
+    b.add("POLYLINE", "a-flor", [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)], True)  # room
+    b.add("POLYLINE", "a-flor", [(0, 0), (10, 10), (10, 0), (0, 10)], True)   # bow-tie
+    b.add("POLYLINE", "a-flor", [(0, 0), (0.1, 0), (0.1, 0.1)], True)         # area 0.005
+    b.add("POLYLINE", "a-flor", [(0, 0), (5, 0), (0, 0)], True)               # degenerate
+    b.add("POLYLINE", "a-flor", [(0, 0), (50, 0), (50, 50)], False)           # open
+    return b.build()
+
+
+def test_vectorized_matches_rows():
+    table = _table()
+    a = extract_from_table(table)
+    b = extract_from_rows(iter_entity_rows(table))
+
+    assert [w["layer"] for w in a["walls"]] == [w["layer"] for w in b["walls"]]
+    for key in ("doors", "windows"):
+        assert len(a[key]) == len(b[key]) == 1
+    for x, y in zip(a["walls"], b["walls"]):
+        assert np.array_equal(x["points"], y["points"])
+
+    assert a["floors"] == b["floors"]
+    assert a["rooms"] == b["rooms"]
+    assert len(a["rooms"]) == 1
+    assert len(a["wall_lines"]) == 2
@@ -0,0 +1,40 @@
+import numpy as np
+import shapely
+import trimesh
+
+from src.renderer.extrude import extrude_batch
+
+
+def _footprints():
+    return [
+        shapely.box(0, 0, 4, 0.2),                                                     # straight wall
+        shapely.LineString([(0, 0), (4, 0), (4, 3), (1, 3)]).buffer(0.1, cap_style=3, join_style=2),
+        shapely.LinearRing([(0, 0), (4, 0), (4, 3), (0, 3)]).buffer(0.1, cap_style=3, join_style=2),
+        shapely.Polygon(),                                                             # degenerate
+    ]
+
+
+def test_batch_matches_per_polygon_extrusion():
+    polys = _footprints()
+    solids = extrude_batch(polys, 3.0)
+
+    for i, poly in enumerate(polys[:3]):
+        mesh = trimesh.Trimesh(*solids.part(i), process=False)
+        reference = trimesh.creation.extrude_polygon(poly, 3.0)
+
+        assert mesh.is_watertight and mesh.is_winding_consistent
+        assert np.isclose(mesh.volume, reference.volume)
+        assert len(mesh.faces) == len(reference.faces)
+        assert len(mesh.vertices) == len(reference.vertices)
+
+    assert len(solids.part(3)[1]) == 0
+
+
+def test_groups_make_one_solid_per_material():
+    polys = _footprints()
+    groups = extrude_batch(polys, 3.0).groups(["brick", "concrete", "brick", None])
+
+    assert sorted(groups) == ["brick", "concrete"]
+    brick = trimesh.Trimesh(*groups["brick"], process=False)
+    assert np.isclose(brick.volume, 3.0 * (polys[0].area + polys[2].area))
+    assert brick.body_count == 2
@@ -0,0 +1,25 @@
+from src.dwg_parser.entity_table import EntityTable
+from src.dwg_parser.geometry_io import save_geometry, load_geometry
+
+
+def _sample_entities():
+    return [
+        {"type": "LINE", "start": [0.0, 0.0, 0], "end": [1.5, 2.5, 0], "layer": "a-wall"},
+        {"type": "POLYLINE", "points": [[0.0, 0.0, 0], [4.0, 0.0, 0], [4.0, 3.0, 0]], "closed": True, "layer": "a-flor"},
+        {"type": "SPLINE", "points": [[1.0, 1.0, 0], [2.0, 3.0, 0]], "layer": "a-wäll"},
+    ]
+
+
+def test_geometry_round_trip_is_zero_copy(tmp_path):
+    table = EntityTable.from_entities(_sample_entities())
+    save_geometry(table, tmp_path / "plan.dgeo")
+
+    loaded = load_geometry(tmp_path / "plan.dgeo")
+
+    assert loaded.to_entities() == _sample_entities()
+    assert not loaded.coords.flags.writeable
+
+
+def test_empty_table_round_trip(tmp_path):
+    save_geometry(EntityTable.from_entities([]), tmp_path / "empty.dgeo")
+    assert len(load_geometry(tmp_path / "empty.dgeo", mmap=False)) == 0
@@ -0,0 +1,83 @@
+import numpy as np
+
+from benchmarks.synthetic import write_floor_plan
+from src.main import run_pipeline
+from src.metrics import PipelineReport
+from src.preprocessing.wall_graph import build_wall_graph
+from src.renderer import incremental
+from src.renderer.incremental import IncrementalState
+from src.renderer.mesh_reconstruction import detect_rooms_from_walls
+
+
+def _grid(n=6, size=100.0):
+    walls = []
+    for i in range(n + 1):
+        for j in range(n):
+            walls.append([(i * size, j * size), (i * size, (j + 1) * size)])
+            walls.append([(j * size, i * size), ((j + 1) * size, i * size)])
+    return walls
+
+
+def _rooms(walls, state):
+    graph = build_wall_graph({"walls": [{"points": np.asarray(w)} for w in walls]})
+    report = PipelineReport(jsonl_path=None)
+    rooms = state.update_rooms(graph, detect_rooms_from_walls, report)
+    full = detect_rooms_from_walls(graph)
+    return rooms, full, report.counters
+
+
+def _signature(rooms):
+    return sorted((round(r.area, 6), round(r.centroid.x, 6), round(r.centroid.y, 6)) for r in rooms)
+
+
+def test_patched_rooms_match_full_polygonize(tmp_path):
+    state = IncrementalState()
+    walls = _grid()
+    _rooms(walls, state)
+
+    revised = list(walls)
+    revised.remove([(200.0, 200.0), (200.0, 300.0)])    # merge two rooms
+    revised.append([(400.0, 450.0), (500.0, 450.0)])   # split a room
+    rooms, full, counters = _rooms(revised, state)
+
+    assert _signature(rooms) == _signature(full)
+    # merged room, both halves of the split one, and its two neighbours
+    # whose shared walls gained a node
+    assert counters["rooms_recomputed"] == 5
+    assert counters["rooms_reused"] == 36 - 2 - 1 - 2
+
+    # The state survives a round trip and reuses everything next time
+    state.save("plan", tmp_path)
+    state = IncrementalState.load("plan", None, tmp_path)
+    rooms, full, counters = _rooms(revised, state)
+    assert counters["rooms_recomputed"] == 0
+    assert _signature(rooms) == _signature(full)
+
+
+def test_walls_outside_previous_rooms_fall_back_to_full():
+    state = IncrementalState()
+    walls = _grid(2)
+    _rooms(walls, state)
+
+    # A new room outside the building
+    revised = walls + [
+        [(200.0, 0.0), (300.0, 0.0)], [(300.0, 0.0), (300.0, 100.0)], [(300.0, 100.0), (200.0, 100.0)]
+    ]
+    rooms, full, counters = _rooms(revised, state)
+    assert _signature(rooms) == _signature(full)
+    assert counters["rooms_reused"] == 0
+
+
+def test_same_named_drawings_keep_separate_states(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, "STATE_DIR", tmp_path / "state")
+    first = write_floor_plan(tmp_path / "a" / "plan.dxf", 40)
+    other = write_floor_plan(tmp_path / "b" / "plan.dxf", 60)
+
+    def reused(path):
+        report = run_pipeline(path, use_cache=False, incremental=True, metrics_jsonl=None, output_dir=tmp_path / "out")
+        return report.counters["walls_reused"], report.counters["wall_meshes"]
+
+    assert reused(first)[0] == 0
+    assert reused(other)[0] == 0
+    walls_reused, wall_meshes = reused(first)
+    assert walls_reused == wall_meshes > 0
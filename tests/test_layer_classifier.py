@@ -0,0 +1,58 @@
+import pytest
+
+from src.preprocessing.layer_classifier import LayerClassifier, DEFAULT_RULES
+
+
+def _legacy_categorize(layer_name):
+    layer = layer_name.lower()
+    if any(k in layer for k in ["wall", "a-wall", "partition", "a-part"]):
+        return "walls"
+    elif any(k in layer for k in ["floor", "slab", "a-flor"]):
+        return "floors"
+    elif any(k in layer for k in ["door", "a-door", "opening"]):
+        return "doors"
+    elif any(k in layer for k in ["window", "a-win", "glaz"]):
+        return "windows"
+    return "ignore"
+
+
+def test_default_rules_match_legacy_keywords():
+    classifier = LayerClassifier()
+    names = [
+        "A-WALL", "a-wall-ext", "A-PART", "Partition", "A-FLOR", "SLAB-1",
+        "A-DOOR", "Openings", "A-GLAZ", "A-WIN", "WINDOW", "A-COLS", "0",
+        "door-in-wall", "glazed-floor", "A-ANNO-TEXT", ""
+    ]
+    for name in names:
+        assert classifier.classify(name) == _legacy_categorize(name), name
+
+
+def test_first_rule_wins_over_earlier_match():
+    # "door" occurs first in the name, but the walls rule has priority
+    assert LayerClassifier().classify("door-wall") == "walls"
+
+
+def test_prefixes_and_regex():
+    classifier = LayerClassifier([
+        {"category": "walls", "prefixes": ["A-21", "A-22"]},
+        {"category": "doors", "regex": [r"^a-?32"]},
+    ])
+    assert classifier.classify("A-21----E") == "walls"
+    assert classifier.classify("B-21") == "ignore"
+    assert classifier.classify("A32") == "doors"
+    assert classifier("A-22") and not classifier("A-40")
+
+
+def test_memo_and_cache_token():
+    classifier = LayerClassifier()
+    for _ in range(3):
+        classifier.classify("A-WALL")
+    assert list(classifier._memo) == ["A-WALL"]
+
+    assert LayerClassifier().cache_token == classifier.cache_token
+    assert LayerClassifier(DEFAULT_RULES[:1]).cache_token != classifier.cache_token
+
+
+def test_rule_without_matchers_is_rejected():
+    with pytest.raises(ValueError):
+        LayerClassifier([{"category": "walls"}])
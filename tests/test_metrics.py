@@ -0,0 +1,36 @@
+import json
+
+from src.metrics import PipelineReport
+
+
+def test_stages_and_counters(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    report = PipelineReport("plan.dxf", jsonl_path=path)
+
+    with report.stage("parse"):
+        sum(range(1000))
+    report.count("walls", 3)
+    report.incr("rooms")
+    report.incr("rooms")
+    report.finish()
+
+    data = report.to_dict()
+    assert [s["stage"] for s in data["stages"]] == ["parse"]
+    assert data["counters"] == {"walls": 3, "rooms": 2}
+    assert data["peak_rss_mb"] > 0
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["event"] for line in lines] == ["stage", "summary"]
+    assert lines[1]["run"] == "plan.dxf"
+    assert lines[1]["counters"]["walls"] == 3
+
+
+def test_stage_recorded_on_error():
+    report = PipelineReport(jsonl_path=None)
+    try:
+        with report.stage("walls"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert report.stage_time("walls") >= 0
+    assert len(report.stages) == 1
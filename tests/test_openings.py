@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import shapely
+
+from benchmarks.synthetic import write_floor_plan, grid_size, ROOM_SIZE, WINDOW_WIDTH
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
+from src.preprocessing.openings import host_openings
+from src.renderer.mesh_reconstruction import place_openings
+
+
+def test_windows_hosted_on_exterior_walls(tmp_path):
+    path = write_floor_plan(tmp_path / "plan.dxf", 100)
+    geometry = extract_walls_floors_doors_windows(parse_dwg(path, as_table=True))
+    openings = host_openings(geometry)
+
+    windows = [o for o in openings if o["kind"] == "window"]
+    assert len(windows) == 4 * grid_size(100)
+
+    for o in windows:
+        assert o["distance"] == pytest.approx(0.0)
+        # synthetic plans are drawn in mm, parsed to metres
+        assert o["end"] - o["start"] == pytest.approx(WINDOW_WIDTH / 1000)
+        # centred on a ROOM_SIZE wall segment
+        assert o["start"] == pytest.approx((ROOM_SIZE - WINDOW_WIDTH) / 2000)
+
+
+def test_max_distance_leaves_far_openings_unhosted():
+    geometry = {
+        "walls": [{"points": [(0, 0), (1000, 0)], "layer": "a-wall"}],
+        "doors": [[(100, 10), (200, 10)], [(100, 500), (200, 500)]],
+        "windows": []
+    }
+    openings = host_openings(geometry, max_distance=50)
+
+    assert [o["index"] for o in openings] == [0]
+    assert (openings[0]["start"], openings[0]["end"]) == (100, 200)
+
+
+def test_door_symbols_become_one_instance_along_the_wall():
+    # Vertical wall; a door drawn as an open leaf plus its swing arc,
+    # and a window line on the same wall
+    arc = [(0.9 * np.cos(a), 1.0 + 0.9 * np.sin(a)) for a in np.linspace(0, np.pi / 2, 9)]
+    geometry = {
+        "walls": [{"points": [(0, 0), (0, 6)], "layer": "a-wall"}],
+        "doors": [[(0, 1.0), (0.9, 1.0)], arc],
+        "windows": [[(0, 3.0), (0, 4.2)]],
+    }
+    instances = place_openings(geometry, [shapely.LineString([(0, 0), (0, 6)])], [0.2])
+
+    door, window = sorted(instances, key=lambda i: i["name"])
+    assert door["name"] == "door_90x20" and window["name"] == "window_120x20"
+    assert np.allclose(door["translation"], [[0, 1.45, 0]])
+    assert np.allclose(window["translation"], [[0, 3.6, 0]])
+    # Quarter turn about z: the box's x axis runs up the wall
+    assert np.allclose(door["rotation"], [[0, 0, np.sin(np.pi / 4), np.cos(np.pi / 4)]])
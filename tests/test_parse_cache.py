@@ -0,0 +1,64 @@
+import functools
+import operator
+
+import ezdxf
+import pytest
+
+from src.dwg_parser import parse_cache
+from src.dwg_parser.parse_cache import parse_cached
+from src.main import run_pipeline
+
+
+def _write_plan(path, n):
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+    for i in range(n):
+        msp.add_line((0, i * 100), (1000, i * 100), dxfattribs={"layer": "A-WALL"})
+    doc.saveas(path)
+    return path
+
+
+def test_cache_hit_skips_ezdxf(tmp_path, monkeypatch):
+    path = _write_plan(tmp_path / "plan.dxf", 5)
+    first = parse_cached(path, cache_dir=tmp_path / "cache")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ezdxf.readfile called on cache hit")
+
+    monkeypatch.setattr(ezdxf, "readfile", fail)
+    second = parse_cached(path, cache_dir=tmp_path / "cache")
+
+    assert second.to_entities() == first.to_entities()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    for n in (1, 2, 3):
+        parse_cached(_write_plan(tmp_path / f"plan{n}.dxf", n), cache_dir=cache_dir)
+
+    entries = sorted(cache_dir.glob("*.dgeo"), key=lambda p: p.stat().st_mtime)
+    newest_size = entries[-1].stat().st_size
+
+    assert parse_cache.evict(cache_dir, max_bytes=newest_size) == 2
+    assert list(cache_dir.glob("*.dgeo")) == [entries[-1]]
+
+
+def test_callables_without_cache_token_bypass_the_cache(tmp_path):
+    path = _write_plan(tmp_path / "plan.dxf", 3)
+    cache_dir = tmp_path / "cache"
+
+    walls = parse_cached(path, cache_dir=cache_dir, layer_filter=lambda name: name == "a-wall")
+    nothing = parse_cached(path, cache_dir=cache_dir, layer_filter=lambda name: False)
+    partial = parse_cached(path, cache_dir=cache_dir, layer_filter=functools.partial(operator.eq, "a-wall"))
+
+    assert (len(walls), len(nothing), len(partial)) == (3, 0, 3)
+    assert not list(cache_dir.glob("*.dgeo"))
+
+
+def test_empty_drawing_fails_the_same_with_and_without_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", tmp_path / "cache")
+    path = _write_plan(tmp_path / "empty.dxf", 0)
+
+    for use_cache in (True, True, False):     # miss, hit, uncached
+        with pytest.raises(ValueError, match="No entities parsed"):
+            run_pipeline(path, use_cache=use_cache, metrics_jsonl=None, output_dir=tmp_path)
@@ -0,0 +1,151 @@
+import ezdxf
+import numpy as np
+import shapely
+
+from src.dwg_parser.curves import arc_segment_counts, flatten_ellipses
+from src.dwg_parser.entity_table import EntityTable
+from src.dwg_parser.parse_dwg import parse_dwg, iter_entities
+
+
+def _write_sample(path):
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (1000, 0), dxfattribs={"layer": "A-WALL"})
+    msp.add_lwpolyline([(0, 0), (1000, 0), (1000, 1000)], close=True, dxfattribs={"layer": "A-FLOR"})
+    msp.add_polyline2d([(0, 0), (0, 500)], dxfattribs={"layer": "A-DOOR"})
+    msp.add_text("ROOM", dxfattribs={"layer": "A-ANNO"})
+    doc.saveas(path)
+    return path
+
+
+def test_streaming_matches_document_parse(tmp_path):
+    path = _write_sample(tmp_path / "plan.dxf")
+
+    assert list(iter_entities(path)) == parse_dwg(path)
+    assert [e["type"] for e in parse_dwg(path)] == ["LINE", "POLYLINE", "POLYLINE"]
+
+
+def test_streaming_counts_skipped_inserts_and_reports_units(tmp_path):
+    doc = ezdxf.new("R2010")
+    doc.header["$INSUNITS"] = 4
+    doc.blocks.new("DOOR").add_line((0, 0), (900, 0))
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (4000, 0), dxfattribs={"layer": "A-WALL"})
+    msp.add_line((0, 0), (0, 4000), dxfattribs={"layer": "A-ANNO"})
+    msp.add_blockref("DOOR", (0, 0))
+    doc.saveas(tmp_path / "plan.dxf")
+
+    table = parse_dwg(tmp_path / "plan.dxf", streaming=True, as_table=True, layer_filter=lambda name: name == "a-wall")
+
+    assert len(table) == 1
+    assert table.stats["skipped_inserts"] == 1
+    assert table.stats["skipped_by_layer"] == {"a-anno": 1}
+    assert (table.stats["units"], table.stats["unit_scale"]) == ("millimetre", 0.001)
+
+
+def test_entity_table_round_trip(tmp_path):
+    path = _write_sample(tmp_path / "plan.dxf")
+    table = parse_dwg(path, as_table=True)
+
+    assert len(table) == 3
+    assert table.coords.shape == (int(table.counts.sum()), 2)
+    assert table.to_entities() == parse_dwg(path)
+    assert EntityTable.from_entities(table.to_entities()).to_entities() == table.to_entities()
+
+
+def test_inserts_expand_with_transform_and_layer_inheritance(tmp_path):
+    doc = ezdxf.new("R2010")
+    block = doc.blocks.new("DOOR", base_point=(10, 0))
+    block.add_line((10, 0), (110, 0), dxfattribs={"layer": "0"})
+    nested = doc.blocks.new("PAIR")
+    nested.add_blockref("DOOR", (0, 0))
+    nested.add_blockref("DOOR", (0, 500), dxfattribs={"layer": "A-WALL"})
+
+    msp = doc.modelspace()
+    msp.add_blockref("DOOR", (1000, 0), dxfattribs={"rotation": 90, "xscale": 2, "layer": "A-DOOR"})
+    grid = msp.add_blockref("PAIR", (0, 0), dxfattribs={"layer": "A-DOOR"})
+    grid.dxf.column_count = 3
+    grid.dxf.column_spacing = 1000
+    doc.saveas(tmp_path / "blocks.dxf")
+
+    table = parse_dwg(tmp_path / "blocks.dxf", as_table=True)
+    layers = [table.layers[i] for i in table.layer_ids]
+
+    assert len(table) == 1 + 3 * 2
+    assert table.points(0).round(6).tolist() == [[1000.0, 0.0], [1000.0, 200.0]]
+    assert layers.count("a-door") == 4 and layers.count("a-wall") == 3
+    assert sorted(table.coords[2:, 0].round(6).tolist())[::4] == [0.0, 1000.0, 2000.0]
+
+
+def test_block_truncated_by_depth_limit_is_not_reused_shallower(tmp_path):
+    doc = ezdxf.new("R2010")
+    for i in range(10):
+        block = doc.blocks.new(f"B{i}")
+        block.add_line((0, i), (100, i), dxfattribs={"layer": "A-WALL"})
+        if i < 9:
+            block.add_blockref(f"B{i + 1}", (0, 0))
+
+    # B5 is first reached at depth 5 (B9 cut off), then inserted directly
+    msp = doc.modelspace()
+    msp.add_blockref("B0", (0, 0))
+    msp.add_blockref("B5", (1000, 0))
+    doc.saveas(tmp_path / "deep.dxf")
+
+    table = parse_dwg(tmp_path / "deep.dxf", as_table=True)
+
+    assert len(table) == 9 + 5
+
+
+def test_curves_are_flattened_within_tolerance(tmp_path):
+    doc = ezdxf.new("R2010")
+    msp = doc.modelspace()
+    msp.add_circle((0, 0), 1000, dxfattribs={"layer": "A-WALL"})
+    msp.add_lwpolyline([(0, 0, 1), (2000, 0, 0)], format="xyb", dxfattribs={"layer": "A-WALL"})
+    doc.saveas(tmp_path / "curves.dxf")
+
+    coarse = parse_dwg(tmp_path / "curves.dxf", as_table=True, chord_tolerance=10.0)
+    fine = parse_dwg(tmp_path / "curves.dxf", as_table=True, chord_tolerance=1.0)
+
+    for table in (coarse, fine):
+        bulge, circle = table.points(0), table.points(1)
+        assert np.allclose(np.hypot(*circle.T), 1000.0)
+        # semicircle through (0, 0) and (2000, 0) bulging to y < 0
+        assert np.allclose(np.hypot(bulge[:, 0] - 1000.0, bulge[:, 1]), 1000.0)
+        assert bulge[:, 1].min() < -999.0
+
+    assert len(fine.points(1)) > len(coarse.points(1)) > 8
+
+
+def test_closed_curves_below_tolerance_stay_rings():
+    full = 2 * np.pi
+    assert arc_segment_counts([0.3, 0.5, 1.0, 2.0], full, 1.0, closed=True).tolist() == [3, 3, 3, 3]
+    assert arc_segment_counts([0.3, 0.5], full / 4, 1.0).tolist() == [1, 1]
+
+    # circle (r == tolerance) and ellipse (r < tolerance), then an open arc
+    coords, counts = flatten_ellipses(
+        [(0, 0), (5, 0), (10, 0)], [(1, 0), (0.5, 0), (0.5, 0)], [1, 0.5, 1],
+        [0, 0, 0], [full, full, full / 4], [True, True, False], 1.0
+    )
+    assert counts.tolist() == [3, 3, 2]
+    assert shapely.Polygon(coords[:3]).area > 0
+    assert shapely.Polygon(coords[3:6]).is_valid
+
+
+def test_layer_filter_skips_before_conversion_and_reports_counts(tmp_path):
+    doc = ezdxf.new("R2010")
+    block = doc.blocks.new("CHAIR")
+    block.add_circle((0, 0), 200)
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (1000, 0), dxfattribs={"layer": "A-WALL"})
+    msp.add_line((0, 0), (0, 1000), dxfattribs={"layer": "A-ANNO-DIMS"})
+    msp.add_arc((0, 0), 500, 0, 90, dxfattribs={"layer": "A-ANNO-DIMS"})
+    msp.add_blockref("CHAIR", (0, 0), dxfattribs={"layer": "A-FURN"})
+    msp.add_blockref("CHAIR", (500, 0), dxfattribs={"layer": "A-WALL"})
+    doc.saveas(tmp_path / "layers.dxf")
+
+    table = parse_dwg(tmp_path / "layers.dxf", as_table=True, layer_filter=lambda name: name.startswith("a-wall"))
+    by_map = parse_dwg(tmp_path / "layers.dxf", as_table=True, layer_filter={"A-WALL": "walls", "A-FURN": "ignore"})
+
+    assert [table.layers[i] for i in table.layer_ids] == ["a-wall", "a-wall"]
+    assert table.stats["skipped_by_layer"] == {"a-anno-dims": 2, "a-furn": 1}
+    assert by_map.to_entities() == table.to_entities()
@@ -1,6 +1,19 @@
 import os
 
+from benchmarks.synthetic import write_floor_plan
+from src.main import run_pipeline
+
+
 def test_outputs_exist():
     assert os.path.exists("data/processed/geometry.json")
     assert os.path.exists("data/output_3d/model.obj")
     assert os.path.exists("data/output_3d/model.png")
+
+
+def test_run_pipeline_creates_the_output_dir(tmp_path):
+    path = write_floor_plan(tmp_path / "plan.dxf", 40)
+    output_dir = tmp_path / "fresh" / "out"
+
+    run_pipeline(path, use_cache=False, metrics_jsonl=None, output_dir=output_dir)
+
+    assert (output_dir / "plan.glb").exists()
@@ -0,0 +1,37 @@
+import numpy as np
+import shapely
+
+from src.metrics import PipelineReport
+from src.preprocessing.simplify import simplify
+from src.renderer.mesh_reconstruction import build_mesh
+
+
+def test_collinear_and_duplicate_vertices_are_dropped():
+    line = shapely.linestrings([(0, 0), (1, 0), (1.001, 0), (2, 0.002), (3, 0), (3, 2)])
+    ring = shapely.Polygon([(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (0, 2)])
+
+    (line, ring), before, after = simplify([line, ring], 0.01)
+
+    assert before == 13
+    assert shapely.get_coordinates(line).tolist() == [[0, 0], [3, 0], [3, 2]]
+    assert len(ring.exterior.coords) == 5
+    assert after == 8
+
+
+def test_fragmented_walls_extrude_to_fewer_faces(tmp_path):
+    # 10 x 10 m room whose walls are exploded into 100 collinear pieces
+    corners = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    walls = []
+    for (x0, y0), (x1, y1) in zip(corners[:-1], corners[1:]):
+        t = np.linspace(0, 1, 101)
+        points = np.stack([x0 + t * (x1 - x0), y0 + t * (y1 - y0)], axis=1)
+        walls.extend({"points": points[k:k + 2]} for k in range(100))
+
+    faces = {}
+    for tolerance in (None, 0.01):
+        report = PipelineReport(jsonl_path=None)
+        build_mesh({"walls": walls}, tmp_path / "room", report=report, simplify_tolerance=tolerance)
+        faces[tolerance] = report.counters["faces"]
+
+    assert report.counters["vertices_after_simplify"] < report.counters["vertices_before_simplify"] / 10
+    assert faces[0.01] < faces[None] / 10
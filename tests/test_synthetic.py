@@ -0,0 +1,24 @@
+from benchmarks.synthetic import write_floor_plan, grid_size
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
+
+
+def test_plan_has_openings_on_their_layers(tmp_path):
+    n = grid_size(100)
+    path = write_floor_plan(tmp_path / "plan.dxf", 100, curves=True)
+    geometry = extract_walls_floors_doors_windows(parse_dwg(path, as_table=True))
+
+    assert len(geometry["walls"]) == 2 * n * (n + 1)
+    # leaf + swing per room, one window per exterior wall segment
+    assert len(geometry["doors"]) == 2 * n * n
+    assert len(geometry["windows"]) == 4 * n
+    assert geometry["floors"]
+
+
+def test_block_doors_match_loose_doors(tmp_path):
+    loose = write_floor_plan(tmp_path / "loose.dxf", 100, curves=True)
+    blocks = write_floor_plan(tmp_path / "blocks.dxf", 100, blocks=True)
+
+    a = extract_walls_floors_doors_windows(parse_dwg(loose, as_table=True))
+    b = extract_walls_floors_doors_windows(parse_dwg(blocks, as_table=True))
+    assert len(a["doors"]) == len(b["doors"])
@@ -0,0 +1,68 @@
+import numpy as np
+
+from benchmarks.synthetic import write_floor_plan
+from src.dwg_parser.parse_dwg import parse_dwg
+from src.metrics import PipelineReport
+from src.preprocessing.extract_geometry import extract_walls_floors_doors_windows
+from src.preprocessing.wall_graph import build_wall_graph
+from src.renderer.mesh_reconstruction import build_mesh, detect_rooms_from_walls, wall_centerlines, FLOOR_HEIGHT
+from src.renderer.tiled import build_mesh_tiled, plan_tiles
+
+
+def _plan(tmp_path, walls=400):
+    path = write_floor_plan(tmp_path / "plan.dxf", walls)
+    return extract_walls_floors_doors_windows(parse_dwg(path, as_table=True))
+
+
+def _top_areas(scene):
+    """Upward face area per material: (slab, walls)."""
+    areas = {}
+    for name, mesh in scene.geometry.items():
+        up = mesh.face_normals[:, 2] > 0.99
+        z = mesh.triangles_center[:, 2]
+        slab = mesh.area_faces[up & (z <= FLOOR_HEIGHT + 1e-6)].sum()
+        areas[name] = (slab, mesh.area_faces[up].sum() - slab)
+    return areas
+
+
+def test_tiles_own_every_centerline_once(tmp_path):
+    geometry = _plan(tmp_path)
+    lines, _ = wall_centerlines(build_wall_graph(geometry))
+
+    owned = np.concatenate([item["lines"] for item in plan_tiles(geometry, tile_size=7)])
+    assert len(owned) == len(lines)
+    assert set(owned.tolist()) == set(lines)
+
+
+def test_tiled_build_finds_the_same_rooms(tmp_path):
+    geometry = _plan(tmp_path)
+    report = PipelineReport(jsonl_path=None)
+
+    build_mesh_tiled(geometry, tmp_path / "plan", report=report, tile_size=7, workers=1)
+
+    assert report.counters["tiles"] > 1
+    assert report.counters["rooms"] == len(detect_rooms_from_walls(build_wall_graph(geometry)))
+    assert (tmp_path / "plan.glb").exists()
+
+
+def test_rooms_wider_than_a_tile_match_the_serial_build(tmp_path):
+    # 9 x 4 m hall next to a 3 x 4 m room, tiles of 2 m
+    points = [(0, 0), (12, 0), (12, 4), (0, 4), (0, 0)]
+    walls = [[points[k], points[k + 1]] for k in range(4)] + [[(9, 0), (9, 4)]]
+    geometry = {
+        "walls": [{"points": np.asarray(w, dtype=float)} for w in walls],
+        "doors": [], "windows": []
+    }
+
+    serial_report, tiled_report = PipelineReport(jsonl_path=None), PipelineReport(jsonl_path=None)
+    serial = build_mesh(geometry, tmp_path / "serial", report=serial_report, center=False)
+    tiled = build_mesh_tiled(geometry, tmp_path / "tiled", report=tiled_report, tile_size=2, workers=1, center=False)
+
+    assert tiled_report.counters["tiles"] > 1
+    assert tiled_report.counters["rooms"] == serial_report.counters["rooms"] == 2
+
+    serial_areas, tiled_areas = _top_areas(serial), _top_areas(tiled)
+    assert serial_areas.keys() == tiled_areas.keys()
+    for name, (slab, walls) in serial_areas.items():
+        assert np.allclose(tiled_areas[name], (slab, walls)), name
+    assert np.isclose(sum(slab for slab, _ in tiled_areas.values()), 48.0, rtol=0.05)
@@ -0,0 +1,87 @@
+import ezdxf
+import numpy as np
+import pytest
+
+from src.dwg_parser.curves import CHORD_TOLERANCE
+from src.dwg_parser.parse_dwg import parse_dwg, iter_entities
+from src.dwg_parser.units import guess_unit
+
+
+def _write_plan(path, size, insunits, measurement=1):
+    # 3 x 4 room grid, `size` drawing units per room
+    doc = ezdxf.new("R2010")
+    doc.header["$INSUNITS"] = insunits
+    doc.header["$MEASUREMENT"] = measurement
+    msp = doc.modelspace()
+    for i in range(4):
+        for j in range(4):
+            msp.add_line((i * size, j * size), (i * size, (j + 1) * size), dxfattribs={"layer": "A-WALL"})
+    for j in range(5):
+        for i in range(3):
+            msp.add_line((i * size, j * size), ((i + 1) * size, j * size), dxfattribs={"layer": "A-WALL"})
+    doc.saveas(path)
+    return path
+
+
+def test_header_units_scale_the_coordinate_buffer(tmp_path):
+    path = _write_plan(tmp_path / "plan.dxf", 150, insunits=1, measurement=0)   # 150 in rooms
+    table = parse_dwg(path, as_table=True)
+
+    assert table.stats["units"] == "inch"
+    assert table.stats["units_source"] == "header"
+    assert table.coords.max() == pytest.approx(4 * 150 * 0.0254)
+
+    # The streaming reader applies the same scale
+    assert list(iter_entities(path)) == parse_dwg(path)
+
+    # An explicit unit overrides the header
+    table = parse_dwg(path, as_table=True, units="mm")
+    assert table.coords.max() == pytest.approx(0.6)
+
+
+def test_unitless_drawings_are_guessed_from_wall_lengths(tmp_path):
+    mm = parse_dwg(_write_plan(tmp_path / "mm.dxf", 4000, insunits=0), as_table=True)
+    assert (mm.stats["units"], mm.stats["units_source"]) == ("millimetre", "guessed")
+    assert mm.coords.max() == pytest.approx(16.0)
+
+    feet = parse_dwg(_write_plan(tmp_path / "ft.dxf", 13, insunits=0, measurement=0), as_table=True)
+    assert feet.stats["units"] == "foot"
+
+    # Segments are only measured within an entity
+    coords = np.array([(0, 0), (4000, 0), (1e6, 0), (1e6, 3000)], dtype=float)
+    assert guess_unit(coords, [0, 2, 4]) == "millimetre"
+
+
+def test_streaming_applies_the_default_unit_without_guessing(tmp_path, caplog):
+    path = _write_plan(tmp_path / "mm.dxf", 4000, insunits=0)
+    stats = {}
+    points = [e["end"] for e in iter_entities(path, stats=stats)]
+
+    assert (stats["units"], stats["units_source"]) == ("millimetre", "default")
+    assert max(max(p[:2]) for p in points) == pytest.approx(16.0)
+    assert "does not guess" in caplog.text
+
+    # Imperial drawings default to inches
+    stats = {}
+    list(iter_entities(_write_plan(tmp_path / "in.dxf", 150, insunits=0, measurement=0), stats=stats))
+    assert (stats["units"], stats["unit_scale"]) == ("inch", 0.0254)
+
+
+def test_curves_are_flattened_to_a_metric_tolerance(tmp_path):
+    # The same 0.5 m column drawn in metres and in millimetres
+    rings = []
+    for insunits, radius in ((6, 0.5), (4, 500)):
+        doc = ezdxf.new("R2010")
+        doc.header["$INSUNITS"] = insunits
+        doc.modelspace().add_circle((0, 0), radius, dxfattribs={"layer": "A-COLS"})
+        doc.saveas(tmp_path / f"column_{insunits}.dxf")
+        rings.append(parse_dwg(tmp_path / f"column_{insunits}.dxf", as_table=True).points(0))
+
+    metres, millimetres = rings
+    assert np.allclose(metres, millimetres)
+    assert len(metres) >= 16
+    assert np.allclose(np.hypot(*metres.T), 0.5)
+
+    # Sagitta of each chord stays within CHORD_TOLERANCE
+    chord = np.hypot(*(np.roll(metres, -1, axis=0) - metres).T).max()
+    assert 0.5 - np.sqrt(0.25 - (chord / 2) ** 2) <= CHORD_TOLERANCE
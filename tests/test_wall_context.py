@@ -0,0 +1,42 @@
+import shapely
+
+from ml.material_predictor import predict_material, predict_materials
+from src.preprocessing.wall_context import classify_walls
+
+
+def test_exterior_flags_and_adjacent_rooms():
+    # Two 4 x 3 m rooms side by side, walls on the room edges
+    rooms = [shapely.box(0, 0, 4, 3), shapely.box(4, 0, 8, 3)]
+    lines = [
+        shapely.LineString([(0, 0), (8, 0)]),    # south, exterior
+        shapely.LineString([(4, 0), (4, 3)]),    # party wall
+        shapely.LineString([(8, 0), (8, 3)]),    # east, exterior
+    ]
+
+    exterior, adjacent, types = classify_walls(lines, [0.25, 0.1, 0.25], rooms, ["kitchen", "bathroom"])
+
+    assert exterior.tolist() == [True, False, True]
+    assert adjacent[1].tolist() == [0, 1]
+    assert adjacent[2].tolist() == [1]
+    assert types[1] == ["bathroom", "kitchen"]
+
+
+def test_untyped_rooms_skip_adjacency():
+    rooms = [shapely.box(0, 0, 4, 3), shapely.box(4, 0, 8, 3)]
+    lines = [shapely.LineString([(0, 0), (8, 0)]), shapely.LineString([(4, 0), (4, 3)])]
+
+    exterior, adjacent, types = classify_walls(lines, [0.25, 0.1], rooms)
+
+    assert exterior.tolist() == [True, False]
+    assert [a.tolist() for a in adjacent] == [[], []]
+    assert types == [[], []]
+
+
+def test_batch_prediction_matches_single_walls():
+    features = [
+        {"length": 4.0, "thickness": 0.3, "height": 3.0, "orientation": "horizontal", "is_exterior": 1},
+        {"length": 2.5, "thickness": 0.1, "height": 3.0, "orientation": "vertical", "is_exterior": 0},
+        {"length": 6.0, "thickness": 0.25, "height": 3.0, "orientation": "vertical", "is_exterior": 0},
+        {"length": 1.0, "thickness": 0.4, "height": 3.0, "orientation": "diagonal", "is_exterior": 0},
+    ]
+    assert predict_materials(features) == [predict_material(f) for f in features]
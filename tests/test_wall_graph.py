@@ -0,0 +1,47 @@
+import numpy as np
+
+from src.preprocessing.wall_graph import build_wall_graph
+
+
+def _graph(lines, tolerance=5.0):
+    return build_wall_graph({"walls": [{"points": np.asarray(l, dtype=float)} for l in lines]}, tolerance)
+
+
+def test_gaps_are_snapped_closed():
+    # 100 x 100 room drawn with 2-3 unit gaps at the corners
+    graph = _graph([
+        [(0, 0), (98, 0)],
+        [(100, 2), (100, 100)],
+        [(97, 100), (0, 100)],
+        [(0, 98), (0, 3)],
+    ])
+    assert len(graph.polygons()) == 1
+    assert (graph.degree() == 2).all()
+
+
+def test_crossing_t_junction_and_overshoot():
+    graph = _graph([
+        [(0, 0), (100, 0)],
+        [(50, -50), (50, 50)],   # crosses
+        [(20, 3), (20, 40)],     # undershoots by 3
+        [(80, -4), (80, 40)],    # overshoots by 4
+    ])
+    degree = graph.degree()
+    node = {tuple(np.round(p, 6)): d for p, d in zip(graph.nodes, degree)}
+
+    assert node[(50.0, 0.0)] == 4
+    assert node[(20.0, 0.0)] == 3
+    assert node[(80.0, 0.0)] == 3
+    assert (80.0, -4.0) not in node
+    assert len(graph) == 8
+
+
+def test_overlaps_are_deduplicated_and_chains_merge():
+    graph = _graph([
+        [(0, 0), (60, 0)],
+        [(40, 0), (100, 0)],
+        [(100, 0), (100, 50), (150, 50)],
+    ])
+    assert len(graph) == 5
+    chains = graph.chains()
+    assert len(chains) == 1 and len(chains[0]) == 6
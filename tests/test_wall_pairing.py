@@ -0,0 +1,76 @@
+import numpy as np
+
+from src.preprocessing.wall_graph import build_wall_graph
+from src.preprocessing.wall_pairing import pair_walls
+from src.renderer.mesh_reconstruction import wall_centerlines
+
+
+def _geometry(lines):
+    return {"walls": [{"points": np.asarray(l, dtype=float)} for l in lines]}
+
+
+def _ring(x0, y0, x1, y1):
+    p = [(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+    return [[p[k], p[k + 1]] for k in range(4)]
+
+
+def test_double_line_room_collapses_to_centerlines():
+    # 4 x 3 m room drawn with 200 mm double lines
+    geometry = _geometry(_ring(0, 0, 4, 3) + _ring(0.2, 0.2, 3.8, 2.8))
+    pairs = pair_walls(geometry)
+
+    assert len(pairs) == 4
+    assert np.allclose(pairs.thickness, 0.2)
+    assert pairs.paired.all()
+
+    # Centerlines run mid-wall and meet at the corners
+    ends = {tuple(p) for p in pairs.centerlines.reshape(-1, 2).round(6).tolist()}
+    assert ends == {(0.1, 0.1), (3.9, 0.1), (3.9, 2.9), (0.1, 2.9)}
+
+    lines, thickness = wall_centerlines(build_wall_graph(geometry), pairs)
+    assert len(lines) == 4
+    assert np.allclose(thickness, 0.2)
+
+
+def test_out_of_range_and_crossing_lines_stay_single():
+    pairs = pair_walls(_geometry([
+        [(0, 0), (1, 0)],
+        [(0, 0.02), (1, 0.02)],       # too thin
+        [(0, 1), (1, 1)],             # too far
+        [(0.5, -0.5), (0.5, 1.5)],    # perpendicular
+    ]))
+    assert len(pairs) == 0
+    assert not pairs.paired.any()
+
+
+def test_longer_face_keeps_its_excess():
+    # Outer line runs on past the end of the inner one
+    pairs = pair_walls(_geometry([
+        [(0, 0), (4, 0)],
+        [(0.2, 0.2), (2.5, 0.2)],
+    ]))
+    assert len(pairs) == 1
+    assert np.isclose(pairs.thickness[0], 0.2)
+
+    # The near ends are a corner offset; the rest stays single-line
+    assert pairs.paired.tolist() == [True, True]
+    assert np.allclose(pairs.centerlines[0], [(0.1, 0.1), (2.5, 0.1)])
+    assert np.allclose(pairs.leftovers, [[(2.5, 0), (4, 0)]])
+
+
+def test_face_opposite_a_door_gap_pairs_on_both_sides():
+    # Inner face broken by a door; the outer face runs through
+    pairs = pair_walls(_geometry([
+        [(0, 0), (4, 0)],
+        [(0.2, 0.2), (1, 0.2)],
+        [(1.9, 0.2), (3.8, 0.2)],
+    ]))
+    assert len(pairs) == 2
+    assert np.allclose(pairs.thickness, 0.2)
+    assert pairs.paired.all()
+
+    order = np.argsort(pairs.centerlines[:, 0, 0])
+    assert np.allclose(pairs.centerlines[order], [[(0.1, 0.1), (1, 0.1)], [(1.9, 0.1), (3.9, 0.1)]])
+
+    # Only the outer face across the gap stays a single line
+    assert np.allclose(pairs.leftovers, [[(1, 0), (1.9, 0)]])